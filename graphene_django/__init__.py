@@ -3,4 +3,6 @@ from .fields import DjangoConnectionField
 
 __version__ = "2.2.0"
 
+default_app_config = "graphene_django.apps.GrapheneDjangoConfig"
+
 __all__ = ["__version__", "DjangoObjectType", "DjangoConnectionField"]
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class GrapheneDjangoConfig(AppConfig):
+    name = "graphene_django"
+    verbose_name = "Graphene Django"
+
+    def ready(self):
+        from .model_versions import connect_signals, get_version_cache_aliases
+
+        # Only when results are cached, as the receivers run on every change
+        if get_version_cache_aliases():
+            connect_signals()
@@ -0,0 +1,135 @@
+import threading
+from collections import OrderedDict
+from functools import partial
+from hashlib import sha256
+
+from graphql.backend.core import GraphQLCoreBackend
+from graphql.execution import ExecutionResult
+from graphql.validation import validate
+
+from .settings import graphene_settings
+
+
+def get_query_hash(query):
+    """Return the hex encoded sha256 hash used to identify a query string."""
+    return sha256(query.encode("utf-8")).hexdigest()
+
+
+def execute_validated(execute, validation_errors, *args, **kwargs):
+    """
+    Execute a document whose validation errors were computed ahead of time,
+    so validation isn't run again on every execution.
+    """
+    if validation_errors:
+        return ExecutionResult(errors=validation_errors, invalid=True)
+    kwargs["validate"] = False
+    return execute(*args, **kwargs)
+
+
+class DocumentCache(object):
+    """
+    A bounded, thread-safe LRU cache of parsed (and, for the default
+    graphql-core backend, validated) GraphQL documents.
+
+    Documents are keyed by backend, schema and the sha256 hash of the
+    query string. Once ``max_size`` documents are stored, the least
+    recently used one is evicted. A ``max_size`` of 0 disables caching.
+    """
+
+    def __init__(self, max_size=None):
+        if max_size is None:
+            max_size = graphene_settings.DOCUMENT_CACHE_SIZE
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def get_key(self, backend, schema, query_hash):
+        return (backend, schema, query_hash)
+
+    def get(self, backend, schema, query_hash):
+        """Return the cached document for the given query hash, or None."""
+        key = self.get_key(backend, schema, query_hash)
+        with self._lock:
+            document = self._documents.pop(key, None)
+            if document is None:
+                self.misses += 1
+                return None
+            # Re-insert the document to mark it as the most recently used
+            self._documents[key] = document
+            self.hits += 1
+            return document
+
+    def set(self, backend, schema, query_hash, document):
+        if not self.max_size:
+            return
+        key = self.get_key(backend, schema, query_hash)
+        with self._lock:
+            self._documents.pop(key, None)
+            self._documents[key] = document
+            while len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+
+    def add(self, backend, schema, query, query_hash=None):
+        """
+        Parse ``query`` with ``backend`` (validating it up front for the
+        default graphql-core backend), cache it and return the document.
+        """
+        if query_hash is None:
+            query_hash = get_query_hash(query)
+
+        document = backend.document_from_string(schema, query)
+        if isinstance(backend, GraphQLCoreBackend):
+            validation_errors = validate(schema, document.document_ast)
+            document.validation_errors = validation_errors
+            document.execute = partial(
+                execute_validated, document.execute, validation_errors
+            )
+        self.set(backend, schema, query_hash, document)
+        return document
+
+    def document_from_string(self, backend, schema, query, query_hash=None):
+        """
+        Return the document for ``query``, parsing and validating it with
+        ``backend`` only if it isn't already cached.
+        """
+        if query_hash is None:
+            query_hash = get_query_hash(query)
+
+        document = self.get(backend, schema, query_hash)
+        if document is None:
+            document = self.add(backend, schema, query, query_hash)
+        return document
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._documents),
+            "max_size": self.max_size,
+        }
+
+
+document_cache = None
+
+
+def get_document_cache():
+    global document_cache
+    if document_cache is None:
+        document_cache = DocumentCache()
+    return document_cache
+
+
+def reset_document_cache():
+    global document_cache
+    document_cache = None
@@ -0,0 +1,39 @@
+"""
+JSON encoding and decoding used by the GraphQL views.
+
+The ``JSON_ENCODER`` and ``JSON_DECODER`` settings accept orjson/ujson style
+callables (e.g. ``'orjson.dumps'`` and ``'orjson.loads'``) to replace the
+standard library ``json`` module. Encoders may return either text or bytes,
+and decoders must accept both text and the raw request body as bytes, so
+the body isn't decoded to text before parsing.
+"""
+import json
+
+import six
+
+from .settings import graphene_settings
+
+
+def json_dumps(value):
+    """Encode ``value`` as compact JSON, returning text or bytes."""
+    encoder = graphene_settings.JSON_ENCODER
+    if encoder is not None:
+        return encoder(value)
+    return json.dumps(value, separators=(",", ":"))
+
+
+def json_loads(value):
+    """Decode a JSON document given as text or (utf-8 encoded) bytes."""
+    decoder = graphene_settings.JSON_DECODER
+    if decoder is not None:
+        return decoder(value)
+    if isinstance(value, six.binary_type):
+        value = value.decode("utf-8")
+    return json.loads(value)
+
+
+def json_join(values):
+    """Join encoded JSON documents into a JSON array."""
+    if values and isinstance(values[0], six.binary_type):
+        return b"[" + b",".join(values) + b"]"
+    return "[{}]".format(",".join(values))
@@ -1,4 +1,4 @@
-from graphene import Field, Int
+from graphene import Field, Int, String
 from graphene.relay import Connection
 
 
@@ -18,5 +18,13 @@ class DjangoConnection(Connection):
             required=True,
             description="Total count for use in pagination",
         )
+        cls._meta.fields["total_count_strategy"] = Field(
+            String,
+            name="totalCountStrategy",
+            description=(
+                "How totalCount was computed: exact, capped (the count is "
+                "totalCount or more) or estimate (from database statistics)"
+            ),
+        )
 
         return parent
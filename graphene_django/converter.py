@@ -22,7 +22,7 @@ from graphene.utils.str_converters import to_camel_case, to_const
 from graphql import assert_valid_name
 
 from .compat import ArrayField, HStoreField, JSONField, RangeField
-from .fields import DjangoListField, DjangoConnectionField
+from .fields import DjangoListField, DjangoConnectionField, DjangoRelatedField
 from .utils import import_single_dispatch
 
 singledispatch = import_single_dispatch()
@@ -161,7 +161,7 @@ def convert_onetoone_field_to_djangomodel(field, registry=None):
         # We do this for a bug in Django 1.8, where null attr
         # is not available in the OneToOneRel instance
         null = getattr(field, "null", True)
-        return Field(_type, required=not null)
+        return DjangoRelatedField(_type, field, required=not null)
 
     return Dynamic(dynamic_type)
 
@@ -189,7 +189,7 @@ def convert_field_to_list_or_connection(field, registry=None):
 
             return DjangoConnectionField(_type)
 
-        return DjangoListField(_type)
+        return DjangoListField(_type, model_field=field)
 
     return Dynamic(dynamic_type)
 
@@ -204,7 +204,9 @@ def convert_field_to_djangomodel(field, registry=None):
         if not _type:
             return
 
-        return Field(_type, description=field.help_text, required=not field.null)
+        return DjangoRelatedField(
+            _type, field, description=field.help_text, required=not field.null
+        )
 
     return Dynamic(dynamic_type)
 
@@ -0,0 +1,266 @@
+"""
+Static depth and cost analysis of GraphQL operations.
+
+The cost of an operation is computed from its document before it's
+executed, as an upper bound of the objects it can return:
+
+* every field with a selection set costs 1, leaf fields are free,
+* the edges of a connection are multiplied by the number of edges it may
+  return: its ``first`` / ``last`` argument, bounded by the ``max_limit``
+  of the field (``RELAY_CONNECTION_MAX_LIMIT`` by default),
+* ``DjangoConnectionField`` (and ``DjangoFilterConnectionField``) accept a
+  ``cost`` argument replacing the cost of the field itself, e.g. for fields
+  backed by expensive querysets.
+
+The costs are cached on the document for each operation (and for the
+values of the variables used as ``first`` / ``last``), so documents from
+the document cache are only analyzed once.
+"""
+from collections import namedtuple
+
+from graphene.relay import Connection
+from graphql.error import GraphQLError
+from graphql.language import ast
+from graphql.type.definition import GraphQLList, GraphQLNonNull
+
+from .optimization import get_graphene_field, get_graphql_field_names
+from .settings import graphene_settings
+
+# Edges counted for the connections without a limit
+DEFAULT_CONNECTION_SIZE = 100
+
+# Max costs cached on a document for different variable values
+MAX_CACHED_COSTS = 100
+
+QueryCost = namedtuple("QueryCost", ["cost", "depth"])
+
+
+class QueryTooComplex(GraphQLError):
+    def __init__(self, message):
+        super(QueryTooComplex, self).__init__(
+            message, extensions={"code": "QUERY_TOO_COMPLEX"}
+        )
+
+
+def get_named_type(graphql_type):
+    while isinstance(graphql_type, (GraphQLList, GraphQLNonNull)):
+        graphql_type = graphql_type.of_type
+    return graphql_type
+
+
+def is_connection(graphql_type):
+    graphene_type = getattr(graphql_type, "graphene_type", None)
+    return isinstance(graphene_type, type) and issubclass(graphene_type, Connection)
+
+
+def get_operation(document_ast, operation_name):
+    operations = [
+        definition
+        for definition in document_ast.definitions
+        if isinstance(definition, ast.OperationDefinition)
+    ]
+    if not operation_name:
+        return operations[0] if len(operations) == 1 else None
+    for operation in operations:
+        if operation.name and operation.name.value == operation_name:
+            return operation
+    return None
+
+
+class CostAnalyzer(object):
+    """Computes the QueryCost of an operation of a document."""
+
+    def __init__(self, schema, document_ast, operation, variables=None):
+        self.schema = schema
+        self.auto_camelcase = getattr(schema, "auto_camelcase", True)
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document_ast.definitions
+            if isinstance(definition, ast.FragmentDefinition)
+        }
+        self.variables = variables or {}
+        self.variable_defaults = {
+            definition.variable.name.value: definition.default_value
+            for definition in operation.variable_definitions or ()
+        }
+        self.operation = operation
+        # Names of the variables the cost depends on
+        self.used_variables = set()
+
+    def get_root_type(self):
+        if self.operation.operation == "mutation":
+            return self.schema.get_mutation_type()
+        if self.operation.operation == "subscription":
+            return self.schema.get_subscription_type()
+        return self.schema.get_query_type()
+
+    def analyze(self):
+        return self.get_selection_set_cost(
+            self.get_root_type(), self.operation.selection_set, ()
+        )
+
+    def get_int(self, value_ast):
+        if isinstance(value_ast, ast.Variable):
+            name = value_ast.name.value
+            self.used_variables.add(name)
+            if name in self.variables:
+                value = self.variables[name]
+                return value if isinstance(value, int) else None
+            value_ast = self.variable_defaults.get(name)
+        if isinstance(value_ast, ast.IntValue):
+            return int(value_ast.value)
+        return None
+
+    def get_graphene_field(self, parent_type, field_name):
+        graphene_type = getattr(parent_type, "graphene_type", None)
+        if graphene_type is None or not hasattr(graphene_type._meta, "fields"):
+            return None
+        name = get_graphql_field_names(graphene_type, self.auto_camelcase).get(
+            field_name
+        )
+        return name and get_graphene_field(graphene_type, name)
+
+    def get_connection_size(self, field_ast, graphene_field):
+        max_limit = getattr(
+            graphene_field, "max_limit", graphene_settings.RELAY_CONNECTION_MAX_LIMIT
+        )
+        limits = [
+            self.get_int(argument.value)
+            for argument in field_ast.arguments or ()
+            if argument.name.value in ("first", "last")
+        ]
+        limits = [limit for limit in limits if limit is not None]
+        if max_limit:
+            limits.append(max_limit)
+        if not limits:
+            return DEFAULT_CONNECTION_SIZE
+        return max(min(limits), 0)
+
+    def get_field_cost(self, parent_type, field_ast, fragments, connection_size):
+        field_name = field_ast.name.value
+        fields = getattr(parent_type, "fields", None) or {}
+        field_def = fields.get(field_name)
+        if field_def is None or not field_ast.selection_set:
+            return QueryCost(0, 1)
+
+        return_type = get_named_type(field_def.type)
+        graphene_field = self.get_graphene_field(parent_type, field_name)
+        size = None
+        if is_connection(return_type):
+            size = self.get_connection_size(field_ast, graphene_field)
+        children = self.get_selection_set_cost(
+            return_type, field_ast.selection_set, fragments, size
+        )
+
+        if is_connection(parent_type):
+            # The edges and page info are part of the connection
+            if field_name == "edges":
+                return QueryCost(connection_size * children.cost, children.depth + 1)
+            return QueryCost(children.cost, children.depth + 1)
+        cost = getattr(graphene_field, "cost", None)
+        if cost is None:
+            cost = 1
+        return QueryCost(cost + children.cost, children.depth + 1)
+
+    def get_selection_set_cost(
+        self, parent_type, selection_set, fragments, connection_size=None
+    ):
+        cost = depth = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.Field):
+                selection_cost = self.get_field_cost(
+                    parent_type, selection, fragments, connection_size
+                )
+            else:
+                selection_fragments = fragments
+                if isinstance(selection, ast.FragmentSpread):
+                    name = selection.name.value
+                    # Cycles are invalid, but documents of other backends
+                    # may not be validated
+                    if name in fragments or name not in self.fragments:
+                        continue
+                    selection_fragments = fragments + (name,)
+                    selection = self.fragments[name]
+                selection_type = parent_type
+                if selection.type_condition:
+                    selection_type = self.schema.get_type(
+                        selection.type_condition.name.value
+                    )
+                selection_cost = self.get_selection_set_cost(
+                    selection_type,
+                    selection.selection_set,
+                    selection_fragments,
+                    connection_size,
+                )
+            cost += selection_cost.cost
+            depth = max(depth, selection_cost.depth)
+        return QueryCost(cost, depth)
+
+
+def get_variables_key(operation_name, variables, names):
+    return (operation_name,) + tuple(repr(variables.get(name)) for name in names)
+
+
+def get_query_cost(schema, document, operation_name=None, variables=None):
+    """
+    Return the QueryCost of the operation ``operation_name`` of
+    ``document``, or None when it doesn't have such an operation or isn't
+    valid.
+    """
+    if getattr(document, "validation_errors", None):
+        return None
+    if getattr(document, "query_costs", None) is None:
+        document.query_costs = {}
+        # The names of the variables the cost of each operation depends on
+        document.query_cost_variables = {}
+    variables = variables or {}
+
+    names = document.query_cost_variables.get(operation_name)
+    if names is not None:
+        key = get_variables_key(operation_name, variables, names)
+        if key in document.query_costs:
+            return document.query_costs[key]
+
+    operation = get_operation(document.document_ast, operation_name)
+    if operation is None:
+        return None
+    analyzer = CostAnalyzer(schema, document.document_ast, operation, variables)
+    query_cost = analyzer.analyze()
+
+    names = tuple(sorted(analyzer.used_variables))
+    document.query_cost_variables[operation_name] = names
+    if len(document.query_costs) < MAX_CACHED_COSTS:
+        key = get_variables_key(operation_name, variables, names)
+        document.query_costs[key] = query_cost
+    return query_cost
+
+
+def check_query_cost(
+    schema,
+    document,
+    operation_name=None,
+    variables=None,
+    max_cost=None,
+    max_depth=None,
+):
+    """
+    Raise QueryTooComplex when the operation is deeper than ``max_depth``
+    or costs more than ``max_cost``.
+    """
+    if not max_cost and not max_depth:
+        return
+    query_cost = get_query_cost(schema, document, operation_name, variables)
+    if query_cost is None:
+        return
+    if max_depth and query_cost.depth > max_depth:
+        raise QueryTooComplex(
+            "The query has a depth of {}, over the maximum depth of {}.".format(
+                query_cost.depth, max_depth
+            )
+        )
+    if max_cost and query_cost.cost > max_cost:
+        raise QueryTooComplex(
+            "The query has a cost of {}, over the maximum cost of {}.".format(
+                query_cost.cost, max_cost
+            )
+        )
@@ -0,0 +1,84 @@
+"""
+Strategies to compute the ``totalCount`` of connections over querysets.
+
+* ``exact``: a plain ``COUNT(*)``.
+* ``capped``: count at most ``max_count`` rows. When there are more, the
+  count is reported as ``max_count`` with the ``capped`` strategy, meaning
+  "``max_count`` or more".
+* ``estimate``: read the row estimate kept in the database statistics,
+  which is only possible for unfiltered querysets on PostgreSQL and MySQL.
+  Any other queryset is counted exactly.
+
+The strategy actually used is returned along with the count, so clients can
+tell whether the number is approximate.
+"""
+from django.db import connections
+
+EXACT = "exact"
+CAPPED = "capped"
+ESTIMATE = "estimate"
+
+COUNT_STRATEGIES = (EXACT, CAPPED, ESTIMATE)
+
+
+def is_unfiltered(queryset):
+    query = queryset.query
+    return (
+        not query.where
+        and not query.distinct
+        and query.group_by is None
+        and not getattr(query, "combinator", None)
+        and query.low_mark == 0
+        and query.high_mark is None
+    )
+
+
+def estimate_count(queryset):
+    """
+    Return the number of rows of the queryset table according to the
+    database statistics, or None when there is no estimate available.
+    """
+    if not is_unfiltered(queryset):
+        return None
+
+    connection = connections[queryset.db]
+    db_table = queryset.model._meta.db_table
+    if connection.vendor == "postgresql":
+        sql = "SELECT reltuples FROM pg_class WHERE oid = %s::regclass"
+        params = [connection.ops.quote_name(db_table)]
+    elif connection.vendor == "mysql":
+        sql = (
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s"
+        )
+        params = [db_table]
+    else:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+
+    # Tables that were never analyzed have no (or a negative) estimate
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def count_queryset(queryset, strategy=EXACT, max_count=None):
+    """
+    Count the rows of ``queryset`` with the given strategy, returning the
+    count and the strategy that was actually used.
+    """
+    if strategy == CAPPED and max_count:
+        count = queryset[: max_count + 1].count()
+        if count > max_count:
+            return max_count, CAPPED
+        return count, EXACT
+
+    if strategy == ESTIMATE:
+        count = estimate_count(queryset)
+        if count is not None:
+            return count, ESTIMATE
+
+    return queryset.count(), EXACT
@@ -0,0 +1,185 @@
+"""
+Request scoped DataLoaders batching the lookups of related objects.
+
+The fields converted from ``ForeignKey``, ``OneToOneField``, reverse one to
+one relations and (when they are exposed as a ``DjangoListField``) reverse
+``ForeignKey`` and ``ManyToManyField`` relations resolve through a
+``DataLoader`` stored in the GraphQL context. The lookups of sibling objects
+are collected and resolved with a single query per relation, using Django's
+``prefetch_related_objects``.
+
+Relations already fetched (with ``select_related`` or ``prefetch_related``)
+and fields with a custom resolver are resolved as usual. Connection fields
+paginate their rows in the database, so they aren't batched.
+
+The node fields of ``DjangoNode`` also go through a ``NodeLoader`` per model
+(see ``DjangoObjectType.get_node_promise``), so all the IDs of a type
+requested in an operation are fetched with a single ``pk__in`` query.
+"""
+from functools import partial
+
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db.models import Model, prefetch_related_objects
+from graphene.types.resolver import (
+    attr_resolver,
+    dict_or_attr_resolver,
+    get_default_resolver,
+)
+from promise import Promise
+from promise.dataloader import DataLoader
+
+from .deadline import check_deadline
+from .settings import graphene_settings
+
+LOADERS_CONTEXT_KEY = "dataloaders"
+
+
+class LoaderRegistry(object):
+    """The DataLoaders of a request, created the first time they are used."""
+
+    def __init__(self):
+        self._loaders = {}
+
+    def get(self, key, factory):
+        loader = self._loaders.get(key)
+        if loader is None:
+            loader = self._loaders[key] = factory()
+        return loader
+
+    def clear(self):
+        self._loaders = {}
+
+
+def get_loader_registry(context):
+    """
+    Return the LoaderRegistry of the GraphQL context, or None when loaders
+    can't be attached to it.
+    """
+    if context is None:
+        return None
+    if isinstance(context, dict):
+        registry = context.get(LOADERS_CONTEXT_KEY)
+        if registry is None:
+            registry = context[LOADERS_CONTEXT_KEY] = LoaderRegistry()
+        return registry
+
+    registry = getattr(context, LOADERS_CONTEXT_KEY, None)
+    if registry is None:
+        registry = LoaderRegistry()
+        try:
+            setattr(context, LOADERS_CONTEXT_KEY, registry)
+        except AttributeError:
+            return None
+    return registry
+
+
+class RelatedLoader(DataLoader):
+    """Loads a relation of model instances with a single query per batch."""
+
+    def __init__(self, accessor, many=False):
+        self.accessor = accessor
+        self.many = many
+        super(RelatedLoader, self).__init__()
+
+    def get_related(self, instance):
+        if self.many:
+            return list(getattr(instance, self.accessor).all())
+        try:
+            return getattr(instance, self.accessor)
+        except ObjectDoesNotExist:
+            return None
+
+    def batch_load_fn(self, instances):
+        prefetch_related_objects(list(instances), self.accessor)
+        return Promise.resolve([self.get_related(instance) for instance in instances])
+
+
+class NodeLoader(DataLoader):
+    """Loads model instances by primary key with a single query per batch."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        super(NodeLoader, self).__init__()
+
+    def batch_load_fn(self, pks):
+        instances = {
+            instance.pk: instance for instance in self.manager.filter(pk__in=pks)
+        }
+        return Promise.resolve([instances.get(pk) for pk in pks])
+
+
+def load_node(info, manager, id):
+    """
+    Return a promise of the instance of ``manager`` with the primary key
+    ``id``, or None when loaders can't be used and the instance must be
+    fetched directly.
+    """
+    if not graphene_settings.NODE_LOADERS:
+        return None
+    registry = get_loader_registry(getattr(info, "context", None))
+    if registry is None:
+        return None
+
+    model = manager.model
+    try:
+        pk = model._meta.pk.to_python(id)
+    except ValidationError:
+        return Promise.resolve(None)
+    if pk is None:
+        return Promise.resolve(None)
+    loader = registry.get((NodeLoader, model), partial(NodeLoader, manager))
+    return loader.load(pk)
+
+
+def get_accessor_name(model_field):
+    if model_field.auto_created and not model_field.concrete:
+        return model_field.get_accessor_name()
+    return model_field.name
+
+
+def is_relation_loaded(instance, model_field, accessor):
+    if model_field.many_to_many or model_field.one_to_many:
+        return accessor in getattr(instance, "_prefetched_objects_cache", {})
+    if model_field.concrete and getattr(instance, model_field.attname) is None:
+        return True
+    return model_field.is_cached(instance)
+
+
+def is_default_resolver(resolver):
+    return isinstance(resolver, partial) and resolver.func in (
+        attr_resolver,
+        dict_or_attr_resolver,
+        get_default_resolver(),
+    )
+
+
+def resolve_related(model_field, accessor, parent_resolver, root, info, **args):
+    check_deadline(info)
+    if (
+        graphene_settings.RELATED_FIELD_LOADERS
+        and isinstance(root, Model)
+        # Instances without a primary key can't be batched (nor hashed)
+        and root.pk is not None
+        and not is_relation_loaded(root, model_field, accessor)
+    ):
+        registry = get_loader_registry(info.context)
+        if registry is not None:
+            many = model_field.many_to_many or model_field.one_to_many
+            loader = registry.get(
+                (root._meta.concrete_model, accessor),
+                partial(RelatedLoader, accessor, many=many),
+            )
+            return loader.load(root)
+    return parent_resolver(root, info, **args)
+
+
+def get_related_resolver(model_field, parent_resolver):
+    """
+    Return a resolver loading the relation ``model_field`` through the
+    request's DataLoaders, unless ``parent_resolver`` is a custom resolver.
+    """
+    if not is_default_resolver(parent_resolver):
+        return parent_resolver
+    return partial(
+        resolve_related, model_field, get_accessor_name(model_field), parent_resolver
+    )
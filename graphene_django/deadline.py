@@ -0,0 +1,174 @@
+"""
+Per-request execution deadlines.
+
+The views accept a ``deadline`` in seconds for each operation (the
+``QUERY_DEADLINE`` setting by default). The ``Deadline`` of the operation
+is stored in the GraphQL context, and the resolvers of ``DjangoField``,
+``DjangoListField``, ``DjangoConnectionField`` and of the related fields of
+model types raise a ``DeadlineExceeded`` error once it has passed.
+
+On PostgreSQL the remaining time is also set as the ``statement_timeout``
+of the queries run during the operation (local to their transaction), so a
+runaway query is cancelled by the database when the deadline passes.
+"""
+from contextlib import contextmanager
+from time import time
+
+from django.db import DatabaseError, connections, transaction
+from graphql.error import GraphQLError
+
+DEADLINE_CONTEXT_KEY = "deadline"
+
+# The statement_timeout is only updated when the one set is longer than the
+# remaining time by more than this fraction, to save a query per statement
+STATEMENT_TIMEOUT_SLACK = 0.1
+
+
+class DeadlineExceeded(GraphQLError):
+    def __init__(self, message="The deadline of the operation has passed."):
+        super(DeadlineExceeded, self).__init__(
+            message, extensions={"code": "DEADLINE_EXCEEDED"}
+        )
+
+
+class Deadline(object):
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.expires_at = time() + timeout
+
+    def remaining(self):
+        """Return the seconds left before the deadline, at least 0."""
+        return max(self.expires_at - time(), 0)
+
+    @property
+    def expired(self):
+        return time() >= self.expires_at
+
+    def check(self):
+        if self.expired:
+            raise DeadlineExceeded()
+
+
+def set_deadline(context, deadline):
+    if isinstance(context, dict):
+        context[DEADLINE_CONTEXT_KEY] = deadline
+    else:
+        setattr(context, DEADLINE_CONTEXT_KEY, deadline)
+
+
+def get_deadline(context):
+    if isinstance(context, dict):
+        return context.get(DEADLINE_CONTEXT_KEY)
+    return getattr(context, DEADLINE_CONTEXT_KEY, None)
+
+
+def check_deadline(info):
+    """Raise DeadlineExceeded when the deadline of the operation has passed."""
+    deadline = get_deadline(getattr(info, "context", None))
+    if deadline is not None:
+        deadline.check()
+
+
+class StatementTimeout(object):
+    """
+    Execute wrapper setting the ``statement_timeout`` of a PostgreSQL
+    connection to the time left before ``deadline``.
+
+    The timeout is local to the current transaction, so it's undone along
+    with it and doesn't leak to the other clients of a pooled connection.
+    Queries run in autocommit mode get a transaction of their own for it.
+    """
+
+    set_timeout_sql = "SELECT set_config('statement_timeout', %s, true)"
+    reset_timeout_sql = "SET LOCAL statement_timeout TO DEFAULT"
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        # The statement_timeout set, in milliseconds
+        self.timeout = None
+        # Registered with on_commit when the timeout is set, and dropped by
+        # Django when its transaction (or savepoint) is rolled back
+        self.marker = None
+        # Set while the transaction of a query is started, as some backends
+        # start it with a query
+        self.starting = False
+
+    def run(self, connection, sql, params=None):
+        # On a plain cursor of the driver, as Django's cursors run the execute
+        # wrappers again and the query's may be a named (server-side) one
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(sql, params or ())
+        finally:
+            cursor.close()
+
+    def is_set(self, connection):
+        """Return whether the timeout set is still in effect."""
+        return self.marker is not None and any(
+            entry[1] is self.marker for entry in connection.run_on_commit
+        )
+
+    def set_timeout(self, connection):
+        remaining = int(self.deadline.remaining() * 1000) or 1
+        if (
+            self.is_set(connection)
+            and self.timeout - remaining <= remaining * STATEMENT_TIMEOUT_SLACK
+        ):
+            return
+        self.run(connection, self.set_timeout_sql, [str(remaining)])
+        self.timeout = remaining
+        self.marker = lambda: None
+        connection.on_commit(self.marker)
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.starting:
+            return execute(sql, params, many, context)
+        self.deadline.check()
+        connection = context["connection"]
+        try:
+            if connection.in_atomic_block:
+                self.set_timeout(connection)
+                return execute(sql, params, many, context)
+            self.starting = True
+            try:
+                with transaction.atomic(using=connection.alias):
+                    self.starting = False
+                    self.set_timeout(connection)
+                    return execute(sql, params, many, context)
+            finally:
+                self.starting = False
+        except DatabaseError:
+            if self.deadline.expired:
+                raise DeadlineExceeded()
+            raise
+
+    def reset(self, connection):
+        """Restore the timeout of the rest of the transaction, if it's set."""
+        if not self.is_set(connection):
+            return
+        try:
+            self.run(connection, self.reset_timeout_sql)
+        except DatabaseError:
+            # Rolled back with the aborted transaction
+            pass
+
+
+@contextmanager
+def statement_timeout(deadline):
+    """
+    Set the ``statement_timeout`` of the queries run on the PostgreSQL
+    connections of the current thread to the time left before ``deadline``,
+    if any.
+    """
+    wrappers = []
+    for connection in connections.all() if deadline else ():
+        if connection.vendor == "postgresql":
+            wrapper = StatementTimeout(deadline)
+            connection.execute_wrappers.append(wrapper)
+            wrappers.append((connection, wrapper))
+    try:
+        yield
+    finally:
+        for connection, wrapper in wrappers:
+            connection.execute_wrappers.remove(wrapper)
+            wrapper.reset(connection)
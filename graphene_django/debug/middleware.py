@@ -1,31 +1,103 @@
+import random
+from time import time
+
 from django.db import connections
+from django.db.models import QuerySet
 
+from graphql.type.definition import GraphQLList, GraphQLNonNull
 from promise import Promise
 
+from ..settings import graphene_settings
+from .nplusone import NPlusOneDetector
 from .sql.tracking import unwrap_cursor, wrap_cursor
+from .tracing import ResolverTrace
 from .types import DjangoDebug
 
 
 class DjangoDebugContext(object):
-    def __init__(self):
+    def __init__(
+        self,
+        enabled=True,
+        lite=False,
+        n_plus_one_threshold=5,
+        strict=False,
+        trace_resolvers=False,
+    ):
+        self.start_time = time()
         self.debug_promise = None
         self.promises = []
-        self.enable_instrumentation()
-        self.object = DjangoDebug(sql=[])
+        # Requests left out of the sample aren't instrumented at all
+        self.enabled = enabled
+        self.lite = lite
+        # Path of the field being resolved, the queries are attributed to it
+        self.current_path = None
+        self.trace_resolvers = trace_resolvers
+        self.current_trace = None
+        self.n_plus_one = NPlusOneDetector(n_plus_one_threshold, strict=strict)
+        if self.enabled:
+            self.enable_instrumentation()
+        self.object = DjangoDebug(sql=[], n_plus_one=[], resolvers=[])
+
+    @property
+    def is_finished(self):
+        return bool(self.debug_promise and self.debug_promise.is_fulfilled)
+
+    def add_sql(self, sql):
+        self.object.sql.append(sql)
+        if self.current_trace:
+            self.current_trace.sql.append(sql)
+        self.n_plus_one.add(sql.raw_sql, self.current_path, sql.duration)
 
     def get_debug_promise(self):
+        if not self.enabled:
+            return Promise.resolve(None)
         if not self.debug_promise:
-            self.debug_promise = Promise.all(self.promises)
-        return self.debug_promise.then(self.on_resolve_all_promises)
+            self.debug_promise = self.wait_for_promises()
+        return self.debug_promise
+
+    def wait_for_promises(self):
+        promises, self.promises = self.promises, []
+        return Promise.all(promises).then(self.on_resolve_promises)
+
+    def on_resolve_promises(self, values):
+        # Resolving fields resolves their subfields, so wait for them too
+        if self.promises:
+            return self.wait_for_promises()
+        return self.on_resolve_all_promises(values)
 
     def on_resolve_all_promises(self, values):
         self.disable_instrumentation()
-        return self.object
+        self.object.n_plus_one = self.n_plus_one.get_findings()
+        return self.n_plus_one.raise_error(self.object)
 
     def add_promise(self, promise):
-        if self.debug_promise and not self.debug_promise.is_fulfilled:
+        if not self.is_finished:
+            if isinstance(promise, Promise):
+                # The error of a field is reported by the field itself
+                promise = promise.catch(lambda error: None)
             self.promises.append(promise)
 
+    def start_field(self, info):
+        """
+        Attribute the following queries to the field, tracing it if needed,
+        and return the state to restore with ``finish_field`` once its
+        resolver returns.
+        """
+        previous = (self.current_path, self.current_trace)
+        self.current_path = info.path
+        self.current_trace = None
+        if self.trace_resolvers and not self.is_finished:
+            self.current_trace = ResolverTrace(info, self.start_time)
+            self.object.resolvers.append(self.current_trace)
+        return previous
+
+    def finish_field(self, previous):
+        """
+        Attribute the following queries to the enclosing field again, e.g.
+        the queries of DataLoader batches run once the fields are resolved.
+        """
+        self.current_path, self.current_trace = previous
+
     def enable_instrumentation(self):
         # This is thread-safe because database connections are thread-local.
         for connection in connections.all():
@@ -36,7 +108,90 @@ class DjangoDebugContext(object):
             unwrap_cursor(connection)
 
 
+def evaluate_queryset(result, return_type):
+    """
+    Evaluate the lazy QuerySet returned by the resolver of a list field, so
+    its query runs (and is attributed to the field) before the following
+    fields are resolved. The list would be iterated anyway, while the
+    QuerySets of other fields may be sliced or counted by their subfields,
+    so they're left alone.
+    """
+    if isinstance(return_type, GraphQLNonNull):
+        return_type = return_type.of_type
+    if not isinstance(return_type, GraphQLList):
+        return
+    if isinstance(result, Promise):
+        if not result.is_fulfilled:
+            return
+        result = result.value
+    if isinstance(result, QuerySet):
+        len(result)
+
+
 class DjangoDebugMiddleware(object):
+    """
+    Records the SQL queries of the requests, exposed by the DjangoDebug
+    type. Only a ``sample_rate`` fraction of the requests is instrumented,
+    along with the requests carrying the ``header`` HTTP header, and in
+    ``lite`` mode the details of the queries are only formatted when they're
+    selected. Queries repeated ``n_plus_one_threshold`` times for a field
+    are reported as N+1 queries, or raise an error in ``strict`` mode. With
+    ``trace_resolvers`` the timing of every resolver is recorded too.
+    """
+
+    def __init__(
+        self,
+        sample_rate=None,
+        header=None,
+        lite=None,
+        n_plus_one_threshold=None,
+        strict=None,
+        trace_resolvers=None,
+    ):
+        self.sample_rate = sample_rate
+        self.header = header
+        self.lite = lite
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.strict = strict
+        self.trace_resolvers = trace_resolvers
+
+    def get_sample_rate(self):
+        if self.sample_rate is None:
+            return graphene_settings.DEBUG_SAMPLE_RATE
+        return self.sample_rate
+
+    def get_header(self):
+        return self.header or graphene_settings.DEBUG_HEADER
+
+    def is_lite(self):
+        if self.lite is None:
+            return graphene_settings.DEBUG_LITE_MODE
+        return self.lite
+
+    def get_n_plus_one_threshold(self):
+        if self.n_plus_one_threshold is None:
+            return graphene_settings.DEBUG_N_PLUS_ONE_THRESHOLD
+        return self.n_plus_one_threshold
+
+    def is_strict(self):
+        if self.strict is None:
+            return graphene_settings.DEBUG_N_PLUS_ONE_STRICT
+        return self.strict
+
+    def should_trace_resolvers(self):
+        if self.trace_resolvers is None:
+            return graphene_settings.DEBUG_TRACE_RESOLVERS
+        return self.trace_resolvers
+
+    def should_instrument(self, request):
+        header = self.get_header()
+        if header:
+            meta = getattr(request, "META", None) or {}
+            if "HTTP_{}".format(header.upper().replace("-", "_")) in meta:
+                return True
+        sample_rate = self.get_sample_rate()
+        return sample_rate >= 1 or random.random() < sample_rate
+
     def resolve(self, next, root, info, **args):
         request = info.context.get('request')
         django_debug = getattr(request, "django_debug", None)
@@ -44,7 +199,13 @@ class DjangoDebugMiddleware(object):
             if request is None:
                 raise Exception("DjangoDebug cannot be executed in None contexts")
             try:
-                request.django_debug = DjangoDebugContext()
+                request.django_debug = DjangoDebugContext(
+                    enabled=self.should_instrument(request),
+                    lite=self.is_lite(),
+                    n_plus_one_threshold=self.get_n_plus_one_threshold(),
+                    strict=self.is_strict(),
+                    trace_resolvers=self.should_trace_resolvers(),
+                )
             except Exception:
                 raise Exception(
                     "DjangoDebug need the context to be writable, context received: {}.".format(
@@ -53,6 +214,22 @@ class DjangoDebugMiddleware(object):
                 )
         if info.schema.get_type("DjangoDebug") == info.return_type:
             return request.django_debug.get_debug_promise()
-        promise = next(root, info, **args)
+        if not request.django_debug.enabled:
+            return next(root, info, **args)
+        previous_field = request.django_debug.start_field(info)
+        trace = request.django_debug.current_trace
+        try:
+            promise = next(root, info, **args)
+            evaluate_queryset(promise, info.return_type)
+        finally:
+            request.django_debug.finish_field(previous_field)
+        if trace:
+            trace.stop_when_resolved(promise)
+        n_plus_one = request.django_debug.n_plus_one
+        if n_plus_one.strict:
+            if isinstance(promise, Promise):
+                promise = promise.then(n_plus_one.raise_error)
+            else:
+                promise = n_plus_one.raise_error(promise)
         request.django_debug.add_promise(promise)
         return promise
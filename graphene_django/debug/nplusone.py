@@ -0,0 +1,86 @@
+"""
+Detection of N+1 queries.
+
+The statements recorded by the debug middleware are grouped by their
+normalized SQL (without params, and with ``IN`` lists of any length folded
+together) and by the path of the field that was being resolved when they
+ran, without list indexes. Groups repeated ``threshold`` times or more are
+reported as N+1 findings. In strict mode an ``NPlusOneError`` is raised
+once the field running the query that reached the threshold is resolved,
+which makes tests fail. It's never raised by the cursor itself, where it
+would replace the error of a failed query.
+"""
+import re
+from collections import OrderedDict
+
+from .types import DjangoDebugNPlusOne
+
+PLACEHOLDERS_RE = re.compile(r"%s(?:\s*,\s*%s)+")
+
+
+class NPlusOneError(Exception):
+    """Raised in strict mode when a query is repeated too many times."""
+
+
+def normalize_sql(raw_sql):
+    return PLACEHOLDERS_RE.sub("%s, ...", raw_sql)
+
+
+def normalize_path(path):
+    """The path of a field, without the indexes of the lists it's in."""
+    return ".".join(str(key) for key in path or () if not isinstance(key, int))
+
+
+class NPlusOneGroup(object):
+    def __init__(self, raw_sql, path):
+        self.raw_sql = raw_sql
+        self.path = path
+        self.count = 0
+        self.duration = 0
+
+
+class NPlusOneDetector(object):
+    def __init__(self, threshold, strict=False):
+        self.threshold = threshold
+        self.strict = strict
+        self.groups = OrderedDict()
+        # The NPlusOneError of strict mode, until it's raised
+        self.error = None
+
+    def add(self, raw_sql, path, duration):
+        raw_sql = normalize_sql(raw_sql)
+        path = normalize_path(path)
+        group = self.groups.get((raw_sql, path))
+        if group is None:
+            group = self.groups[(raw_sql, path)] = NPlusOneGroup(raw_sql, path)
+        group.count += 1
+        group.duration += duration
+
+        if self.strict and group.count == self.threshold and self.error is None:
+            self.error = NPlusOneError(
+                "The query {} ran {} times resolving {}.".format(
+                    raw_sql, group.count, path or "the operation"
+                )
+            )
+
+    def raise_error(self, value=None):
+        """Raise the pending NPlusOneError, if any, or return ``value``."""
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+        return value
+
+    def get_findings(self):
+        groups = [
+            group for group in self.groups.values() if group.count >= self.threshold
+        ]
+        groups.sort(key=lambda group: group.count, reverse=True)
+        return [
+            DjangoDebugNPlusOne(
+                raw_sql=group.raw_sql,
+                path=group.path,
+                count=group.count,
+                duration=group.duration,
+            )
+            for group in groups
+        ]
@@ -2,14 +2,27 @@
 from __future__ import absolute_import, unicode_literals
 
 import json
+import logging
+from logging.handlers import RotatingFileHandler
 from threading import local
 from time import time
 
+from django.db import NotSupportedError, transaction
 from django.utils import six
 from django.utils.encoding import force_text
 
+from ...settings import graphene_settings
+from ..tracing import format_path
 from .types import DjangoDebugSQL
 
+slow_query_logger = logging.getLogger("graphene_django.debug.slow_queries")
+
+# Size and number of the rotated files of DEBUG_SLOW_QUERY_LOG_FILE
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUP_COUNT = 5
+
+_slow_query_log_handlers = {}
+
 
 class SQLQueryTriggered(Exception):
     """Thrown when template panel triggers a query"""
@@ -51,6 +64,39 @@ def unwrap_cursor(connection):
         del connection._graphene_cursor
 
 
+def get_slow_query_log_handler(filename):
+    handler = _slow_query_log_handlers.get(filename)
+    if handler is None:
+        handler = RotatingFileHandler(
+            filename,
+            maxBytes=SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=SLOW_QUERY_LOG_BACKUP_COUNT,
+            delay=True,
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        _slow_query_log_handlers[filename] = handler
+    return handler
+
+
+def log_slow_query(alias, path, raw_sql, params, duration, explain):
+    """
+    Log a slow query to the ``graphene_django.debug.slow_queries`` logger,
+    and to the DEBUG_SLOW_QUERY_LOG_FILE rotating file when it's set.
+    """
+    message = "%.3fs on %s resolving %s\n%s\nparams: %s"
+    args = (duration, alias, path or "the operation", raw_sql, params)
+    if explain:
+        message += "\n%s"
+        args += (explain,)
+    record = slow_query_logger.makeRecord(
+        slow_query_logger.name, logging.WARNING, __file__, 0, message, args, None
+    )
+    slow_query_logger.handle(record)
+    filename = graphene_settings.DEBUG_SLOW_QUERY_LOG_FILE
+    if filename:
+        get_slow_query_log_handler(filename).handle(record)
+
+
 class ExceptionCursorWrapper(object):
     """
     Wraps a cursor and raises an exception on any operation.
@@ -64,6 +110,67 @@ class ExceptionCursorWrapper(object):
         raise SQLQueryTriggered()
 
 
+class LiteSQLRecord(object):
+    """
+    A query recorded in lite mode: only the raw SQL, its params, the alias
+    and the timing are kept, the rest is formatted when it's resolved.
+    """
+
+    def __init__(
+        self, wrapper, raw_sql, params, start_time, stop_time, explain=None
+    ):
+        self._wrapper = wrapper
+        self._params = params
+        self.raw_sql = raw_sql
+        self.path = format_path(getattr(wrapper.logger, "current_path", None))
+        self.alias = getattr(wrapper.db, "alias", "default")
+        self.start_time = start_time
+        self.stop_time = stop_time
+        self.duration = stop_time - start_time
+        self.explain = explain
+
+    @property
+    def vendor(self):
+        return getattr(self._wrapper.db.connection, "vendor", "unknown")
+
+    @property
+    def sql(self):
+        params = self._wrapper._quote_params(self._params)
+        if not params:
+            return self.raw_sql
+        try:
+            if isinstance(params, dict):
+                return self.raw_sql % params
+            return self.raw_sql % tuple(params)
+        except (TypeError, ValueError):
+            return self.raw_sql
+
+    @property
+    def params(self):
+        try:
+            return json.dumps(list(map(self._wrapper._decode, self._params)))
+        except Exception:
+            return ""  # object not JSON serializable
+
+    @property
+    def is_slow(self):
+        return is_slow(self.duration)
+
+    @property
+    def is_select(self):
+        return is_select(self.raw_sql)
+
+    trans_id = trans_status = iso_level = encoding = None
+
+
+def is_slow(duration):
+    return duration > graphene_settings.DEBUG_SLOW_QUERY_THRESHOLD
+
+
+def is_select(sql):
+    return sql.lower().strip().startswith("select")
+
+
 class NormalCursorWrapper(object):
     """
     Wraps a cursor and logs queries.
@@ -95,58 +202,130 @@ class NormalCursorWrapper(object):
         except UnicodeDecodeError:
             return "(encoded string)"
 
+    def _explain(self, sql, params):
+        """
+        Return the query plan of ``sql``, with EXPLAIN ANALYZE when it's
+        enabled and supported, or None when it can't be explained.
+        """
+        ops = self.db.ops
+        try:
+            prefix = None
+            if graphene_settings.DEBUG_EXPLAIN_ANALYZE:
+                try:
+                    prefix = ops.explain_query_prefix(analyze=True)
+                except ValueError:
+                    pass
+            if prefix is None:
+                prefix = ops.explain_query_prefix()
+        except NotSupportedError:
+            return None
+
+        # The cursor of the query may still have rows to fetch, and neither
+        # the EXPLAIN nor its savepoint should be recorded
+        wrapped_cursor = self.db.cursor
+        self.db.cursor = getattr(self.db, "_graphene_cursor", wrapped_cursor)
+        try:
+            # A failed EXPLAIN mustn't abort the transaction of the request
+            with transaction.atomic(using=self.db.alias, savepoint=True):
+                with self.db.cursor() as cursor:
+                    cursor.execute("{} {}".format(prefix, sql), params)
+                    rows = cursor.fetchall()
+        except Exception:
+            # e.g. the params of executemany
+            return None
+        finally:
+            self.db.cursor = wrapped_cursor
+        return "\n".join(" ".join(force_text(c) for c in row) for row in rows)
+
+    def _record_slow_query(self, sql, params, duration, succeeded=True):
+        explain = None
+        if (
+            succeeded
+            and graphene_settings.DEBUG_EXPLAIN_SLOW_QUERIES
+            and is_select(sql)
+        ):
+            explain = self._explain(sql, params)
+        log_slow_query(
+            getattr(self.db, "alias", "default"),
+            format_path(getattr(self.logger, "current_path", None)),
+            sql,
+            params,
+            duration,
+            explain,
+        )
+        return explain
+
     def _record(self, method, sql, params):
         start_time = time()
+        succeeded = False
         try:
-            return method(sql, params)
+            result = method(sql, params)
+            succeeded = True
+            return result
         finally:
             stop_time = time()
-            duration = stop_time - start_time
-            _params = ""
-            try:
-                _params = json.dumps(list(map(self._decode, params)))
-            except Exception:
-                pass  # object not JSON serializable
-
-            alias = getattr(self.db, "alias", "default")
-            conn = self.db.connection
-            vendor = getattr(conn, "vendor", "unknown")
-
-            params = {
-                "vendor": vendor,
-                "alias": alias,
-                "sql": self.db.ops.last_executed_query(
-                    self.cursor, sql, self._quote_params(params)
-                ),
-                "duration": duration,
-                "raw_sql": sql,
-                "params": _params,
-                "start_time": start_time,
-                "stop_time": stop_time,
-                "is_slow": duration > 10,
-                "is_select": sql.lower().strip().startswith("select"),
-            }
-
-            if vendor == "postgresql":
-                # If an erroneous query was ran on the connection, it might
-                # be in a state where checking isolation_level raises an
-                # exception.
-                try:
-                    iso_level = conn.isolation_level
-                except conn.InternalError:
-                    iso_level = "unknown"
-                params.update(
-                    {
-                        "trans_id": self.logger.get_transaction_id(alias),
-                        "trans_status": conn.get_transaction_status(),
-                        "iso_level": iso_level,
-                        "encoding": conn.encoding,
-                    }
+            explain = None
+            if is_slow(stop_time - start_time):
+                explain = self._record_slow_query(
+                    sql, params, stop_time - start_time, succeeded
+                )
+            if getattr(self.logger, "lite", False):
+                self.logger.add_sql(
+                    LiteSQLRecord(self, sql, params, start_time, stop_time, explain)
                 )
+            else:
+                self._record_sql(sql, params, start_time, stop_time, explain)
 
-            _sql = DjangoDebugSQL(**params)
-            # We keep `sql` to maintain backwards compatibility
-            self.logger.object.sql.append(_sql)
+    def _record_sql(self, sql, params, start_time, stop_time, explain=None):
+        duration = stop_time - start_time
+        _params = ""
+        try:
+            _params = json.dumps(list(map(self._decode, params)))
+        except Exception:
+            pass  # object not JSON serializable
+
+        alias = getattr(self.db, "alias", "default")
+        conn = self.db.connection
+        vendor = getattr(conn, "vendor", "unknown")
+
+        params = {
+            "vendor": vendor,
+            "alias": alias,
+            "sql": self.db.ops.last_executed_query(
+                self.cursor, sql, self._quote_params(params)
+            ),
+            "duration": duration,
+            "raw_sql": sql,
+            "params": _params,
+            "start_time": start_time,
+            "stop_time": stop_time,
+            "is_slow": is_slow(duration),
+            "is_select": is_select(sql),
+            "explain": explain,
+        }
+
+        if vendor == "postgresql":
+            # If an erroneous query was ran on the connection, it might
+            # be in a state where checking isolation_level raises an
+            # exception.
+            try:
+                iso_level = conn.isolation_level
+            except conn.InternalError:
+                iso_level = "unknown"
+            params.update(
+                {
+                    "trans_id": self.logger.get_transaction_id(alias),
+                    "trans_status": conn.get_transaction_status(),
+                    "iso_level": iso_level,
+                    "encoding": conn.encoding,
+                }
+            )
+
+        _sql = DjangoDebugSQL(
+            path=format_path(getattr(self.logger, "current_path", None)), **params
+        )
+        # We keep `sql` to maintain backwards compatibility
+        self.logger.add_sql(_sql)
 
     def callproc(self, procname, params=()):
         return self._record(self.cursor.callproc, procname, params)
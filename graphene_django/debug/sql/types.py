@@ -40,12 +40,21 @@ class DjangoDebugSQL(ObjectType):
     )
     is_slow = Boolean(
         required=True,
-        description="Whether this database query took more than 10 seconds.",
+        description=(
+            "Whether this database query took more than the slow query "
+            "threshold (10 seconds by default)."
+        ),
     )
     is_select = Boolean(
         required=True,
         description="Whether this database query was a SELECT.",
     )
+    path = String(
+        description="Path of the field being resolved when this query ran.",
+    )
+    explain = String(
+        description="Query plan of this SELECT, captured when it was slow.",
+    )
 
     # Postgres
     trans_id = String(description="Postgres transaction ID if available.")
@@ -1,11 +1,15 @@
 import pytest
+from mock import patch
 
 import graphene
+from django.db import DatabaseError, connection
 from graphene.relay import Node
 from graphene_django import DjangoConnectionField, DjangoObjectType
 
-from ...tests.models import Reporter
+from ...settings import graphene_settings
+from ...tests.models import Article, Reporter
 from ..middleware import DjangoDebugMiddleware
+from ..sql.tracking import NormalCursorWrapper, unwrap_cursor, wrap_cursor
 from ..types import DjangoDebug
 
 
@@ -127,6 +131,7 @@ def test_should_query_connection(info_with_context):
     query = """
         query ReporterQuery {
           allReporters(first:1) {
+            totalCount
             edges {
               node {
                 lastName
@@ -140,7 +145,9 @@ def test_should_query_connection(info_with_context):
           }
         }
     """
-    expected = {"allReporters": {"edges": [{"node": {"lastName": "ABA"}}]}}
+    expected = {
+        "allReporters": {"totalCount": 2, "edges": [{"node": {"lastName": "ABA"}}]}
+    }
     schema = graphene.Schema(query=Query)
     result = schema.execute(
         query,
@@ -178,6 +185,7 @@ def test_should_query_connectionfilter(info_with_context):
     query = """
         query ReporterQuery {
           allReporters(first:1) {
+            totalCount
             edges {
               node {
                 lastName
@@ -191,7 +199,9 @@ def test_should_query_connectionfilter(info_with_context):
           }
         }
     """
-    expected = {"allReporters": {"edges": [{"node": {"lastName": "ABA"}}]}}
+    expected = {
+        "allReporters": {"totalCount": 2, "edges": [{"node": {"lastName": "ABA"}}]}
+    }
     schema = graphene.Schema(query=Query)
     result = schema.execute(
         query,
@@ -203,3 +213,425 @@ def test_should_query_connectionfilter(info_with_context):
     assert "COUNT" in result.data["__debug"]["sql"][0]["rawSql"]
     query = str(Reporter.objects.all()[:1].query)
     assert result.data["__debug"]["sql"][1]["rawSql"] == query
+
+
+def test_should_query_connection_without_count(info_with_context):
+    r1 = Reporter(last_name="ABA")
+    r1.save()
+    r2 = Reporter(last_name="Griffin")
+    r2.save()
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType)
+        debug = graphene.Field(DjangoDebug, name="__debug")
+
+        def resolve_all_reporters(self, info, **args):
+            return Reporter.objects.all()
+
+    query = """
+        query ReporterQuery {
+          allReporters(first:1) {
+            pageInfo {
+              hasNextPage
+            }
+            edges {
+              node {
+                lastName
+              }
+            }
+          }
+          __debug {
+            sql {
+              rawSql
+            }
+          }
+        }
+    """
+    schema = graphene.Schema(query=Query)
+    result = schema.execute(
+        query,
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware()],
+    )
+    assert not result.errors
+    assert result.data["allReporters"] == {
+        "pageInfo": {"hasNextPage": True},
+        "edges": [{"node": {"lastName": "ABA"}}],
+    }
+    # A single query fetching one row past the page, and no COUNT
+    assert len(result.data["__debug"]["sql"]) == 1
+    query = str(Reporter.objects.all()[:2].query)
+    assert result.data["__debug"]["sql"][0]["rawSql"] == query
+
+
+def get_reporter_schema():
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+
+    class Query(graphene.ObjectType):
+        reporter = graphene.Field(ReporterType)
+        debug = graphene.Field(DjangoDebug, name="__debug")
+
+        def resolve_reporter(self, info, **args):
+            return Reporter.objects.filter(last_name="ABA").first()
+
+    return graphene.Schema(query=Query)
+
+
+REPORTER_DEBUG_QUERY = """
+    query ReporterQuery {
+      reporter {
+        lastName
+      }
+      __debug {
+        sql {
+          rawSql
+          sql
+          params
+          isSelect
+        }
+      }
+    }
+"""
+
+
+def test_should_skip_requests_out_of_the_sample(info_with_context):
+    Reporter.objects.create(last_name="ABA")
+    schema = get_reporter_schema()
+
+    result = schema.execute(
+        REPORTER_DEBUG_QUERY,
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware(sample_rate=0)],
+    )
+    assert not result.errors
+    assert result.data == {"reporter": {"lastName": "ABA"}, "__debug": None}
+
+    context = info_with_context().context
+    context["request"].META = {"HTTP_X_GRAPHENE_DEBUG": "1"}
+    result = schema.execute(
+        REPORTER_DEBUG_QUERY,
+        context_value=context,
+        middleware=[
+            DjangoDebugMiddleware(sample_rate=0, header="X-Graphene-Debug")
+        ],
+    )
+    assert not result.errors
+    assert len(result.data["__debug"]["sql"]) == 1
+
+
+@pytest.mark.parametrize("lite", [False, True])
+def test_should_record_queries_in_lite_mode(info_with_context, lite):
+    Reporter.objects.create(last_name="ABA")
+    schema = get_reporter_schema()
+
+    result = schema.execute(
+        REPORTER_DEBUG_QUERY,
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware(lite=lite)],
+    )
+    assert not result.errors
+    [sql] = result.data["__debug"]["sql"]
+    queryset = Reporter.objects.filter(last_name="ABA").order_by("pk")[:1]
+    assert sql["rawSql"] == queryset.query.sql_with_params()[0]
+    assert "'ABA'" in sql["sql"]
+    assert sql["params"] == '["ABA"]'
+    assert sql["isSelect"]
+
+
+def get_reporters_articles_schema():
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+
+    class Query(graphene.ObjectType):
+        reporters = graphene.List(ReporterType)
+        debug = graphene.Field(DjangoDebug, name="__debug")
+
+        def resolve_reporters(self, info, **args):
+            return Reporter.objects.all()
+
+    return graphene.Schema(query=Query)
+
+
+REPORTERS_ARTICLES_QUERY = """
+    query ReporterQuery {
+      reporters {
+        articles {
+          headline
+        }
+      }
+      __debug {
+        sql {
+          path
+        }
+        nPlusOne {
+          rawSql
+          path
+          count
+        }
+      }
+    }
+"""
+
+
+def test_should_not_evaluate_querysets_of_other_fields(info_with_context):
+    Reporter.objects.create(last_name="ABA")
+
+    class ReporterStats(graphene.ObjectType):
+        count = graphene.Int()
+
+        def resolve_count(self, info):
+            return self.count()
+
+    class Query(graphene.ObjectType):
+        stats = graphene.Field(ReporterStats)
+        debug = graphene.Field(DjangoDebug, name="__debug")
+
+        def resolve_stats(self, info):
+            return Reporter.objects.all()
+
+    result = graphene.Schema(query=Query).execute(
+        "query { stats { count } __debug { sql { rawSql } } }",
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware()],
+    )
+    assert not result.errors
+    assert result.data["stats"] == {"count": 1}
+    # Only the COUNT runs, the reporters aren't loaded
+    [sql] = result.data["__debug"]["sql"]
+    assert "COUNT" in sql["rawSql"]
+
+
+def test_should_detect_n_plus_one_queries(info_with_context, monkeypatch):
+    # Resolve the articles of each reporter with their own query
+    monkeypatch.setattr(graphene_settings, "RELATED_FIELD_LOADERS", False)
+    for last_name in ("A", "B", "C"):
+        Reporter.objects.create(last_name=last_name)
+    schema = get_reporters_articles_schema()
+
+    result = schema.execute(
+        REPORTERS_ARTICLES_QUERY,
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware(n_plus_one_threshold=3)],
+    )
+    assert not result.errors
+    debug = result.data["__debug"]
+    assert sorted(sql["path"] for sql in debug["sql"]) == [
+        "reporters",
+        "reporters.0.articles",
+        "reporters.1.articles",
+        "reporters.2.articles",
+    ]
+    [n_plus_one] = debug["nPlusOne"]
+    assert n_plus_one["path"] == "reporters.articles"
+    assert n_plus_one["count"] == 3
+    assert 'FROM "tests_article"' in n_plus_one["rawSql"]
+
+    # Batched with DataLoaders, the articles take a single query
+    monkeypatch.setattr(graphene_settings, "RELATED_FIELD_LOADERS", True)
+    result = schema.execute(
+        REPORTERS_ARTICLES_QUERY,
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware(n_plus_one_threshold=3)],
+    )
+    assert not result.errors
+    assert result.data["__debug"]["nPlusOne"] == []
+    # The batch runs once the fields are resolved, outside any of them
+    assert sorted(sql["path"] or "" for sql in result.data["__debug"]["sql"]) == [
+        "",
+        "reporters",
+    ]
+
+
+def test_should_raise_n_plus_one_queries_in_strict_mode(
+    info_with_context, monkeypatch
+):
+    monkeypatch.setattr(graphene_settings, "RELATED_FIELD_LOADERS", False)
+    for last_name in ("A", "B", "C"):
+        Reporter.objects.create(last_name=last_name)
+    schema = get_reporters_articles_schema()
+
+    result = schema.execute(
+        REPORTERS_ARTICLES_QUERY,
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware(n_plus_one_threshold=3, strict=True)],
+    )
+    assert len(result.errors) == 1
+    assert "ran 3 times resolving reporters.articles" in str(result.errors[0])
+
+
+def test_should_not_hide_errors_of_queries_in_strict_mode(info_with_context):
+    class Query(graphene.ObjectType):
+        missing = graphene.Int()
+        debug = graphene.Field(DjangoDebug, name="__debug")
+
+        def resolve_missing(self, info):
+            with connection.cursor() as cursor:
+                for _ in range(2):
+                    try:
+                        cursor.execute("SELECT * FROM missing_table")
+                    except DatabaseError:
+                        pass
+                cursor.execute("SELECT * FROM missing_table")
+
+    result = graphene.Schema(query=Query).execute(
+        "query { missing __debug { nPlusOne { count } } }",
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware(n_plus_one_threshold=3, strict=True)],
+    )
+    errors = {error.path[0]: str(error) for error in result.errors}
+    assert sorted(errors) == ["__debug", "missing"]
+    assert "missing_table" in errors["missing"]
+    assert "ran 3 times resolving missing" in errors["__debug"]
+
+
+def test_should_trace_resolvers(info_with_context, monkeypatch):
+    monkeypatch.setattr(graphene_settings, "RELATED_FIELD_LOADERS", False)
+    for last_name in ("A", "B"):
+        Reporter.objects.create(last_name=last_name)
+    schema = get_reporters_articles_schema()
+    query = """
+        query ReporterQuery {
+          reporters {
+            articles {
+              headline
+            }
+          }
+          __debug {
+            resolvers {
+              path
+              parentType
+              fieldName
+              returnType
+              startOffset
+              duration
+              sql {
+                rawSql
+              }
+            }
+          }
+        }
+    """
+
+    result = schema.execute(
+        query,
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware(trace_resolvers=True)],
+    )
+    assert not result.errors
+    resolvers = {
+        resolver["path"]: resolver for resolver in result.data["__debug"]["resolvers"]
+    }
+    assert sorted(resolvers) == [
+        "reporters",
+        "reporters.0.articles",
+        "reporters.1.articles",
+    ]
+    reporters = resolvers["reporters"]
+    assert reporters["parentType"] == "Query"
+    assert reporters["fieldName"] == "reporters"
+    assert reporters["returnType"] == "[ReporterType]"
+    assert 'FROM "tests_reporter"' in reporters["sql"][0]["rawSql"]
+    for path in ("reporters.0.articles", "reporters.1.articles"):
+        [sql] = resolvers[path]["sql"]
+        assert 'FROM "tests_article"' in sql["rawSql"]
+    for resolver in resolvers.values():
+        assert resolver["startOffset"] >= 0
+        assert resolver["duration"] >= 0
+
+
+def test_should_not_trace_resolvers_by_default(info_with_context):
+    result = get_reporters_articles_schema().execute(
+        "query { reporters { id } __debug { resolvers { path } } }",
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware()],
+    )
+    assert not result.errors
+    assert result.data["__debug"]["resolvers"] == []
+
+
+@pytest.mark.parametrize("lite", [False, True])
+def test_should_explain_slow_queries(info_with_context, monkeypatch, tmpdir, lite):
+    log_file = tmpdir.join("slow_queries.log")
+    monkeypatch.setattr(graphene_settings, "DEBUG_SLOW_QUERY_THRESHOLD", -1)
+    monkeypatch.setattr(graphene_settings, "DEBUG_EXPLAIN_SLOW_QUERIES", True)
+    monkeypatch.setattr(graphene_settings, "DEBUG_SLOW_QUERY_LOG_FILE", str(log_file))
+    Reporter.objects.create(last_name="ABA")
+    query = """
+        query ReporterQuery {
+          reporters {
+            lastName
+          }
+          __debug {
+            sql {
+              rawSql
+              isSlow
+              explain
+            }
+          }
+        }
+    """
+
+    result = get_reporters_articles_schema().execute(
+        query,
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware(lite=lite)],
+    )
+    assert not result.errors
+    [sql] = result.data["__debug"]["sql"]
+    assert sql["isSlow"]
+    # SQLite explains the query plan
+    assert "SCAN" in sql["explain"]
+    log = log_file.read()
+    assert sql["rawSql"] in log
+    assert "resolving reporters" in log
+
+
+def test_should_not_explain_failed_queries(monkeypatch):
+    monkeypatch.setattr(graphene_settings, "DEBUG_SLOW_QUERY_THRESHOLD", -1)
+    monkeypatch.setattr(graphene_settings, "DEBUG_EXPLAIN_SLOW_QUERIES", True)
+
+    class Logger(object):
+        lite = True
+
+        def __init__(self):
+            self.sql = []
+
+        def add_sql(self, sql):
+            self.sql.append(sql)
+
+    logger = Logger()
+    wrap_cursor(connection, logger)
+    try:
+        with patch.object(
+            NormalCursorWrapper, "_explain", autospec=True, return_value="plan"
+        ):
+            with pytest.raises(DatabaseError):
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT * FROM missing_table")
+            assert not Reporter.objects.exists()
+    finally:
+        unwrap_cursor(connection)
+    assert [sql.explain for sql in logger.sql] == [None, "plan"]
+
+
+def test_should_not_explain_fast_queries(info_with_context):
+    result = get_reporters_articles_schema().execute(
+        "query { reporters { id } __debug { sql { isSlow explain } } }",
+        context_value=info_with_context().context,
+        middleware=[DjangoDebugMiddleware()],
+    )
+    assert not result.errors
+    assert result.data["__debug"]["sql"] == [{"isSlow": False, "explain": None}]
@@ -0,0 +1,49 @@
+"""
+Tracing of the resolvers, modelled on Apollo tracing.
+
+Each field resolved while the debug middleware traces the request gets a
+``ResolverTrace`` with its path, its start offset from the start of the
+request and its duration. Resolvers returning a pending promise are timed
+until the promise settles. The queries run while a field is being resolved
+(including the evaluation of the QuerySet it returns) are attributed to it,
+and the queries run afterwards (e.g. by DataLoader batches) to the field
+enclosing it, if any.
+"""
+from time import time
+
+from promise import Promise
+
+
+def format_path(path):
+    """The path of a field as a string, e.g. ``reporters.0.articles``."""
+    if not path:
+        return None
+    return ".".join(str(key) for key in path)
+
+
+class ResolverTrace(object):
+    def __init__(self, info, request_start_time):
+        self.path = format_path(info.path)
+        self.parent_type = str(info.parent_type)
+        self.field_name = info.field_name
+        self.return_type = str(info.return_type)
+        self.start_time = time()
+        self.start_offset = self.start_time - request_start_time
+        self.stop_time = None
+        self.sql = []
+
+    @property
+    def duration(self):
+        if self.stop_time is None:
+            return None
+        return self.stop_time - self.start_time
+
+    def stop(self, *args):
+        if self.stop_time is None:
+            self.stop_time = time()
+
+    def stop_when_resolved(self, result):
+        if isinstance(result, Promise) and result.is_pending:
+            result.then(self.stop, self.stop)
+        else:
+            self.stop()
@@ -1,8 +1,55 @@
-from graphene import List, ObjectType
+from graphene import Float, Int, List, ObjectType, String
 
 from .sql.types import DjangoDebugSQL
 
 
+class DjangoDebugNPlusOne(ObjectType):
+    class Meta:
+        description = (
+            "A database query repeated for the items of a list (N+1 query)."
+        )
+
+    raw_sql = String(
+        required=True,
+        description="The raw SQL of the repeated query, without params.",
+    )
+    path = String(
+        required=True,
+        description=(
+            "Path of the field being resolved when the query ran, "
+            "without list indexes."
+        ),
+    )
+    count = Int(required=True, description="Number of times the query ran.")
+    duration = Float(
+        required=True,
+        description="Total duration of the repeated queries in seconds.",
+    )
+
+
+class DjangoDebugResolver(ObjectType):
+    class Meta:
+        description = "The trace of a resolved field."
+
+    path = String(required=True, description="Path of the resolved field.")
+    parent_type = String(
+        required=True, description="Type the resolved field belongs to."
+    )
+    field_name = String(required=True, description="Name of the resolved field.")
+    return_type = String(
+        required=True, description="Type returned by the resolved field."
+    )
+    start_offset = Float(
+        required=True,
+        description="Start time of the resolver, in seconds since the request started.",
+    )
+    duration = Float(description="Duration of the resolver in seconds.")
+    sql = List(
+        DjangoDebugSQL,
+        description="SQL queries executed while resolving the field.",
+    )
+
+
 class DjangoDebug(ObjectType):
     class Meta:
         description = "Debugging information for the current query."
@@ -11,3 +58,11 @@ class DjangoDebug(ObjectType):
         DjangoDebugSQL,
         description="Executed SQL queries for this API query.",
     )
+    n_plus_one = List(
+        DjangoDebugNPlusOne,
+        description="Queries repeated for the items of lists (N+1 queries).",
+    )
+    resolvers = List(
+        DjangoDebugResolver,
+        description="Traces of the resolved fields, when resolvers are traced.",
+    )
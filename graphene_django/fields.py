@@ -8,12 +8,23 @@ from promise import Promise
 
 from graphene.types import Field, List
 from graphene.relay import ConnectionField, PageInfo
-from graphql_relay.connection.arrayconnection import connection_from_list_slice
-
-from rest_framework.exceptions import PermissionDenied
-
+from graphql_relay.connection.arrayconnection import (
+    connection_from_list_slice,
+    get_offset_with_default,
+)
+
+from .counting import COUNT_STRATEGIES, EXACT, count_queryset
+from .dataloaders import get_related_resolver
+from .deadline import check_deadline
+from .optimization import (
+    is_prefetched,
+    optimize_connection_queryset,
+    optimize_list_queryset,
+)
+from .pagination import connection_from_keyset_queryset, get_keyset_ordering
+from .rest_framework.permissions import check_permissions
 from .settings import graphene_settings
-from .utils import maybe_queryset
+from .utils import get_selected_field_names, maybe_queryset
 
 from graphene.types.field import Field
 
@@ -30,11 +41,9 @@ def check_permission_classes(info, field, permission_classes):
             )
 
     if permission_classes:
-        for permission in [p() for p in permission_classes]:
-            if not permission.has_permission(
-                info.context.get("request"), info.context.get("view")
-            ):
-                raise PermissionDenied(detail=getattr(permission, "message", None))
+        check_permissions(
+            permission_classes, info.context.get("request"), info.context.get("view")
+        )
 
 
 class DjangoField(Field):
@@ -46,6 +55,7 @@ class DjangoField(Field):
     def field_resolver(
         cls, resolver, root, info, permission_classes=None, *args, **kwargs
     ):
+        check_deadline(info)
         check_permission_classes(info, cls, permission_classes)
 
         return resolver(root, info, *args, **kwargs)
@@ -58,9 +68,25 @@ class DjangoField(Field):
         )
 
 
+class DjangoRelatedField(Field):
+    """
+    A field resolving the related object of ``model_field`` through the
+    request's DataLoaders, unless it has a custom resolver.
+    """
+
+    def __init__(self, _type, model_field, *args, **kwargs):
+        self.model_field = model_field
+        super(DjangoRelatedField, self).__init__(_type, *args, **kwargs)
+
+    def get_resolver(self, parent_resolver):
+        return self.resolver or get_related_resolver(self.model_field, parent_resolver)
+
+
 class DjangoListField(Field):
     def __init__(self, _type, *args, **kwargs):
         self.permission_classes = kwargs.pop("permission_classes", None)
+        # The relation resolved by this field, loaded through DataLoaders
+        self.model_field = kwargs.pop("model_field", None)
         super(DjangoListField, self).__init__(List(_type), *args, **kwargs)
 
     @property
@@ -68,16 +94,30 @@ class DjangoListField(Field):
         return self.type.of_type._meta.node._meta.model
 
     @classmethod
-    def list_resolver(cls, resolver, root, info, permission_classes=None, **args):
+    def list_resolver(
+        cls, resolver, root, info, permission_classes=None, node_type=None, **args
+    ):
+        check_deadline(info)
         check_permission_classes(info, cls, permission_classes)
-        
-        return maybe_queryset(resolver(root, info, **args))
+
+        iterable = maybe_queryset(resolver(root, info, **args))
+        if (
+            graphene_settings.OPTIMIZE_QUERIES
+            and node_type is not None
+            and isinstance(iterable, QuerySet)
+            and iterable._result_cache is None
+        ):
+            iterable = optimize_list_queryset(iterable, info, node_type)
+        return iterable
 
     def get_resolver(self, parent_resolver):
+        if self.model_field is not None:
+            parent_resolver = get_related_resolver(self.model_field, parent_resolver)
         return partial(
             self.list_resolver,
             parent_resolver,
             permission_classes=self.permission_classes,
+            node_type=self.type.of_type,
         )
 
 
@@ -92,6 +132,21 @@ class DjangoConnectionField(ConnectionField):
             graphene_settings.RELAY_CONNECTION_ENFORCE_FIRST_OR_LAST,
         )
         self.permission_classes = kwargs.pop("permission_classes", None)
+        self.pagination = kwargs.pop("pagination", "offset")
+        assert self.pagination in ("offset", "keyset"), (
+            'The pagination of a DjangoConnectionField must be "offset" or '
+            '"keyset", received "{}".'
+        ).format(self.pagination)
+        self.count_strategy = kwargs.pop("count_strategy", EXACT)
+        assert self.count_strategy in COUNT_STRATEGIES, (
+            "The count_strategy of a DjangoConnectionField must be one of {}, "
+            'received "{}".'
+        ).format(", ".join(COUNT_STRATEGIES), self.count_strategy)
+        self.max_count = kwargs.pop(
+            "max_count", graphene_settings.RELAY_CONNECTION_MAX_COUNT
+        )
+        # Cost of the field itself in the query cost analysis
+        self.cost = kwargs.pop("cost", None)
         super(DjangoConnectionField, self).__init__(*args, **kwargs)
 
     @property
@@ -130,14 +185,69 @@ class DjangoConnectionField(ConnectionField):
         return queryset & default_queryset
 
     @classmethod
-    def resolve_connection(cls, connection, default_manager, args, iterable):
+    def needs_total_count(cls, info, args, pagination="offset"):
+        """
+        Whether the length of the connection must be counted: it's needed
+        when ``totalCount`` is selected or to paginate from the end with
+        ``last`` and offset cursors. Without ``info`` we can't tell, so it's
+        always counted.
+        """
+        if info is None or (pagination == "offset" and args.get("last")):
+            return True
+        selected_fields = get_selected_field_names(info)
+        return selected_fields is None or "totalCount" in selected_fields
+
+    @classmethod
+    def resolve_connection(
+        cls,
+        connection,
+        default_manager,
+        args,
+        iterable,
+        info=None,
+        pagination="offset",
+        count_strategy=EXACT,
+        max_count=None,
+    ):
         if iterable is None:
             iterable = default_manager
         iterable = maybe_queryset(iterable)
+        if (
+            graphene_settings.OPTIMIZE_QUERIES
+            and isinstance(iterable, QuerySet)
+            and is_prefetched(iterable)
+        ):
+            # The rows were prefetched along with the parent object, merging
+            # with the default manager would query them again
+            iterable = list(iterable)
         if isinstance(iterable, QuerySet):
             if iterable is not default_manager:
                 default_queryset = maybe_queryset(default_manager)
                 iterable = cls.merge_querysets(default_queryset, iterable)
+            if graphene_settings.OPTIMIZE_QUERIES and info is not None:
+                required_fields = ()
+                if pagination == "keyset":
+                    required_fields = [
+                        attname for attname, _ in get_keyset_ordering(iterable)
+                    ]
+                iterable = optimize_connection_queryset(
+                    iterable, info, connection._meta.node, required_fields
+                )
+            if pagination == "keyset":
+                return cls.resolve_keyset_connection(
+                    connection, args, iterable, info, count_strategy, max_count
+                )
+            if not cls.needs_total_count(info, args):
+                return cls.resolve_uncounted_connection(connection, args, iterable)
+            if count_strategy != EXACT and not args.get("last"):
+                # The count may be approximate, so it can't be used to paginate
+                connection = cls.resolve_uncounted_connection(
+                    connection, args, iterable
+                )
+                _len, strategy = count_queryset(iterable, count_strategy, max_count)
+                connection.total_count = _len
+                connection.total_count_strategy = strategy
+                return connection
             _len = iterable.count()
         else:
             _len = len(iterable)
@@ -154,6 +264,63 @@ class DjangoConnectionField(ConnectionField):
         connection.iterable = iterable
         connection.length = _len
         connection.total_count = _len
+        connection.total_count_strategy = EXACT
+        return connection
+
+    @classmethod
+    def resolve_uncounted_connection(cls, connection, args, queryset):
+        """
+        Paginate ``queryset`` without counting it. One row past the
+        requested page is fetched to find out if there is a next page.
+        """
+        start = get_offset_with_default(args.get("after"), -1) + 1
+        end = get_offset_with_default(args.get("before"), None)
+        first = args.get("first")
+        if isinstance(first, int):
+            end = start + first + 1 if end is None else min(end, start + first + 1)
+        if end is not None:
+            end = max(end, start)
+
+        _slice = list(queryset[start:end])
+        _len = start + len(_slice)
+        connection = connection_from_list_slice(
+            _slice,
+            args,
+            slice_start=start,
+            list_length=_len,
+            list_slice_length=len(_slice),
+            connection_type=connection,
+            edge_type=connection.Edge,
+            pageinfo_type=PageInfo,
+        )
+        connection.iterable = queryset
+        connection.length = None
+        connection.total_count = None
+        connection.total_count_strategy = None
+        return connection
+
+    @classmethod
+    def resolve_keyset_connection(
+        cls, connection, args, queryset, info=None, count_strategy=EXACT, max_count=None
+    ):
+        """
+        Paginate ``queryset`` with cursors holding the values of its ordering
+        columns rather than offsets.
+        """
+        _len = strategy = None
+        if cls.needs_total_count(info, args, pagination="keyset"):
+            _len, strategy = count_queryset(queryset, count_strategy, max_count)
+        connection = connection_from_keyset_queryset(
+            queryset,
+            args,
+            connection_type=connection,
+            edge_type=connection.Edge,
+            pageinfo_type=PageInfo,
+        )
+        connection.iterable = queryset
+        connection.length = _len
+        connection.total_count = _len
+        connection.total_count_strategy = strategy
         return connection
 
     @classmethod
@@ -165,12 +332,16 @@ class DjangoConnectionField(ConnectionField):
         max_limit,
         enforce_first_or_last,
         permission_classes,
+        pagination,
+        count_strategy,
+        max_count,
         root,
         info,
         **args
     ):
+        check_deadline(info)
         check_permission_classes(info, cls, permission_classes)
-        
+
         first = args.get("first")
         last = args.get("last")
 
@@ -193,7 +364,16 @@ class DjangoConnectionField(ConnectionField):
                 args["last"] = min(last, max_limit)
 
         iterable = resolver(root, info, **args)
-        on_resolve = partial(cls.resolve_connection, connection, default_manager, args)
+        on_resolve = partial(
+            cls.resolve_connection,
+            connection,
+            default_manager,
+            args,
+            info=info,
+            pagination=pagination,
+            count_strategy=count_strategy,
+            max_count=max_count,
+        )
 
         if Promise.is_thenable(iterable):
             return Promise.resolve(iterable).then(on_resolve)
@@ -209,4 +389,7 @@ class DjangoConnectionField(ConnectionField):
             self.max_limit,
             self.enforce_first_or_last,
             self.permission_classes,
+            self.pagination,
+            self.count_strategy,
+            self.max_count,
         )
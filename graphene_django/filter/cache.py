@@ -0,0 +1,97 @@
+"""
+Opt-in caching of the connections resolved by DjangoFilterConnectionField.
+
+Fields created with a ``cache_timeout`` keep the page they resolve in a
+Django cache, keyed by the field, its parent object, the filter and
+pagination arguments, the selection set and a version token of the model.
+The token is replaced whenever an instance of the model is saved or deleted
+(or one of its many to many relations changes), which invalidates every
+cached page of the model at once, including for changes made by other
+processes (see ``graphene_django.model_versions``). Caches other than the
+ones of ``MODEL_VERSIONS_CACHE_ALIASES`` are only invalidated by changes
+made in the processes that built the field.
+
+Only the field's model is tracked, so fields filtering on related models may
+return stale pages until they expire, and fields whose results depend on the
+request (e.g. on the user) must not be cached. The nodes are cached without
+the related objects fetched along with them (with ``select_related`` or
+``prefetch_related``), which are fetched again when they're selected.
+"""
+import copy
+import hashlib
+
+from django.db.models import Model
+from graphene.relay import PageInfo
+from graphql.language.printer import print_ast
+
+from ..model_versions import get_model_label
+
+RESULT_KEY_PREFIX = "graphene:filter-result:"
+
+
+def get_result_key(model, version, root, info, args):
+    parent = None
+    if isinstance(root, Model):
+        parent = (get_model_label(type(root)), root.pk)
+    selection = "".join(print_ast(field_ast) for field_ast in info.field_asts)
+    key = repr(
+        (
+            info.parent_type.name,
+            info.field_name,
+            parent,
+            sorted(args.items()),
+            selection,
+        )
+    )
+    return "{}{}:{}:{}".format(
+        RESULT_KEY_PREFIX,
+        get_model_label(model),
+        version,
+        hashlib.sha256(key.encode("utf-8")).hexdigest(),
+    )
+
+
+def strip_relations(node):
+    """Return a copy of the instance ``node`` without its related objects."""
+    if not isinstance(node, Model):
+        return node
+    node = copy.copy(node)
+    node._state = copy.copy(node._state)
+    node._state.fields_cache = {}
+    node.__dict__.pop("_prefetched_objects_cache", None)
+    return node
+
+
+def dump_connection(connection):
+    """Return the picklable data of a resolved connection."""
+    page_info = connection.page_info
+    return {
+        "edges": [
+            (strip_relations(edge.node), edge.cursor) for edge in connection.edges
+        ],
+        "page_info": {
+            "start_cursor": page_info.start_cursor,
+            "end_cursor": page_info.end_cursor,
+            "has_previous_page": page_info.has_previous_page,
+            "has_next_page": page_info.has_next_page,
+        },
+        "length": connection.length,
+        "total_count": connection.total_count,
+        "total_count_strategy": connection.total_count_strategy,
+    }
+
+
+def load_connection(connection_type, data):
+    """Rebuild a connection of ``connection_type`` from its cached data."""
+    connection = connection_type(
+        edges=[
+            connection_type.Edge(node=node, cursor=cursor)
+            for node, cursor in data["edges"]
+        ],
+        page_info=PageInfo(**data["page_info"]),
+    )
+    connection.iterable = [node for node, _ in data["edges"]]
+    connection.length = data["length"]
+    connection.total_count = data["total_count"]
+    connection.total_count_strategy = data["total_count_strategy"]
+    return connection
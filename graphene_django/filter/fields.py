@@ -1,8 +1,13 @@
 from collections import OrderedDict
 from functools import partial
 
+from django.core.cache import caches
+from promise import Promise
+
 from graphene.types.argument import to_arguments
-from ..fields import DjangoConnectionField
+from ..fields import DjangoConnectionField, check_permission_classes
+from ..model_versions import get_model_version, track_cache_alias
+from .cache import dump_connection, get_result_key, load_connection
 from .utils import get_filtering_args_from_filterset, get_filterset_class
 
 
@@ -14,23 +19,35 @@ class DjangoFilterConnectionField(DjangoConnectionField):
         order_by=None,
         extra_filter_meta=None,
         filterset_class=None,
+        cache_timeout=None,
+        cache_alias="default",
         *args,
         **kwargs
     ):
+        # Resolved pages are cached for cache_timeout seconds when it's set
+        self.cache_timeout = cache_timeout
+        self.cache_alias = cache_alias
         self._fields = fields
         self._provided_filterset_class = filterset_class
         self._filterset_class = None
         self._extra_filter_meta = extra_filter_meta
         self._base_args = None
+        self._args = None
+        self._filtering_args = None
         super(DjangoFilterConnectionField, self).__init__(type, *args, **kwargs)
 
     @property
     def args(self):
-        return to_arguments(self._base_args or OrderedDict(), self.filtering_args)
+        if self._args is None:
+            self._args = to_arguments(
+                self._base_args or OrderedDict(), self.filtering_args
+            )
+        return self._args
 
     @args.setter
     def args(self, args):
         self._base_args = args
+        self._args = None
 
     @property
     def filterset_class(self):
@@ -48,7 +65,11 @@ class DjangoFilterConnectionField(DjangoConnectionField):
 
     @property
     def filtering_args(self):
-        return get_filtering_args_from_filterset(self.filterset_class, self.node_type)
+        if self._filtering_args is None:
+            self._filtering_args = get_filtering_args_from_filterset(
+                self.filterset_class, self.node_type
+            )
+        return self._filtering_args
 
     @classmethod
     def merge_querysets(cls, default_queryset, queryset):
@@ -83,12 +104,37 @@ class DjangoFilterConnectionField(DjangoConnectionField):
         max_limit,
         enforce_first_or_last,
         permission_classes,
+        pagination,
+        count_strategy,
+        max_count,
         filterset_class,
         filtering_args,
+        cache_timeout,
+        cache_alias,
         root,
         info,
         **args
     ):
+        if cache_timeout is not None:
+            return cls.cached_connection_resolver(
+                resolver,
+                connection,
+                default_manager,
+                max_limit,
+                enforce_first_or_last,
+                permission_classes,
+                pagination,
+                count_strategy,
+                max_count,
+                filterset_class,
+                filtering_args,
+                cache_timeout,
+                cache_alias,
+                root,
+                info,
+                **args
+            )
+
         filter_kwargs = {k: v for k, v in args.items() if k in filtering_args}
         qs = filterset_class(
             data=filter_kwargs,
@@ -103,12 +149,77 @@ class DjangoFilterConnectionField(DjangoConnectionField):
             max_limit,
             enforce_first_or_last,
             permission_classes,
+            pagination,
+            count_strategy,
+            max_count,
+            root,
+            info,
+            **args
+        )
+
+    @classmethod
+    def cached_connection_resolver(
+        cls,
+        resolver,
+        connection,
+        default_manager,
+        max_limit,
+        enforce_first_or_last,
+        permission_classes,
+        pagination,
+        count_strategy,
+        max_count,
+        filterset_class,
+        filtering_args,
+        cache_timeout,
+        cache_alias,
+        root,
+        info,
+        **args
+    ):
+        """
+        Resolve the connection from the cache, or resolve it and cache it.
+        """
+        cache = caches[cache_alias]
+        model = default_manager.model
+        key = get_result_key(
+            model, get_model_version(cache, model), root, info, args
+        )
+        data = cache.get(key)
+        if data is not None:
+            # connection_resolver checks them when the page is resolved
+            check_permission_classes(info, cls, permission_classes)
+            return load_connection(connection, data)
+
+        def store(resolved):
+            cache.set(key, dump_connection(resolved), cache_timeout)
+            return resolved
+
+        resolved = cls.connection_resolver(
+            resolver,
+            connection,
+            default_manager,
+            max_limit,
+            enforce_first_or_last,
+            permission_classes,
+            pagination,
+            count_strategy,
+            max_count,
+            filterset_class,
+            filtering_args,
+            None,
+            cache_alias,
             root,
             info,
             **args
         )
+        if Promise.is_thenable(resolved):
+            return Promise.resolve(resolved).then(store)
+        return store(resolved)
 
     def get_resolver(self, parent_resolver):
+        if self.cache_timeout is not None:
+            track_cache_alias(self.cache_alias)
         return partial(
             self.connection_resolver,
             parent_resolver,
@@ -117,6 +228,11 @@ class DjangoFilterConnectionField(DjangoConnectionField):
             self.max_limit,
             self.enforce_first_or_last,
             self.permission_classes,
+            self.pagination,
+            self.count_strategy,
+            self.max_count,
             self.filterset_class,
             self.filtering_args,
+            self.cache_timeout,
+            self.cache_alias,
         )
@@ -82,13 +82,49 @@ if VERSION[0] < 2:
     GrapheneFilterSetMixin = GrapheneFilterSetMixinPython2
 
 
+# The FilterSet classes generated for the fields, so fields filtered the same
+# way share a single class and its filters. The keys can't be weak: most are
+# tuples, and the generated classes subclass the others
+_filterset_classes = {}
+
+
+def freeze_meta(value):
+    """Return a hashable version of a FilterSet Meta option."""
+    if isinstance(value, dict):
+        return tuple(
+            sorted(
+                ((key, freeze_meta(item)) for key, item in value.items()),
+                key=lambda item: repr(item[0]),
+            )
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_meta(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(freeze_meta(item) for item in value)
+    return value
+
+
+def get_or_create_filterset(key, create):
+    try:
+        filterset = _filterset_classes.get(key)
+    except TypeError:
+        # Unhashable Meta options, the class can't be shared
+        return create()
+    if filterset is None:
+        filterset = _filterset_classes[key] = create()
+    return filterset
+
+
 def setup_filterset(filterset_class):
     """ Wrap a provided filterset in Graphene-specific functionality
     """
-    return type(
-        "Graphene{}".format(filterset_class.__name__),
-        (filterset_class, GrapheneFilterSetMixin),
-        {},
+    return get_or_create_filterset(
+        filterset_class,
+        lambda: type(
+            "Graphene{}".format(filterset_class.__name__),
+            (filterset_class, GrapheneFilterSetMixin),
+            {},
+        ),
     )
 
 
@@ -96,10 +132,14 @@ def custom_filterset_factory(model, filterset_base_class=FilterSet, **meta):
     """ Create a filterset for the given model using the provided meta data
     """
     meta.update({"model": model})
-    meta_class = type(str("Meta"), (object,), meta)
-    filterset = type(
-        str("%sFilterSet" % model._meta.object_name),
-        (filterset_base_class, GrapheneFilterSetMixin),
-        {"Meta": meta_class},
-    )
-    return filterset
+
+    def create():
+        meta_class = type(str("Meta"), (object,), meta)
+        return type(
+            str("%sFilterSet" % model._meta.object_name),
+            (filterset_base_class, GrapheneFilterSetMixin),
+            {"Meta": meta_class},
+        )
+
+    key = (model, filterset_base_class, freeze_meta(meta))
+    return get_or_create_filterset(key, create)
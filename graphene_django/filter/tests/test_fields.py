@@ -108,6 +108,56 @@ def test_filter_shortcut_filterset_arguments_dict():
     assert_arguments(field, "headline", "headline__icontains", "reporter")
 
 
+def test_filter_arguments_are_computed_once(monkeypatch):
+    from graphene_django.forms import converter
+
+    conversions = []
+    convert_form_field = converter.convert_form_field
+
+    def counting_convert_form_field(field):
+        conversions.append(field)
+        return convert_form_field(field)
+
+    monkeypatch.setattr(converter, "convert_form_field", counting_convert_form_field)
+
+    class ArticleCountingFilter(ArticleFilter):
+        pass
+
+    field = DjangoFilterConnectionField(
+        ArticleNode, filterset_class=ArticleCountingFilter
+    )
+    assert get_args(field) is get_args(field)
+    assert field.filtering_args is field.filtering_args
+    converted = len(conversions)
+    assert converted == len(ArticleCountingFilter.base_filters)
+
+    # Fields filtered with the same FilterSet share its conversions
+    other_field = DjangoFilterConnectionField(
+        ArticleNode, filterset_class=ArticleCountingFilter
+    )
+    assert set(get_args(other_field)) == set(get_args(field))
+    assert len(conversions) == converted
+
+
+def test_filterset_classes_are_shared():
+    field = DjangoFilterConnectionField(
+        ArticleNode, fields={"headline": ["exact", "icontains"]}
+    )
+    same_field = DjangoFilterConnectionField(
+        ArticleNode, fields={"headline": ("exact", "icontains")}
+    )
+    other_field = DjangoFilterConnectionField(ArticleNode, fields=["headline"])
+    assert field.filterset_class is same_field.filterset_class
+    assert field.filterset_class is not other_field.filterset_class
+
+    field = DjangoFilterConnectionField(ArticleNode, filterset_class=ArticleFilter)
+    same_field = DjangoFilterConnectionField(
+        ArticleNode, filterset_class=ArticleFilter
+    )
+    assert field.filterset_class is same_field.filterset_class
+    assert issubclass(field.filterset_class, ArticleFilter)
+
+
 def test_filter_explicit_filterset_orderable():
     field = DjangoFilterConnectionField(ReporterNode, filterset_class=ReporterFilter)
     assert_orderable(field)
@@ -696,3 +746,211 @@ def test_annotation_is_perserved():
 
     assert not result.errors
     assert result.data == expected
+
+
+def test_should_paginate_filter_node_with_keyset_cursors():
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            filter_fields = ("last_name",)
+
+    class Query(ObjectType):
+        all_reporters = DjangoFilterConnectionField(ReporterType, pagination="keyset")
+
+        def resolve_all_reporters(self, info, **args):
+            return Reporter.objects.order_by("-first_name")
+
+    for first_name in ("a", "b", "c"):
+        Reporter.objects.create(first_name=first_name, last_name="Doe")
+    Reporter.objects.create(first_name="d", last_name="Smith")
+
+    schema = Schema(query=Query)
+    query = """
+        query NodeFilteringQuery($after: String) {
+            allReporters(lastName: "Doe", first: 2, after: $after) {
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+                edges {
+                    node {
+                        firstName
+                    }
+                }
+            }
+        }
+    """
+
+    result = schema.execute(query)
+    assert not result.errors
+    page = result.data["allReporters"]
+    assert [edge["node"]["firstName"] for edge in page["edges"]] == ["c", "b"]
+    assert page["pageInfo"]["hasNextPage"]
+
+    result = schema.execute(
+        query, variable_values={"after": page["pageInfo"]["endCursor"]}
+    )
+    assert not result.errors
+    page = result.data["allReporters"]
+    assert [edge["node"]["firstName"] for edge in page["edges"]] == ["a"]
+    assert not page["pageInfo"]["hasNextPage"]
+
+
+def test_should_cache_filter_node_results(django_assert_num_queries):
+    from django.core.cache import cache
+
+    cache.clear()
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            filter_fields = ("last_name",)
+
+    class Query(ObjectType):
+        all_reporters = DjangoFilterConnectionField(ReporterType, cache_timeout=60)
+
+    Reporter.objects.create(first_name="John", last_name="Doe")
+    Reporter.objects.create(first_name="Jane", last_name="Roe")
+
+    schema = Schema(query=Query)
+    query = """
+        query NodeFilteringQuery($lastName: String) {
+            allReporters(lastName: $lastName, first: 1) {
+                totalCount
+                edges {
+                    node {
+                        firstName
+                    }
+                }
+            }
+        }
+    """
+
+    def get_first_names(last_name):
+        result = schema.execute(query, variable_values={"lastName": last_name})
+        assert not result.errors
+        connection = result.data["allReporters"]
+        return connection["totalCount"], [
+            edge["node"]["firstName"] for edge in connection["edges"]
+        ]
+
+    assert get_first_names("Doe") == (1, ["John"])
+    with django_assert_num_queries(0):
+        assert get_first_names("Doe") == (1, ["John"])
+
+    # Other arguments are cached separately
+    assert get_first_names("Roe") == (1, ["Jane"])
+
+    # Saving a reporter invalidates the cached results
+    Reporter.objects.create(first_name="Jack", last_name="Doe")
+    assert get_first_names("Doe") == (2, ["John"])
+
+
+def test_should_invalidate_cached_filter_results_from_other_processes():
+    from django.core.cache import cache
+    from mock import patch
+
+    from graphene_django import model_versions
+    from graphene_django.settings import graphene_settings
+
+    cache.clear()
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            filter_fields = ("last_name",)
+
+    class Query(ObjectType):
+        all_reporters = DjangoFilterConnectionField(ReporterType, cache_timeout=60)
+
+    Reporter.objects.create(first_name="John", last_name="Doe")
+    schema = Schema(query=Query)
+    query = "{ allReporters { totalCount } }"
+    assert schema.execute(query).data == {"allReporters": {"totalCount": 1}}
+
+    # A process which never built the field, with the cache configured
+    with patch.object(model_versions, "_extra_cache_aliases", set()), patch.object(
+        graphene_settings, "MODEL_VERSIONS_CACHE_ALIASES", ("default",)
+    ):
+        Reporter.objects.create(first_name="Jane", last_name="Doe")
+    assert schema.execute(query).data == {"allReporters": {"totalCount": 2}}
+
+
+def test_should_not_cache_the_related_objects_of_filter_results(monkeypatch):
+    from django.core.cache import cache
+
+    from graphene_django.settings import graphene_settings
+
+    monkeypatch.setattr(graphene_settings, "OPTIMIZE_QUERIES", True)
+    cache.clear()
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            filter_fields = ("headline",)
+
+    class Query(ObjectType):
+        all_articles = DjangoFilterConnectionField(ArticleType, cache_timeout=60)
+
+    reporter = Reporter.objects.create(first_name="John", last_name="Doe")
+    Article.objects.create(
+        headline="Hi",
+        pub_date=datetime.now(),
+        pub_date_time=datetime.now(),
+        reporter=reporter,
+        editor=reporter,
+    )
+    schema = Schema(query=Query)
+    query = "{ allArticles { edges { node { reporter { firstName } } } } }"
+
+    def get_first_names():
+        result = schema.execute(query)
+        assert not result.errors
+        return [
+            edge["node"]["reporter"]["firstName"]
+            for edge in result.data["allArticles"]["edges"]
+        ]
+
+    assert get_first_names() == ["John"]
+    # The page of articles is still cached, but not their reporter
+    Reporter.objects.filter(pk=reporter.pk).update(first_name="Jack")
+    assert get_first_names() == ["Jack"]
+
+
+def test_should_check_the_permissions_of_cached_filter_results_once():
+    from django.core.cache import cache
+    from mock import patch
+
+    import graphene_django.fields
+    import graphene_django.filter.fields
+
+    cache.clear()
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            filter_fields = ("last_name",)
+
+    class Query(ObjectType):
+        all_reporters = DjangoFilterConnectionField(ReporterType, cache_timeout=60)
+
+    schema = Schema(query=Query)
+    with patch.object(
+        graphene_django.fields, "check_permission_classes"
+    ) as check, patch.object(
+        graphene_django.filter.fields, "check_permission_classes", check
+    ):
+        for calls in (1, 2):
+            result = schema.execute("{ allReporters { totalCount } }")
+            assert not result.errors
+            assert check.call_count == calls
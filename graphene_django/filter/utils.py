@@ -2,6 +2,11 @@ import six
 
 from .filterset import custom_filterset_factory, setup_filterset
 
+# The arguments converted from the filters of each FilterSet class, shared
+# by all the fields filtered with it. Like the classes of filterset.py, they
+# live as long as the process
+_filtering_args = {}
+
 
 def get_filtering_args_from_filterset(filterset_class, type):
     """ Inspect a FilterSet and produce the arguments to pass to
@@ -10,13 +15,16 @@ def get_filtering_args_from_filterset(filterset_class, type):
     """
     from ..forms.converter import convert_form_field
 
-    args = {}
-    for name, filter_field in six.iteritems(filterset_class.base_filters):
-        field_type = convert_form_field(filter_field.field).Argument()
-        field_type.description = filter_field.label
-        args[name] = field_type
+    args = _filtering_args.get(filterset_class)
+    if args is None:
+        args = {}
+        for name, filter_field in six.iteritems(filterset_class.base_filters):
+            field_type = convert_form_field(filter_field.field).Argument()
+            field_type.description = filter_field.label
+            args[name] = field_type
+        _filtering_args[filterset_class] = args
 
-    return args
+    return dict(args)
 
 
 def get_filterset_class(filterset_class, **meta):
@@ -0,0 +1,120 @@
+"""
+HTTP caching of the responses of GET queries.
+
+With ``http_cache`` enabled, ``GraphQLView`` sets a strong ``ETag`` on the
+responses of GET queries, answers the requests whose ``If-None-Match``
+matches it with a 304, and sets their ``Cache-Control`` max-age from the
+cache hints of the types and fields selected by the query::
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            # Seconds the objects of the type may be cached for
+            cache_max_age = 300
+            # Overrides for some fields
+            field_cache_max_age = {"email": 0}
+
+The max-age of a response is the minimum of the hints of its selection.
+The fields returning a ``DjangoObjectType`` without a ``cache_max_age``,
+and the queries without any hint, use ``HTTP_CACHE_DEFAULT_MAX_AGE`` (0 by
+default, so they aren't cached). The max-ages are cached on the document
+for each operation.
+"""
+from graphql.language import ast
+
+from .cost import get_named_type, get_operation
+from .optimization import get_graphql_field_names
+from .settings import graphene_settings
+
+
+def get_django_object_type(graphql_type):
+    from .types import DjangoObjectType
+
+    graphene_type = getattr(graphql_type, "graphene_type", None)
+    if isinstance(graphene_type, type) and issubclass(graphene_type, DjangoObjectType):
+        return graphene_type
+    return None
+
+
+class CacheHintCollector(object):
+    """Collects the cache hints of the selection of an operation."""
+
+    def __init__(self, schema, document_ast, default_max_age):
+        self.schema = schema
+        self.auto_camelcase = getattr(schema, "auto_camelcase", True)
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document_ast.definitions
+            if isinstance(definition, ast.FragmentDefinition)
+        }
+        self.default_max_age = default_max_age
+        self.hints = []
+
+    def get_field_hint(self, parent_type, field_name):
+        object_type = get_django_object_type(parent_type)
+        if object_type is None or not object_type._meta.field_cache_max_age:
+            return None
+        name = get_graphql_field_names(object_type, self.auto_camelcase).get(
+            field_name
+        )
+        return object_type._meta.field_cache_max_age.get(name)
+
+    def collect_field(self, parent_type, field_ast, fragments):
+        fields = getattr(parent_type, "fields", None) or {}
+        field_def = fields.get(field_ast.name.value)
+        if field_def is None:
+            return
+
+        field_hint = self.get_field_hint(parent_type, field_ast.name.value)
+        if field_hint is not None:
+            self.hints.append(field_hint)
+
+        return_type = get_named_type(field_def.type)
+        object_type = get_django_object_type(return_type)
+        if object_type is not None:
+            max_age = object_type._meta.cache_max_age
+            self.hints.append(self.default_max_age if max_age is None else max_age)
+
+        if field_ast.selection_set:
+            self.collect(return_type, field_ast.selection_set, fragments)
+
+    def collect(self, parent_type, selection_set, fragments=()):
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.Field):
+                self.collect_field(parent_type, selection, fragments)
+                continue
+            selection_fragments = fragments
+            if isinstance(selection, ast.FragmentSpread):
+                name = selection.name.value
+                if name in fragments or name not in self.fragments:
+                    continue
+                selection_fragments = fragments + (name,)
+                selection = self.fragments[name]
+            selection_type = parent_type
+            if selection.type_condition:
+                selection_type = self.schema.get_type(
+                    selection.type_condition.name.value
+                )
+            self.collect(selection_type, selection.selection_set, selection_fragments)
+
+
+def get_cache_max_age(schema, document, operation_name=None):
+    """
+    Return the max-age of the responses of the query ``operation_name`` of
+    ``document``, or None when it isn't a query.
+    """
+    max_ages = getattr(document, "cache_max_ages", None)
+    if max_ages is None:
+        max_ages = document.cache_max_ages = {}
+    if operation_name in max_ages:
+        return max_ages[operation_name]
+
+    operation = get_operation(document.document_ast, operation_name)
+    if operation is None or operation.operation != "query":
+        return None
+    default_max_age = graphene_settings.HTTP_CACHE_DEFAULT_MAX_AGE
+    collector = CacheHintCollector(schema, document.document_ast, default_max_age)
+    collector.collect(schema.get_query_type(), operation.selection_set)
+    max_age = min(collector.hints) if collector.hints else default_max_age
+    max_ages[operation_name] = max_age
+    return max_age
@@ -0,0 +1,124 @@
+"""
+Version tokens of models, used to invalidate cached results.
+
+Each model has a random version token in the caches holding results
+computed from it. The token is replaced whenever an instance of the model
+is saved or deleted (or one of its many to many relations changes), so
+results stored along with the old token are invalidated at once.
+
+Tokens are only created for the models some cache holds results of, and
+only existing tokens are replaced. The signal receivers are connected by the
+processes caching results, and when the app is ready if the caches of
+``MODEL_VERSIONS_CACHE_ALIASES`` (or the response cache, with a
+``RESPONSE_CACHE_TIMEOUT``) are configured, so changes made by any process
+(other web workers, task queues, management commands) replace the tokens.
+Within a transaction the tokens are replaced again once it's committed, so
+results computed from the old rows by other processes before the commit
+don't outlive it.
+"""
+import uuid
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .settings import graphene_settings
+
+VERSION_KEY_PREFIX = "graphene:model-version:"
+
+# Cache aliases used by this process in addition to the configured ones
+_extra_cache_aliases = set()
+
+
+def get_model_label(model):
+    return model._meta.concrete_model._meta.label_lower
+
+
+def get_version_key(label):
+    return VERSION_KEY_PREFIX + label
+
+
+def get_version_cache_aliases():
+    """Return the aliases of the caches holding version tokens."""
+    aliases = set(graphene_settings.MODEL_VERSIONS_CACHE_ALIASES or ())
+    if graphene_settings.RESPONSE_CACHE_TIMEOUT:
+        aliases.add(graphene_settings.RESPONSE_CACHE_ALIAS)
+    return aliases | _extra_cache_aliases
+
+
+def get_model_version(cache, model):
+    """Return the current version token of ``model`` in ``cache``."""
+    key = get_version_key(get_model_label(model))
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def get_label_versions(cache, labels):
+    """
+    Return the current version tokens of the models ``labels``, or None for
+    the models without a version in ``cache``.
+    """
+    versions = cache.get_many([get_version_key(label) for label in labels])
+    return [versions.get(get_version_key(label)) for label in labels]
+
+
+def get_changed_labels(models):
+    """Return the labels of ``models`` and of the models they inherit from."""
+    labels = set()
+    for model in models:
+        labels.add(get_model_label(model))
+        labels.update(get_model_label(parent) for parent in model._meta.parents)
+    return labels
+
+
+def replace_versions(labels):
+    """Replace the existing version tokens of the models ``labels``."""
+    keys = [get_version_key(label) for label in labels]
+    for cache_alias in get_version_cache_aliases():
+        cache = caches[cache_alias]
+        # The models without a token have no cached results
+        existing = cache.get_many(keys)
+        if existing:
+            cache.set_many({key: uuid.uuid4().hex for key in existing}, None)
+
+
+def invalidate_models(models, using=None):
+    """Invalidate the cached results of ``models``."""
+    labels = get_changed_labels(models)
+    replace_versions(labels)
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: replace_versions(labels), using=using)
+
+
+def invalidate_model(model, using=None):
+    invalidate_models([model], using)
+
+
+def model_changed(sender, using=None, **kwargs):
+    invalidate_model(sender, using)
+
+
+def model_relation_changed(sender, instance, action, model, using=None, **kwargs):
+    if action.startswith("post_"):
+        invalidate_models([type(instance), model], using)
+
+
+def connect_signals():
+    post_save.connect(model_changed, dispatch_uid="graphene_model_versions")
+    post_delete.connect(model_changed, dispatch_uid="graphene_model_versions")
+    m2m_changed.connect(model_relation_changed, dispatch_uid="graphene_model_versions")
+
+
+def track_cache_alias(cache_alias):
+    """
+    Also replace the version tokens in ``cache_alias`` on changes made by
+    this process. Caches used by other processes must be listed in
+    ``MODEL_VERSIONS_CACHE_ALIASES``.
+    """
+    if not _extra_cache_aliases:
+        connect_signals()
+    _extra_cache_aliases.add(cache_alias)
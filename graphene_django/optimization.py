@@ -0,0 +1,267 @@
+"""
+Query optimization driven by the selection set of the GraphQL query.
+
+When the ``OPTIMIZE_QUERIES`` setting is enabled, the querysets resolved by
+``DjangoConnectionField`` and ``DjangoListField`` are inspected against the
+fields selected in the query:
+
+* selected ``ForeignKey`` and ``OneToOneField`` fields (and reverse one to
+  one relations) are fetched with ``select_related``,
+* selected reverse ``ForeignKey`` and ``ManyToManyField`` fields resolved
+  by a ``DjangoListField`` or ``DjangoConnectionField`` are fetched with
+  ``prefetch_related``, using ``Prefetch`` querysets optimized the same way.
+
+The columns fetched are restricted with ``only`` to the ones of the selected
+fields. Fields with a custom ``resolve_<name>`` method are left alone, since
+their resolver may not use the relation at all, and all the columns are
+fetched unless the resolver declares the ones it uses with ``depends_on``::
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            # Columns always fetched, e.g. the ones used by Reporter.__init__
+            required_fields = ("reporter_type",)
+
+        full_name = graphene.String()
+
+        @depends_on("first_name", "last_name")
+        def resolve_full_name(self, info):
+            return "{} {}".format(self.first_name, self.last_name)
+"""
+from django.db.models import Prefetch
+from graphene.types.dynamic import Dynamic
+from graphene.utils.str_converters import to_camel_case
+
+from .utils import get_field_selections, get_model_fields
+
+# Set on the query of the querysets prefetched by the optimizer. Clones keep
+# it, e.g. the querysets of the related managers holding the prefetched rows
+PREFETCHED_QUERY_ATTR = "graphene_prefetched"
+
+_graphql_field_names = {}
+_model_fields = {}
+
+
+def depends_on(*fields):
+    """
+    Declare the model fields a custom resolver reads, so they are fetched
+    when the columns of the queryset are restricted to the selected ones.
+    """
+
+    def decorator(resolver):
+        resolver.dependencies = fields
+        return resolver
+
+    return decorator
+
+
+def get_graphql_field_names(node_type, auto_camelcase=True):
+    """Map the GraphQL names of the fields of ``node_type`` to their names."""
+    key = (node_type, auto_camelcase)
+    if key not in _graphql_field_names:
+        names = {}
+        for name, field in node_type._meta.fields.items():
+            graphql_name = getattr(field, "name", None)
+            if not graphql_name:
+                graphql_name = to_camel_case(name) if auto_camelcase else name
+            names[graphql_name] = name
+        _graphql_field_names[key] = names
+    return _graphql_field_names[key]
+
+
+def get_model_field(model, name):
+    if model not in _model_fields:
+        _model_fields[model] = dict(get_model_fields(model))
+    return _model_fields[model].get(name)
+
+
+def get_field_names(model, fields):
+    """Return the names of ``fields`` and the primary key, resolving "pk"."""
+    pk_name = model._meta.pk.name
+    return [pk_name] + [pk_name if name == "pk" else name for name in fields or ()]
+
+
+def get_graphene_field(node_type, name):
+    field = node_type._meta.fields.get(name)
+    if isinstance(field, Dynamic):
+        field = field.get_type()
+    return field
+
+
+def get_connection_node_selections(info, field_asts):
+    """Return the fields selected on the nodes of a connection."""
+    edges = [
+        field
+        for field in get_field_selections(info, field_asts)
+        if field.name.value == "edges"
+    ]
+    nodes = [
+        field
+        for field in get_field_selections(info, edges)
+        if field.name.value == "node"
+    ]
+    return get_field_selections(info, nodes)
+
+
+def get_prefetch_queryset(info, field, selection, model_field):
+    """
+    Return the node type and the queryset used to prefetch the relation
+    ``model_field`` resolved by ``field``, or None when it can't be
+    prefetched.
+    """
+    from .fields import DjangoConnectionField, DjangoListField
+    from .utils import DJANGO_FILTER_INSTALLED
+
+    if isinstance(field, DjangoListField):
+        node_type = field.type.of_type
+        queryset = node_type._meta.model._default_manager.get_queryset()
+        selections = get_field_selections(info, [selection])
+    elif isinstance(field, DjangoConnectionField):
+        if DJANGO_FILTER_INSTALLED:
+            from .filter.fields import DjangoFilterConnectionField
+
+            # Filtered connections are filtered in the database, so their
+            # rows can't be prefetched without the filter arguments
+            if isinstance(field, DjangoFilterConnectionField):
+                return None, None
+        # Prefetched rows are paginated in memory with offset cursors, so
+        # only the connections returning all their rows are prefetched
+        if field.pagination == "keyset" or any(
+            argument.name.value in ("first", "last")
+            for argument in selection.arguments or ()
+        ):
+            return None, None
+        node_type = field.node_type
+        queryset = field.get_manager().get_queryset()
+        selections = get_connection_node_selections(info, [selection])
+    else:
+        return None, None
+
+    # Reverse foreign keys are matched to their parent through the remote key
+    required_fields = ()
+    if model_field.one_to_many:
+        required_fields = (model_field.field.name,)
+    queryset = optimize_queryset(
+        queryset, info, node_type, selections, required_fields
+    )
+    setattr(queryset.query, PREFETCHED_QUERY_ATTR, True)
+    return node_type, queryset
+
+
+def is_prefetched(queryset):
+    """Whether ``queryset`` holds rows prefetched by the optimizer."""
+    return queryset._result_cache is not None and getattr(
+        queryset.query, PREFETCHED_QUERY_ATTR, False
+    )
+
+
+def get_related_lookups(info, node_type, selections, prefix=""):
+    """
+    Return the ``select_related`` and ``prefetch_related`` lookups and the
+    columns needed to resolve ``selections`` on ``node_type`` without extra
+    queries. The columns are None when they can't be told, e.g. when a field
+    has a custom resolver that doesn't declare them with ``depends_on``.
+    """
+    select_related = []
+    prefetch_related = []
+    model = node_type._meta.model
+    only = get_field_names(model, getattr(node_type._meta, "required_fields", ()))
+    names = get_graphql_field_names(
+        node_type, getattr(info.schema, "auto_camelcase", True)
+    )
+
+    for selection in selections:
+        name = names.get(selection.name.value)
+        if name is None:
+            continue
+        resolver = getattr(node_type, "resolve_{}".format(name), None)
+        if resolver is not None:
+            dependencies = getattr(resolver, "dependencies", None)
+            if dependencies is None or only is None:
+                only = None
+            else:
+                only.extend(get_field_names(model, dependencies))
+            continue
+        model_field = get_model_field(model, name)
+        if model_field is None:
+            only = None
+            continue
+        if not model_field.is_relation:
+            if only is not None:
+                only.append(name)
+            continue
+
+        lookup = prefix + name
+        if model_field.many_to_one or model_field.one_to_one:
+            related_type = node_type._meta.registry.get_type_for_model(
+                model_field.related_model
+            )
+            if related_type is None:
+                continue
+            select_related.append(lookup)
+            related_select, related_prefetch, related_only = get_related_lookups(
+                info,
+                related_type,
+                get_field_selections(info, [selection]),
+                prefix=lookup + "__",
+            )
+            select_related.extend(related_select)
+            prefetch_related.extend(related_prefetch)
+            if only is not None:
+                only.append(name)
+                only.extend(
+                    "{}__{}".format(name, related_name)
+                    for related_name in related_only or ()
+                )
+        else:
+            field = get_graphene_field(node_type, name)
+            related_type, queryset = get_prefetch_queryset(
+                info, field, selection, model_field
+            )
+            if related_type is not None:
+                prefetch_related.append(Prefetch(lookup, queryset=queryset))
+
+    return select_related, prefetch_related, only
+
+
+def optimize_queryset(queryset, info, node_type, selections, required_fields=()):
+    """
+    Apply the ``select_related`` and ``prefetch_related`` lookups needed to
+    resolve ``selections`` on ``node_type`` to ``queryset``, and restrict
+    the columns it fetches to the ones needed with ``only``.
+    """
+    select_related, prefetch_related, only = get_related_lookups(
+        info, node_type, selections
+    )
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    if only is not None:
+        # The querysets of related managers set the parent object of their
+        # rows, reading its key on each of them
+        related_keys = [
+            field.attname for field in getattr(queryset, "_known_related_objects", ())
+        ]
+        queryset = queryset.only(*(only + list(required_fields) + related_keys))
+    return queryset
+
+
+def optimize_connection_queryset(queryset, info, node_type, required_fields=()):
+    """
+    Optimize the queryset resolved for a connection field. The
+    ``required_fields`` are always fetched, e.g. the columns of keyset
+    cursors.
+    """
+    if getattr(info, "field_asts", None) is None:
+        return queryset
+    selections = get_connection_node_selections(info, info.field_asts)
+    return optimize_queryset(queryset, info, node_type, selections, required_fields)
+
+
+def optimize_list_queryset(queryset, info, node_type):
+    """Optimize the queryset resolved for a list field."""
+    if getattr(info, "field_asts", None) is None:
+        return queryset
+    selections = get_field_selections(info, info.field_asts)
+    return optimize_queryset(queryset, info, node_type, selections)
@@ -0,0 +1,177 @@
+"""
+Keyset (cursor based) pagination for Django querysets.
+
+Instead of an offset, keyset cursors hold the values of the ordering
+columns of an edge, and pages are fetched with ``WHERE (col, pk) > (...)``
+conditions, so the cost of a page doesn't grow with its depth. The primary
+key is always added to the ordering to make it total. Ordering columns
+must be concrete, non nullable fields of the model.
+"""
+import datetime
+import json
+
+import six
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from graphql_relay.utils import base64, unbase64
+
+KEYSET_PREFIX = "keyset:"
+
+
+class KeysetJSONEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder truncates times to milliseconds, which would make
+    cursors skip rows, so times are encoded in full here.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super(KeysetJSONEncoder, self).default(o)
+
+
+def get_ordering_field(opts, name):
+    try:
+        field = opts.pk if name == "pk" else opts.get_field(name)
+    except FieldDoesNotExist:
+        field = None
+    assert field is not None and field.concrete and not field.null, (
+        'Keyset pagination can\'t order by "{}", ordering fields must be '
+        "concrete and not nullable fields of {}."
+    ).format(name, opts.object_name)
+    return field
+
+
+def get_keyset_ordering(queryset):
+    """
+    Return the ordering of ``queryset`` as a list of ``(attname, descending)``
+    pairs, ending with the primary key as tie-breaker.
+    """
+    opts = queryset.model._meta
+    if queryset.query.order_by:
+        order_by = list(queryset.query.order_by)
+    elif queryset.query.default_ordering and opts.ordering:
+        order_by = list(opts.ordering)
+    else:
+        order_by = []
+
+    ordering = []
+    for order in order_by:
+        assert isinstance(order, six.string_types), (
+            "Keyset pagination only supports ordering by field names, received {}."
+        ).format(repr(order))
+        field = get_ordering_field(opts, order.lstrip("-"))
+        ordering.append((field.attname, order.startswith("-")))
+
+    if not any(attname == opts.pk.attname for attname, _ in ordering):
+        ordering.append((opts.pk.attname, False))
+    return ordering
+
+
+def get_keyset_values(node, ordering):
+    return [getattr(node, attname) for attname, _ in ordering]
+
+
+def keyset_to_cursor(values):
+    """Creates the cursor string from the values of the ordering fields."""
+    return base64(KEYSET_PREFIX + json.dumps(values, cls=KeysetJSONEncoder))
+
+
+def cursor_to_keyset(cursor, ordering):
+    """
+    Rederives the values of the ordering fields from the cursor string,
+    returning None for invalid cursors.
+    """
+    if not cursor:
+        return None
+    try:
+        cursor = unbase64(cursor)
+        if not cursor.startswith(KEYSET_PREFIX):
+            return None
+        values = json.loads(cursor[len(KEYSET_PREFIX):])
+    except Exception:
+        return None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    return values
+
+
+def get_keyset_filter(ordering, values, before=False):
+    """
+    Return the condition matching the rows after (or before) the row with
+    the given ordering values.
+    """
+    condition = Q()
+    equal = Q()
+    for (attname, descending), value in zip(ordering, values):
+        lookup = "lt" if descending != before else "gt"
+        condition |= equal & Q(**{"{}__{}".format(attname, lookup): value})
+        equal &= Q(**{attname: value})
+    return condition
+
+
+def reverse_ordering(ordering):
+    return [(attname, not descending) for attname, descending in ordering]
+
+
+def order_by_keyset(queryset, ordering):
+    return queryset.order_by(
+        *[("-" if descending else "") + attname for attname, descending in ordering]
+    )
+
+
+def connection_from_keyset_queryset(
+    queryset, args, connection_type, edge_type, pageinfo_type
+):
+    """
+    Given a queryset and connection arguments, returns a connection object
+    for use in GraphQL, paginated with keyset cursors.
+    """
+    assert queryset.query.low_mark == 0 and queryset.query.high_mark is None, (
+        "Keyset pagination can't be used with sliced querysets."
+    )
+    ordering = get_keyset_ordering(queryset)
+    first = args.get("first")
+    last = args.get("last")
+
+    after = cursor_to_keyset(args.get("after"), ordering)
+    if after is not None:
+        queryset = queryset.filter(get_keyset_filter(ordering, after))
+    before = cursor_to_keyset(args.get("before"), ordering)
+    if before is not None:
+        queryset = queryset.filter(get_keyset_filter(ordering, before, before=True))
+
+    has_next_page = False
+    has_previous_page = False
+    if isinstance(first, int):
+        nodes = list(order_by_keyset(queryset, ordering)[: first + 1])
+        has_next_page = len(nodes) > first
+        nodes = nodes[:first]
+        if isinstance(last, int):
+            has_previous_page = len(nodes) > last
+            nodes = nodes[max(len(nodes) - last, 0):]
+    elif isinstance(last, int):
+        reversed_queryset = order_by_keyset(queryset, reverse_ordering(ordering))
+        nodes = list(reversed_queryset[: last + 1])
+        has_previous_page = len(nodes) > last
+        nodes = nodes[:last][::-1]
+    else:
+        nodes = list(order_by_keyset(queryset, ordering))
+
+    edges = [
+        edge_type(
+            node=node, cursor=keyset_to_cursor(get_keyset_values(node, ordering))
+        )
+        for node in nodes
+    ]
+
+    return connection_type(
+        edges=edges,
+        page_info=pageinfo_type(
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+            has_previous_page=has_previous_page,
+            has_next_page=has_next_page,
+        ),
+    )
@@ -0,0 +1,181 @@
+"""
+Support for Automatic Persisted Queries (APQ).
+
+Clients send the sha256 hash of a query in
+``extensions.persistedQuery.sha256Hash`` instead of (or along with) the
+query text. When only the hash is sent and the query is unknown, a
+``PersistedQueryNotFound`` error is returned so the client can retry with
+the full query, which is then stored under its hash.
+"""
+import inspect
+import threading
+from collections import OrderedDict
+
+from graphql.error import GraphQLError
+
+from .cache import get_document_cache, get_query_hash
+from .settings import graphene_settings
+
+
+class PersistedQueryError(GraphQLError):
+    code = None
+
+    def __init__(self, message):
+        super(PersistedQueryError, self).__init__(
+            message, extensions={"code": self.code}
+        )
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_FOUND"
+
+    def __init__(self):
+        super(PersistedQueryNotFound, self).__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryNotSupported(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_SUPPORTED"
+
+    def __init__(self):
+        super(PersistedQueryNotSupported, self).__init__(
+            "PersistedQueryNotSupported"
+        )
+
+
+class PersistedQueryHashMismatch(PersistedQueryError):
+    code = "BAD_USER_INPUT"
+
+    def __init__(self):
+        super(PersistedQueryHashMismatch, self).__init__(
+            "provided sha does not match query"
+        )
+
+
+class BasePersistedQueryStore(object):
+    """
+    Stores query strings by their sha256 hash. Subclasses must implement
+    ``get`` and ``set``.
+    """
+
+    def get(self, query_hash):
+        raise NotImplementedError(
+            "get method not implemented in {}.".format(self.__class__)
+        )
+
+    def set(self, query_hash, query):
+        raise NotImplementedError(
+            "set method not implemented in {}.".format(self.__class__)
+        )
+
+
+class InMemoryPersistedQueryStore(BasePersistedQueryStore):
+    """
+    Keeps persisted queries in a process local dict, dropping the oldest
+    ones once ``max_size`` queries are stored.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._queries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, query_hash):
+        return self._queries.get(query_hash)
+
+    def set(self, query_hash, query):
+        with self._lock:
+            self._queries[query_hash] = query
+            while self.max_size and len(self._queries) > self.max_size:
+                self._queries.popitem(last=False)
+
+
+class DjangoCachePersistedQueryStore(BasePersistedQueryStore):
+    """
+    Keeps persisted queries in one of the Django cache backends, so they are
+    shared between processes.
+    """
+
+    def __init__(
+        self, cache_alias="default", timeout=None, key_prefix="graphene:apq:"
+    ):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+
+        return caches[self.cache_alias]
+
+    def get_key(self, query_hash):
+        return self.key_prefix + query_hash
+
+    def get(self, query_hash):
+        return self.cache.get(self.get_key(query_hash))
+
+    def set(self, query_hash, query):
+        self.cache.set(self.get_key(query_hash), query, self.timeout)
+
+
+def instantiate_persisted_query_store(store):
+    if inspect.isclass(store):
+        return store()
+    return store
+
+
+persisted_query_store = None
+
+
+def get_persisted_query_store():
+    """Return the store configured in the PERSISTED_QUERY_STORE setting."""
+    global persisted_query_store
+    if persisted_query_store is None and graphene_settings.PERSISTED_QUERY_STORE:
+        persisted_query_store = instantiate_persisted_query_store(
+            graphene_settings.PERSISTED_QUERY_STORE
+        )
+    return persisted_query_store
+
+
+def reset_persisted_query_store():
+    global persisted_query_store
+    persisted_query_store = None
+
+
+def get_persisted_query_hash(extensions):
+    """
+    Return the sha256 hash sent in the ``persistedQuery`` extension, if any.
+    """
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return None
+    return persisted_query.get("sha256Hash") or None
+
+
+def get_persisted_document(store, backend, schema, query, query_hash):
+    """
+    Return the document for a persisted query.
+
+    A document already cached under ``query_hash`` is returned without
+    looking at the store or parsing anything. When ``query`` is given, it is
+    checked against the hash and saved in the store for later requests.
+    """
+    if store is None:
+        raise PersistedQueryNotSupported()
+
+    if query and get_query_hash(query) != query_hash:
+        raise PersistedQueryHashMismatch()
+
+    document_cache = get_document_cache()
+    document = document_cache.get(backend, schema, query_hash)
+    if document is None:
+        if query:
+            store.set(query_hash, query)
+        else:
+            query = store.get(query_hash)
+            if query is None:
+                raise PersistedQueryNotFound()
+        document = document_cache.add(backend, schema, query, query_hash)
+    return document
@@ -0,0 +1,205 @@
+"""
+Server-side cache of full responses.
+
+With a ``response_cache_timeout``, the views keep the responses of queries
+in a Django cache, keyed by the schema and class of the view, the hash of
+the normalized query (or its persisted query hash), the variables, the
+operation name and a "vary" value of the request. Cache hits are returned
+without parsing nor executing the query. Views of the same class and schema
+with different permissions should override ``get_response_cache_namespace``.
+
+The vary value separates the responses of different users and languages.
+It's returned by the ``RESPONSE_CACHE_VARY`` callable, which receives the
+request (``get_default_vary`` by default: the user's primary key and the
+language of the request).
+
+Responses are stored along with the version tokens of the models of the
+types they select (see ``graphene_django.model_versions``), read before the
+query is executed. Saving or deleting an instance of one of these models
+invalidates them, in any process when ``RESPONSE_CACHE_TIMEOUT`` is set (or
+the cache is listed in ``MODEL_VERSIONS_CACHE_ALIASES``). Only responses
+without errors are cached.
+"""
+import hashlib
+import json
+import re
+
+from django.core.cache import caches
+from graphql.type.definition import GraphQLInterfaceType, GraphQLUnionType
+from graphql.utils.schema_printer import print_schema
+
+from .cost import get_named_type, get_operation
+from .http_cache import CacheHintCollector, get_django_object_type
+from .model_versions import (
+    get_label_versions,
+    get_model_label,
+    get_model_version,
+    track_cache_alias,
+)
+from .settings import graphene_settings
+
+RESPONSE_KEY_PREFIX = "graphene:response:"
+
+# Strings are kept as they are, while whitespace, commas and comments out of
+# them are insignificant
+TOKENS_RE = re.compile(
+    r'("""(?:\\"""|[^"]|"(?!""))*"""|"(?:\\.|[^"\\\n])*")|(?:[\s,]|#[^\n\r]*)+'
+)
+
+
+def normalize_query(query):
+    """Collapse the insignificant characters of ``query``."""
+
+    def replace(match):
+        return match.group(1) or " "
+
+    return TOKENS_RE.sub(replace, query).strip()
+
+
+def get_default_vary(request):
+    user = getattr(request, "user", None)
+    user_pk = user.pk if user is not None and user.is_authenticated else None
+    return user_pk, getattr(request, "LANGUAGE_CODE", None)
+
+
+def get_vary(request):
+    vary = graphene_settings.RESPONSE_CACHE_VARY or get_default_vary
+    return vary(request)
+
+
+def get_schema_hash(schema):
+    """Return the hash of the definition of ``schema``, cached on it."""
+    schema_hash = getattr(schema, "response_cache_hash", None)
+    if schema_hash is None:
+        schema_hash = hashlib.sha256(print_schema(schema).encode("utf-8"))
+        schema_hash = schema.response_cache_hash = schema_hash.hexdigest()
+    return schema_hash
+
+
+def get_view_namespace(view, schema):
+    """
+    Return the namespace of the responses of ``view``: the hash of its
+    schema and its class, so views sharing a cache don't share responses.
+    """
+    view_class = type(view)
+    return get_schema_hash(schema), view_class.__module__, view_class.__name__
+
+
+def get_response_key(
+    namespace, query, persisted_query_hash, variables, operation_name, vary
+):
+    """Return the cache key of a response, or None when it can't be cached."""
+    if query:
+        query_hash = hashlib.sha256(normalize_query(query).encode("utf-8"))
+        query_hash = query_hash.hexdigest()
+    elif persisted_query_hash:
+        query_hash = persisted_query_hash
+    else:
+        return None
+    key = repr(
+        (
+            namespace,
+            query_hash,
+            json.dumps(variables or {}, sort_keys=True, default=repr),
+            operation_name,
+            vary,
+        )
+    )
+    return RESPONSE_KEY_PREFIX + hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class ModelCollector(CacheHintCollector):
+    """Collects the models of the types selected by an operation."""
+
+    def __init__(self, schema, document_ast):
+        super(ModelCollector, self).__init__(schema, document_ast, None)
+        self.models = set()
+
+    def collect_type(self, graphql_type):
+        if isinstance(graphql_type, (GraphQLInterfaceType, GraphQLUnionType)):
+            for possible_type in self.schema.get_possible_types(graphql_type):
+                self.collect_type(possible_type)
+            return
+        object_type = get_django_object_type(graphql_type)
+        if object_type is not None:
+            self.models.add(object_type._meta.model)
+
+    def collect_field(self, parent_type, field_ast, fragments):
+        fields = getattr(parent_type, "fields", None) or {}
+        field_def = fields.get(field_ast.name.value)
+        if field_def is None:
+            return
+        return_type = get_named_type(field_def.type)
+        self.collect_type(return_type)
+        if field_ast.selection_set:
+            self.collect(return_type, field_ast.selection_set, fragments)
+
+
+def get_response_models(schema, document, operation_name=None):
+    """
+    Return the models of the types selected by the query ``operation_name``
+    of ``document``, or None when it isn't a query. They're cached on the
+    document.
+    """
+    response_models = getattr(document, "response_models", None)
+    if response_models is None:
+        response_models = document.response_models = {}
+    if operation_name in response_models:
+        return response_models[operation_name]
+
+    operation = get_operation(document.document_ast, operation_name)
+    if (
+        operation is None
+        or operation.operation != "query"
+        or getattr(document, "validation_errors", None)
+    ):
+        return None
+    collector = ModelCollector(schema, document.document_ast)
+    collector.collect(schema.get_query_type(), operation.selection_set)
+    models = response_models[operation_name] = sorted(
+        collector.models, key=get_model_label
+    )
+    return models
+
+
+class ResponseCache(object):
+    def __init__(self, timeout, cache_alias="default"):
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        track_cache_alias(cache_alias)
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get(self, key):
+        """Return the cached response of ``key`` if it's still valid, or None."""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        labels, versions, response = entry
+        if get_label_versions(self.cache, labels) != versions:
+            return None
+        return response
+
+    def get_versions(self, models):
+        """
+        Return the version tokens of ``models``, to be read before the
+        response is computed.
+        """
+        return (
+            [get_model_label(model) for model in models],
+            [get_model_version(self.cache, model) for model in models],
+        )
+
+    def set(self, key, versions, response):
+        labels, versions = versions
+        self.cache.set(key, (labels, versions, response), self.timeout)
+
+
+def get_response_cache(timeout, cache_alias=None):
+    if not timeout:
+        return None
+    return ResponseCache(
+        timeout, cache_alias or graphene_settings.RESPONSE_CACHE_ALIAS
+    )
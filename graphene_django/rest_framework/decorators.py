@@ -1,6 +1,6 @@
 from functools import wraps
 
-from rest_framework import exceptions
+from .permissions import check_permissions
 
 
 def context(f):
@@ -19,13 +19,9 @@ def resolver_permission_classes(permission_classes):
         @wraps(f)
         @context(f)
         def wrapper(context, *args, **kwargs):
-            for permission in [p() for p in permission_classes]:
-                if not permission.has_permission(
-                    context.get("request"), context.get("view")
-                ):
-                    raise exceptions.PermissionDenied(
-                        detail=getattr(permission, "message", None)
-                    )
+            check_permissions(
+                permission_classes, context.get("request"), context.get("view")
+            )
 
             return f(*args, **kwargs)
 
@@ -8,6 +8,9 @@ from rest_framework.exceptions import ParseError
 from rest_framework.parsers import BaseParser, JSONParser
 from rest_framework.settings import api_settings
 
+from ..codec import json_loads
+from ..settings import graphene_settings
+
 
 class GraphQLJSONParser(JSONParser):
     """
@@ -22,9 +25,15 @@ class GraphQLJSONParser(JSONParser):
         """
         Parses the incoming bytestream as JSON and returns the resulting data.
         """
-        request_json = super(GraphQLJSONParser, self).parse(
-            stream, media_type, parser_context
-        )
+        if graphene_settings.JSON_DECODER is not None:
+            try:
+                request_json = json_loads(stream.read())
+            except ValueError as exc:
+                raise ParseError("JSON parse error - %s" % six.text_type(exc))
+        else:
+            request_json = super(GraphQLJSONParser, self).parse(
+                stream, media_type, parser_context
+            )
         parser_context = parser_context or {}
         view = parser_context.get("view", None)
         graphene_batch = (
@@ -0,0 +1,112 @@
+"""
+Checks of the DRF permission classes of resolvers.
+
+Permission instances are created once per request, and the result of
+``has_permission`` is memoized on the request for each permission class and
+view, so a field resolved for every row of a list checks its permissions
+once per request. The memoized decisions are dropped when ``request.user``
+changes (a login or logout mutation) or with ``clear_permission_cache``.
+Permissions whose result doesn't depend on the request can be declared with
+``request_invariant`` to be checked once per process.
+"""
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import AllowAny
+
+PERMISSION_CACHE_ATTR = "_graphene_permission_cache"
+
+_request_invariant = set([AllowAny])
+_request_invariant_results = {}
+
+
+def request_invariant(permission_class):
+    """
+    Class decorator declaring that the result of ``has_permission`` of a
+    permission class is the same for every request and view.
+    """
+    _request_invariant.add(permission_class)
+    return permission_class
+
+
+def is_request_invariant(permission_class):
+    return permission_class in _request_invariant
+
+
+class PermissionCache(object):
+    """The permission instances and decisions of a request's user."""
+
+    def __init__(self, user):
+        self.user = user
+        self.permissions = {}
+        self.results = {}
+
+
+def get_request_user(request):
+    try:
+        return getattr(request, "user", None)
+    except Exception:
+        # Authentication errors are raised by the view, not the resolvers
+        return None
+
+
+def get_permission_cache(request):
+    """
+    Return the permission cache of ``request``, or None when it can't be
+    stored on it.
+    """
+    if request is None:
+        return None
+    user = get_request_user(request)
+    cache = getattr(request, PERMISSION_CACHE_ATTR, None)
+    if cache is None or cache.user is not user:
+        cache = PermissionCache(user)
+        try:
+            setattr(request, PERMISSION_CACHE_ATTR, cache)
+        except AttributeError:
+            return None
+    return cache
+
+
+def clear_permission_cache(request):
+    """Drop the permission decisions memoized on ``request``."""
+    if getattr(request, PERMISSION_CACHE_ATTR, None) is not None:
+        setattr(request, PERMISSION_CACHE_ATTR, None)
+
+
+def get_permission(permission_class, request=None):
+    """
+    Return the instance of ``permission_class`` of ``request``, or a new one
+    when there's no request to store it on.
+    """
+    cache = get_permission_cache(request)
+    if cache is None:
+        return permission_class()
+    permission = cache.permissions.get(permission_class)
+    if permission is None:
+        permission = cache.permissions[permission_class] = permission_class()
+    return permission
+
+
+def get_permissions(permission_classes, request=None):
+    return [get_permission(p, request) for p in permission_classes or ()]
+
+
+def has_permission(permission, request, view):
+    permission_class = type(permission)
+    if is_request_invariant(permission_class):
+        results, key = _request_invariant_results, permission_class
+    else:
+        cache = get_permission_cache(request)
+        if cache is None:
+            return permission.has_permission(request, view)
+        results, key = cache.results, (permission_class, view)
+
+    if key not in results:
+        results[key] = bool(permission.has_permission(request, view))
+    return results[key]
+
+
+def check_permissions(permission_classes, request, view):
+    """Raise PermissionDenied unless every permission class grants access."""
+    for permission in get_permissions(permission_classes, request):
+        if not has_permission(permission, request, view):
+            raise PermissionDenied(detail=getattr(permission, "message", None))
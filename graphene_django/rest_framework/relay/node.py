@@ -1,11 +1,10 @@
-import warnings
-
 from functools import partial
 
+from graphene.types import ID, Field, List, NonNull
 from graphene.types.utils import get_type
 from graphene.relay import node as graphene_node
 
-from rest_framework.exceptions import PermissionDenied
+from ...fields import check_permission_classes
 
 
 class DjangoNodeField(graphene_node.NodeField):
@@ -22,30 +21,74 @@ class DjangoNodeField(graphene_node.NodeField):
         )
 
 
+class DjangoNodesField(Field):
+    """Resolves a list of nodes from their global IDs."""
+
+    def __init__(self, node, type=False, **kwargs):
+        assert issubclass(
+            node, DjangoNode
+        ), "DjangoNodesField can only operate in DjangoNodes"
+        self.node_type = node
+        self.field_type = type
+        self.permission_classes = kwargs.pop("permission_classes", None)
+
+        super(DjangoNodesField, self).__init__(
+            NonNull(List(type or node)),
+            ids=List(NonNull(ID), required=True, description="The IDs of the objects"),
+            **kwargs
+        )
+
+    def get_resolver(self, parent_resolver):
+        return partial(
+            self.node_type.nodes_resolver,
+            get_type(self.field_type),
+            self.permission_classes,
+        )
+
+
 class DjangoNode(graphene_node.Node):
     @classmethod
     def Field(cls, *args, **kwargs):  # noqa: N802
         return DjangoNodeField(cls, *args, **kwargs)
 
+    @classmethod
+    def NodesField(cls, *args, **kwargs):  # noqa: N802
+        return DjangoNodesField(cls, *args, **kwargs)
+
+    @classmethod
+    def get_node_promise_from_global_id(cls, info, global_id, only_type=None):
+        """
+        Like ``get_node_from_global_id``, but return a promise of the node
+        from the ``get_node_promise`` of its type when it has one.
+        """
+        try:
+            _type, _id = cls.from_global_id(global_id)
+            graphene_type = info.schema.get_type(_type).graphene_type
+        except Exception:
+            return None
+
+        get_node_promise = getattr(graphene_type, "get_node_promise", None)
+        if get_node_promise is None or cls not in graphene_type._meta.interfaces:
+            return cls.get_node_from_global_id(info, global_id, only_type=only_type)
+
+        if only_type:
+            assert graphene_type == only_type, ("Must receive a {} id.").format(
+                only_type._meta.name
+            )
+        return get_node_promise(info, _id)
+
     @classmethod
     def node_resolver(cls, only_type, permission_classes, root, info, id):
-        if not permission_classes:
-            if hasattr(info, "context") and info.context and info.context.get("view", None):
-                permission_classes = info.context.get(
-                    "view"
-                ).resolver_permission_classes
-            else:
-                warnings.warn(
-                    UserWarning(
-                        "DjangoNodeField should not be called without context."
-                    )
-                )
-
-        if permission_classes:
-            for permission in [p() for p in permission_classes]:
-                if not permission.has_permission(
-                    info.context.get("request"), info.context.get("view")
-                ):
-                    raise PermissionDenied(detail=getattr(permission, "message", None))
-
-        return super(DjangoNode, cls).node_resolver(only_type, root, info, id)
+        check_permission_classes(info, DjangoNodeField, permission_classes)
+
+        return cls.get_node_promise_from_global_id(info, id, only_type=only_type)
+
+    @classmethod
+    def nodes_resolver(cls, only_type, permission_classes, root, info, ids):
+        check_permission_classes(info, DjangoNodesField, permission_classes)
+
+        # The nodes of each type are loaded together by get_node_promise
+        return [
+            cls.get_node_promise_from_global_id(info, id, only_type=only_type)
+            for id in ids
+        ]
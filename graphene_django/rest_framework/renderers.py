@@ -0,0 +1,25 @@
+from django.utils.encoding import force_bytes
+
+from rest_framework.renderers import JSONRenderer
+
+from ..codec import json_dumps
+from ..settings import graphene_settings
+
+
+class GraphQLJSONRenderer(JSONRenderer):
+    """
+    Renderer which serializes to JSON with the ``JSON_ENCODER`` setting,
+    when one is configured and the output isn't indented.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            graphene_settings.JSON_ENCODER is None
+            or data is None
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super(GraphQLJSONRenderer, self).render(
+                data, accepted_media_type, renderer_context
+            )
+
+        return force_bytes(json_dumps(data))
@@ -0,0 +1,100 @@
+import pytest
+
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import BasePermission
+
+from ..permissions import (
+    check_permissions,
+    clear_permission_cache,
+    get_permission,
+    get_permissions,
+    request_invariant,
+)
+
+
+class request(object):
+    pass
+
+
+class view(object):
+    pass
+
+
+def counting_permission(allowed=True):
+    class CountingPermission(BasePermission):
+        message = "Not allowed."
+        calls = 0
+
+        def has_permission(self, request, view):
+            CountingPermission.calls += 1
+            return allowed
+
+    return CountingPermission
+
+
+def test_permissions_are_instantiated_once_per_request():
+    permission_class = counting_permission()
+    _request = request()
+
+    permissions = get_permissions([permission_class], _request)
+    assert get_permissions([permission_class], _request) == permissions
+    assert get_permission(permission_class, _request) is permissions[0]
+    assert get_permission(permission_class, request()) is not permissions[0]
+    assert get_permission(permission_class) is not permissions[0]
+
+
+def test_permission_decisions_are_memoized_per_request_and_view():
+    permission_class = counting_permission()
+    first_request, first_view = request(), view()
+
+    for _ in range(10):
+        check_permissions([permission_class], first_request, first_view)
+    assert permission_class.calls == 1
+
+    check_permissions([permission_class], first_request, view())
+    check_permissions([permission_class], request(), first_view)
+    assert permission_class.calls == 3
+
+
+def test_denied_permissions_are_memoized():
+    permission_class = counting_permission(allowed=False)
+    _request, _view = request(), view()
+
+    for _ in range(2):
+        with pytest.raises(PermissionDenied) as exc_info:
+            check_permissions([permission_class], _request, _view)
+        assert exc_info.value.detail == "Not allowed."
+    assert permission_class.calls == 1
+
+
+def test_request_invariant_permissions_are_checked_once():
+    permission_class = request_invariant(counting_permission())
+
+    for _ in range(3):
+        check_permissions([permission_class], request(), view())
+    assert permission_class.calls == 1
+
+
+def test_permissions_are_checked_without_request():
+    permission_class = counting_permission()
+
+    check_permissions([permission_class], None, None)
+    check_permissions([permission_class], None, None)
+    assert permission_class.calls == 2
+
+
+def test_permission_decisions_are_dropped_when_the_user_changes():
+    permission_class = counting_permission()
+    _request, _view = request(), view()
+    _request.user = object()
+
+    check_permissions([permission_class], _request, _view)
+    check_permissions([permission_class], _request, _view)
+    assert permission_class.calls == 1
+    # A login or logout replaces the user of the request
+    _request.user = object()
+    check_permissions([permission_class], _request, _view)
+    assert permission_class.calls == 2
+    clear_permission_cache(_request)
+    check_permissions([permission_class], _request, _view)
+    assert permission_class.calls == 3
@@ -88,6 +88,11 @@ class RootQuery(ObjectType):
         Article, permission_classes=[IsAuthenticated]
     )
 
+    nodes_by_id = relay.DjangoNode.NodesField(Article)
+    permission_nodes_by_id = relay.DjangoNode.NodesField(
+        Article, permission_classes=[IsAuthenticated]
+    )
+
 
 schema = Schema(query=RootQuery)
 
@@ -475,3 +480,60 @@ def test_fields_should_override_permissions_from_view():
         result.errors[0].message == "You do not have permission to perform this action."
     )
     assert result.data == {"permissionNodes": None}
+
+
+@pytest.mark.django_db
+def test_relay_nodes_should_be_loaded_together(django_assert_num_queries):
+    r1 = ReporterModel.objects.create(
+        first_name="r1", last_name="r1", email="r1@test.com"
+    )
+    for headline in ("a1", "a2"):
+        ArticleModel.objects.create(
+            headline=headline,
+            pub_date=datetime.now(),
+            pub_date_time=datetime.now(),
+            reporter=r1,
+            editor=r1,
+        )
+
+    query = """
+        query {
+            nodesById(ids: ["QXJ0aWNsZToy", "QXJ0aWNsZToz", "QXJ0aWNsZTox"]) {
+                id
+                headline
+            }
+            node(id: "QXJ0aWNsZTox") {
+                id
+            }
+        }
+    """
+
+    with django_assert_num_queries(1):
+        result = schema.execute(query, context=info().context)
+    assert not result.errors
+    assert result.data == {
+        "nodesById": [
+            {"id": "QXJ0aWNsZToy", "headline": "a2"},
+            None,
+            {"id": "QXJ0aWNsZTox", "headline": "a1"},
+        ],
+        "node": {"id": "QXJ0aWNsZTox"},
+    }
+
+
+@pytest.mark.django_db
+def test_relay_nodes_should_require_permissions():
+    query = """
+        query {
+            permissionNodesById(ids: ["QXJ0aWNsZTox"]) {
+                id
+            }
+        }
+    """
+
+    result = schema.execute(query, context=info(anon()).context)
+    assert len(result.errors) == 1
+    assert (
+        result.errors[0].message == "You do not have permission to perform this action."
+    )
+    assert result.data is None
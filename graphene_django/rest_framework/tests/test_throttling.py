@@ -0,0 +1,93 @@
+import json
+
+import graphene
+import pytest
+from django.core.cache import cache
+from graphene.relay import Node
+from rest_framework.test import APIRequestFactory
+
+from ...fields import DjangoConnectionField
+from ...tests.models import Reporter
+from ...types import DjangoObjectType
+from ..throttling import QueryCostThrottle
+from ..views import GraphQLAPIView
+
+
+class ReporterType(DjangoObjectType):
+    class Meta:
+        model = Reporter
+        interfaces = (Node,)
+
+
+class Query(graphene.ObjectType):
+    reporters = DjangoConnectionField(ReporterType)
+    reporter = graphene.Field(ReporterType)
+
+
+schema = graphene.Schema(query=Query)
+
+
+class TenPerMinuteThrottle(QueryCostThrottle):
+    rate = "10/min"
+
+
+class ThrottledGraphQLAPIView(GraphQLAPIView):
+    throttle_classes = (TenPerMinuteThrottle,)
+
+
+@pytest.fixture
+def view():
+    cache.clear()
+    yield ThrottledGraphQLAPIView.as_view(graphene_schema=schema)
+    cache.clear()
+
+
+def post(view, query):
+    request = APIRequestFactory().post(
+        "/graphql", json.dumps({"query": query}), content_type="application/json"
+    )
+    return view(request)
+
+
+@pytest.mark.django_db
+def test_should_charge_the_query_cost(view, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(TenPerMinuteThrottle, "timer", lambda self: now[0])
+
+    # 1 + 3 * (node: 1)
+    query = "{ reporters(first: 3) { edges { node { id } } } }"
+    assert post(view, query).status_code == 200
+    assert post(view, query).status_code == 200
+    # 2 tokens left
+    response = post(view, query)
+    assert response.status_code == 429
+    assert response["Retry-After"] == "12"
+
+    # Cheap queries still fit in the bucket
+    assert post(view, "{ reporter { id } }").status_code == 200
+    assert post(view, "{ reporter { id } }").status_code == 200
+    assert post(view, "{ reporter { id } }").status_code == 429
+
+    # Refilled at 10 tokens per minute
+    now[0] += 30
+    assert post(view, query).status_code == 200
+    assert post(view, query).status_code == 429
+
+
+@pytest.mark.django_db
+def test_should_cap_the_cost_to_the_bucket_size(view, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(TenPerMinuteThrottle, "timer", lambda self: now[0])
+
+    query = "{ reporters(first: 100) { edges { node { id } } } }"
+    assert post(view, query).status_code == 200
+    assert post(view, query).status_code == 429
+    now[0] += 60
+    assert post(view, query).status_code == 200
+
+
+@pytest.mark.django_db
+def test_should_charge_invalid_queries(view):
+    for _ in range(10):
+        assert post(view, "{ unknown }").status_code == 400
+    assert post(view, "{ unknown }").status_code == 429
@@ -2,6 +2,9 @@ import json
 
 import pytest
 
+from ...cache import get_query_hash
+from ...settings import graphene_settings
+
 try:
     from urllib import urlencode
 except ImportError:
@@ -561,3 +564,96 @@ def test_passes_request_into_context_request(client):
     assert response.status_code == 200
     assert response_json(response) == {"data": {"request": "testing"}}
 
+
+
+def test_persisted_query_round_trip(client):
+    query = '{test(who: "Persisted REST")}'
+    extensions = {
+        "persistedQuery": {"version": 1, "sha256Hash": get_query_hash(query)}
+    }
+    persisted_url = url_string("/rest_framework/graphql/persisted")
+
+    response = client.post(persisted_url, j(extensions=extensions), "application/json")
+    assert response.status_code == 400
+    assert response_json(response) == {
+        "errors": [
+            {
+                "message": "PersistedQueryNotFound",
+                "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+            }
+        ]
+    }
+
+    response = client.post(
+        persisted_url, j(query=query, extensions=extensions), "application/json"
+    )
+    assert response.status_code == 200
+    assert response_json(response) == {"data": {"test": "Hello Persisted REST"}}
+
+    response = client.get(
+        url_string(
+            "/rest_framework/graphql/persisted", extensions=json.dumps(extensions)
+        )
+    )
+    assert response.status_code == 200
+    assert response_json(response) == {"data": {"test": "Hello Persisted REST"}}
+
+
+def test_batch_executes_concurrently_in_order(client):
+    response = client.post(
+        url_string("/rest_framework/graphql/batch/concurrent"),
+        json.dumps(
+            [
+                dict(id=1, query='{test(who: "One")}'),
+                dict(id=2, query='{test(who: "Two")}'),
+                dict(id=3, query='{test(who: "Three")}'),
+            ]
+        ),
+        "application/json",
+    )
+
+    assert response.status_code == 200
+    assert response_json(response) == [
+        {"id": 1, "data": {"test": "Hello One"}, "status": 200},
+        {"id": 2, "data": {"test": "Hello Two"}, "status": 200},
+        {"id": 3, "data": {"test": "Hello Three"}, "status": 200},
+    ]
+
+
+def test_batch_fails_if_exceeds_max_size(client):
+    response = client.post(
+        url_string("/rest_framework/graphql/batch/concurrent"),
+        json.dumps([dict(id=i, query="{test}") for i in range(4)]),
+        "application/json",
+    )
+
+    assert response.status_code == 400
+    assert response_json(response) == {"errors": [{"message": "Batch requests are limited to 3 operations."}]}
+
+
+def test_uses_configured_json_codec(client, monkeypatch):
+    decoded = []
+
+    def decoder(value):
+        decoded.append(value)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return json.loads(value)
+
+    monkeypatch.setattr(
+        graphene_settings, "JSON_ENCODER", lambda value: json.dumps(value).encode()
+    )
+    monkeypatch.setattr(graphene_settings, "JSON_DECODER", decoder)
+
+    response = client.post(
+        url_string(),
+        j(
+            query="query helloWho($who: String){ test(who: $who) }",
+            variables=json.dumps({"who": "Codec"}),
+        ),
+        "application/json",
+    )
+
+    assert response.status_code == 200
+    assert response_json(response) == {"data": {"test": "Hello Codec"}}
+    assert isinstance(decoded[0], bytes)
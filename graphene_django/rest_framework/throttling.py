@@ -0,0 +1,98 @@
+"""
+Throttling of GraphQLAPIView by query cost.
+
+``QueryCostThrottle`` charges the cost of the operations of each request
+(see ``graphene_django.cost``) against a token bucket per user, or per IP
+address for anonymous requests, stored in Django's cache. Its rate reads
+as tokens per period: with ``"1000/min"`` a client can spend 1000 cost
+units at once, refilled at 1000 units per minute::
+
+    class ThrottledGraphQLAPIView(GraphQLAPIView):
+        throttle_classes = (QueryCostThrottle,)
+
+    REST_FRAMEWORK = {"DEFAULT_THROTTLE_RATES": {"graphql_cost": "1000/min"}}
+
+Operations cost at least 1, including the ones that can't be analyzed
+(e.g. invalid ones), and the cost charged to a request is capped to the
+size of the bucket, so expensive operations wait for a full bucket
+instead of being refused forever.
+"""
+from rest_framework.throttling import SimpleRateThrottle
+
+from ..cost import get_query_cost
+from ..persisted_queries import get_persisted_query_hash
+
+
+class QueryCostThrottle(SimpleRateThrottle):
+    scope = "graphql_cost"
+    cache_format = "throttle_%(scope)s_%(ident)s"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def get_operation_cost(self, request, view, data):
+        try:
+            query, variables, operation_name, _ = view.get_graphql_params(
+                request, data
+            )
+            persisted_query_hash = get_persisted_query_hash(
+                view.get_extensions(request, data)
+            )
+            document = view.get_graphene_document(
+                request, query, persisted_query_hash
+            )
+        except Exception:
+            # The view reports the errors of the request
+            return 1
+        query_cost = get_query_cost(
+            view.graphene_schema, document, operation_name, variables
+        )
+        if query_cost is None:
+            return 1
+        return max(query_cost.cost, 1)
+
+    def get_cost(self, request, view):
+        """Return the total cost of the operations of the request."""
+        if not hasattr(view, "get_graphene_document"):
+            return 1
+        try:
+            data = request.data
+        except Exception:
+            return 1
+        if getattr(view, "graphene_batch", False) and isinstance(data, list):
+            return sum(
+                self.get_operation_cost(request, view, entry)
+                for entry in data
+                if isinstance(entry, dict)
+            ) or 1
+        return self.get_operation_cost(request, view, data)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        refill_rate = float(self.num_requests) / self.duration
+        tokens, timestamp = self.cache.get(self.key, (self.num_requests, self.now))
+        tokens = min(self.num_requests, tokens + (self.now - timestamp) * refill_rate)
+        cost = min(self.get_cost(request, view), self.num_requests)
+
+        if tokens < cost:
+            self.tokens_wait = (cost - tokens) / refill_rate
+            self.cache.set(self.key, (tokens, self.now), self.duration)
+            return self.throttle_failure()
+
+        self.tokens_wait = None
+        self.cache.set(self.key, (tokens - cost, self.now), self.duration)
+        return True
+
+    def wait(self):
+        return self.tokens_wait
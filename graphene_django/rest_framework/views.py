@@ -1,5 +1,6 @@
 import json
 import copy
+from functools import partial
 
 from django.utils import six
 
@@ -15,11 +16,30 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.views import exception_handler as rest_framework_exception_handler
 from rest_framework.parsers import FormParser, MultiPartParser
-from rest_framework.renderers import JSONRenderer, TemplateHTMLRenderer
-
+from rest_framework.renderers import TemplateHTMLRenderer
+
+from ..cache import get_document_cache
+from ..codec import json_loads
+from ..cost import QueryTooComplex, check_query_cost
+from ..deadline import Deadline, set_deadline, statement_timeout
+from ..persisted_queries import (
+    get_persisted_document,
+    get_persisted_query_hash,
+    get_persisted_query_store,
+    instantiate_persisted_query_store,
+)
+from ..response_cache import (
+    get_response_cache,
+    get_response_key,
+    get_response_models,
+    get_vary,
+    get_view_namespace,
+)
 from ..settings import graphene_settings
+from ..utils import map_in_threads
 from ..views import instantiate_middleware
 from .parsers import GraphQLJSONParser, GraphQLParser
+from .renderers import GraphQLJSONRenderer
 
 
 def exception_handler(exc, context):
@@ -56,8 +76,15 @@ class GraphQLAPIView(APIView):
     graphene_root_value = None
     graphene_batch = False
     graphene_pretty = False
-
-    renderer_classes = (JSONRenderer, TemplateHTMLRenderer)
+    graphene_persisted_query_store = None
+    graphene_batch_max_size = None
+    graphene_batch_max_workers = None
+    graphene_max_query_depth = None
+    graphene_max_query_cost = None
+    graphene_deadline = None
+    graphene_response_cache_timeout = None
+
+    renderer_classes = (GraphQLJSONRenderer, TemplateHTMLRenderer)
     parser_classes = (GraphQLJSONParser, GraphQLParser, FormParser, MultiPartParser)
 
     resolver_permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
@@ -72,10 +99,38 @@ class GraphQLAPIView(APIView):
         graphene_pretty=False,
         graphene_batch=False,
         graphene_backend=None,
+        graphene_persisted_query_store=None,
+        graphene_batch_max_size=None,
+        graphene_batch_max_workers=None,
+        graphene_max_query_depth=None,
+        graphene_max_query_cost=None,
+        graphene_deadline=None,
+        graphene_response_cache_timeout=None,
     ):
         if not graphene_schema:
             graphene_schema = graphene_settings.SCHEMA
 
+        if graphene_persisted_query_store is None:
+            graphene_persisted_query_store = get_persisted_query_store()
+
+        if graphene_batch_max_size is None:
+            graphene_batch_max_size = graphene_settings.BATCH_MAX_SIZE
+
+        if graphene_batch_max_workers is None:
+            graphene_batch_max_workers = graphene_settings.BATCH_MAX_WORKERS
+
+        if graphene_max_query_depth is None:
+            graphene_max_query_depth = graphene_settings.QUERY_MAX_DEPTH
+
+        if graphene_max_query_cost is None:
+            graphene_max_query_cost = graphene_settings.QUERY_MAX_COST
+
+        if graphene_deadline is None:
+            graphene_deadline = graphene_settings.QUERY_DEADLINE
+
+        if graphene_response_cache_timeout is None:
+            graphene_response_cache_timeout = graphene_settings.RESPONSE_CACHE_TIMEOUT
+
         if graphene_backend is None:
             graphene_backend = get_default_backend()
 
@@ -90,7 +145,26 @@ class GraphQLAPIView(APIView):
         self.graphene_pretty = self.graphene_pretty or graphene_pretty
         self.graphiql = self.graphiql or graphiql
         self.graphene_batch = self.graphene_batch or graphene_batch
+        self.graphene_batch_max_size = (
+            self.graphene_batch_max_size or graphene_batch_max_size
+        )
+        self.graphene_batch_max_workers = (
+            self.graphene_batch_max_workers or graphene_batch_max_workers
+        )
+        self.graphene_max_query_depth = (
+            self.graphene_max_query_depth or graphene_max_query_depth
+        )
+        self.graphene_max_query_cost = (
+            self.graphene_max_query_cost or graphene_max_query_cost
+        )
+        self.graphene_deadline = self.graphene_deadline or graphene_deadline
+        self.graphene_response_cache_timeout = (
+            self.graphene_response_cache_timeout or graphene_response_cache_timeout
+        )
         self.graphene_backend = graphene_backend
+        self.graphene_persisted_query_store = instantiate_persisted_query_store(
+            self.graphene_persisted_query_store or graphene_persisted_query_store
+        )
 
         assert isinstance(
             self.graphene_schema, GraphQLSchema
@@ -112,6 +186,36 @@ class GraphQLAPIView(APIView):
     def get_graphene_backend(self, request):
         return self.graphene_backend
 
+    def get_graphene_batch_max_size(self, request):
+        return self.graphene_batch_max_size
+
+    def get_graphene_batch_max_workers(self, request):
+        return self.graphene_batch_max_workers
+
+    def get_graphene_max_query_depth(self, request):
+        return self.graphene_max_query_depth
+
+    def get_graphene_max_query_cost(self, request):
+        return self.graphene_max_query_cost
+
+    def get_graphene_deadline(self, request, operation_name):
+        """Return the seconds the operation ``operation_name`` may run for."""
+        return self.graphene_deadline
+
+    def get_graphene_document(self, request, query, persisted_query_hash=None):
+        backend = self.get_graphene_backend(request)
+        if persisted_query_hash:
+            return get_persisted_document(
+                self.graphene_persisted_query_store,
+                backend,
+                self.graphene_schema,
+                query,
+                persisted_query_hash,
+            )
+        return get_document_cache().document_from_string(
+            backend, self.graphene_schema, query
+        )
+
     def get_renderer_context(self):
         """
         Add indent to rendered JSON if prettyprint is specified.
@@ -144,7 +248,7 @@ class GraphQLAPIView(APIView):
 
         if variables and isinstance(variables, six.text_type):
             try:
-                variables = json.loads(variables)
+                variables = json_loads(variables)
             except Exception:
                 raise exceptions.ParseError({"message": "Variables are invalid JSON."})
 
@@ -154,6 +258,18 @@ class GraphQLAPIView(APIView):
 
         return query, variables, operation_name, id
 
+    @staticmethod
+    def get_extensions(request, data):
+        extensions = request.GET.get("extensions") or data.get("extensions")
+
+        if extensions and isinstance(extensions, six.text_type):
+            try:
+                extensions = json_loads(extensions)
+            except Exception:
+                raise exceptions.ParseError({"message": "Extensions are invalid JSON."})
+
+        return extensions
+
     @staticmethod
     def format_graphene_error(error):
         if isinstance(error, GraphQLError):
@@ -162,16 +278,23 @@ class GraphQLAPIView(APIView):
         return {"message": six.text_type(error)}
 
     def execute_graphql_request(
-        self, request, query, variables, operation_name, show_graphiql=False
+        self,
+        request,
+        query,
+        variables,
+        operation_name,
+        show_graphiql=False,
+        persisted_query_hash=None,
     ):
-        if not query:
+        if not query and not persisted_query_hash:
             if show_graphiql:
                 return None
             raise exceptions.ValidationError({"message": "Must provide query string."})
 
         try:
-            backend = self.get_graphene_backend(request)
-            document = backend.document_from_string(self.graphene_schema, query)
+            document = self.get_graphene_document(
+                request, query, persisted_query_hash
+            )
         except Exception as e:
             return ExecutionResult(errors=[e], invalid=True)
 
@@ -188,6 +311,18 @@ class GraphQLAPIView(APIView):
                     ),
                 )
 
+        try:
+            check_query_cost(
+                self.graphene_schema,
+                document,
+                operation_name,
+                variables,
+                max_cost=self.get_graphene_max_query_cost(request),
+                max_depth=self.get_graphene_max_query_depth(request),
+            )
+        except QueryTooComplex as e:
+            return ExecutionResult(errors=[e], invalid=True)
+
         try:
             extra_options = {}
             if self.graphene_executor:
@@ -195,14 +330,22 @@ class GraphQLAPIView(APIView):
                 # executor is not a valid argument in all backends
                 extra_options["executor"] = self.graphene_executor
 
-            return document.execute(
-                root=self.get_graphene_root_value(request),
-                variables=variables,
-                operation_name=operation_name,
-                context=self.get_graphene_context(request),
-                middleware=self.get_graphene_middleware(request),
-                **extra_options
-            )
+            context = self.get_graphene_context(request)
+            deadline = None
+            timeout = self.get_graphene_deadline(request, operation_name)
+            if timeout:
+                deadline = Deadline(timeout)
+                set_deadline(context, deadline)
+
+            with statement_timeout(deadline):
+                return document.execute(
+                    root=self.get_graphene_root_value(request),
+                    variables=variables,
+                    operation_name=operation_name,
+                    context=context,
+                    middleware=self.get_graphene_middleware(request),
+                    **extra_options
+                )
         except Exception as e:
             return ExecutionResult(errors=[e], invalid=True)
 
@@ -218,7 +361,7 @@ class GraphQLAPIView(APIView):
         )
 
         if self.graphene_batch:
-            responses = [self.get_response(request, entry) for entry in request.data]
+            responses = self.get_batch_responses(request, request.data)
             result = [response[0] for response in responses]
             status_code = (
                 responses and max(responses, key=lambda response: response[1])[1] or 200
@@ -245,15 +388,63 @@ class GraphQLAPIView(APIView):
 
         return Response(result, status=status_code)
 
+    def get_batch_responses(self, request, data):
+        max_size = self.get_graphene_batch_max_size(request)
+        if max_size and len(data) > max_size:
+            raise exceptions.ValidationError(
+                {
+                    "message": "Batch requests are limited to {} operations.".format(
+                        max_size
+                    )
+                }
+            )
+
+        max_workers = self.get_graphene_batch_max_workers(request)
+        if not max_workers or max_workers < 2 or len(data) < 2:
+            return [self.get_response(request, entry) for entry in data]
+
+        # Operations run on worker threads, each one using its own database
+        # connection, so they don't share a transaction with the request.
+        return map_in_threads(
+            partial(self.get_response, request), data, min(max_workers, len(data))
+        )
+
     def get_response(self, request, data, show_graphiql=False):
         query, variables, operation_name, id = self.get_graphql_params(request, data)
-
-        execution_result = self.execute_graphql_request(
-            request, query, variables, operation_name, show_graphiql
+        persisted_query_hash = get_persisted_query_hash(
+            self.get_extensions(request, data)
         )
 
+        response_cache = self.get_graphene_response_cache(request)
+        cache_key = response_cache and get_response_key(
+            self.get_graphene_response_cache_namespace(request),
+            query,
+            persisted_query_hash,
+            variables,
+            operation_name,
+            self.get_graphene_response_cache_vary(request),
+        )
+        # Cache hits skip parsing and execution
+        response = cache_key and response_cache.get(cache_key)
         status_code = 200
-        if execution_result:
+        if not response:
+            cache_versions = None
+            if cache_key:
+                cache_versions = self.get_graphene_response_cache_versions(
+                    request, query, operation_name, persisted_query_hash, response_cache
+                )
+
+            execution_result = self.execute_graphql_request(
+                request,
+                query,
+                variables,
+                operation_name,
+                show_graphiql,
+                persisted_query_hash=persisted_query_hash,
+            )
+            if not execution_result:
+                return None, status_code
+
             response = {}
 
             if execution_result.errors:
@@ -266,12 +457,36 @@ class GraphQLAPIView(APIView):
             else:
                 response["data"] = execution_result.data
 
-            if self.graphene_batch:
-                response["id"] = id
-                response["status"] = status_code
+            if cache_versions is not None and not execution_result.errors:
+                response_cache.set(cache_key, cache_versions, response)
 
-            result = response
-        else:
-            result = None
+        if self.graphene_batch:
+            response["id"] = id
+            response["status"] = status_code
+
+        return response, status_code
 
-        return result, status_code
+    def get_graphene_response_cache(self, request):
+        return get_response_cache(self.graphene_response_cache_timeout)
+
+    def get_graphene_response_cache_vary(self, request):
+        return get_vary(request)
+
+    def get_graphene_response_cache_namespace(self, request):
+        return get_view_namespace(self, self.graphene_schema)
+
+    def get_graphene_response_cache_versions(
+        self, request, query, operation_name, persisted_query_hash, response_cache
+    ):
+        """
+        Return the versions of the models of a query to store its response
+        with, or None when it can't be cached.
+        """
+        try:
+            document = self.get_graphene_document(request, query, persisted_query_hash)
+        except Exception:
+            return None
+        models = get_response_models(self.graphene_schema, document, operation_name)
+        if models is None:
+            return None
+        return response_cache.get_versions(models)
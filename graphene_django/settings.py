@@ -35,13 +35,103 @@ DEFAULTS = {
     "RELAY_CONNECTION_ENFORCE_FIRST_OR_LAST": False,
     # Max items returned in ConnectionFields / FilterConnectionFields
     "RELAY_CONNECTION_MAX_LIMIT": 100,
+    # Max rows counted in ConnectionFields using the "capped" count strategy
+    "RELAY_CONNECTION_MAX_COUNT": 10000,
+    # Max parsed and validated documents kept in the views' LRU cache.
+    # Set to 0 to disable the cache
+    "DOCUMENT_CACHE_SIZE": 1000,
+    # Store used for Automatic Persisted Queries, e.g.
+    # 'graphene_django.persisted_queries.InMemoryPersistedQueryStore'.
+    # Persisted queries are disabled when it's None
+    "PERSISTED_QUERY_STORE": None,
+    # Max depth and cost of the operations accepted by the views (None for
+    # no limit), see graphene_django.cost
+    "QUERY_MAX_DEPTH": None,
+    "QUERY_MAX_COST": None,
+    # Seconds an operation may run in the views before its resolvers fail
+    # (None for no limit). On PostgreSQL the time left is also set as the
+    # statement_timeout of its queries
+    "QUERY_DEADLINE": None,
+    # Max-age of the HTTP cached responses of the views selecting model types
+    # without a cache_max_age, or no model types at all
+    "HTTP_CACHE_DEFAULT_MAX_AGE": 0,
+    # Seconds the responses of queries are cached by the views (None to
+    # disable the response cache), in the RESPONSE_CACHE_ALIAS Django cache.
+    # RESPONSE_CACHE_VARY is a callable receiving the request and returning
+    # the value separating the responses of different requests, e.g.
+    # 'graphene_django.response_cache.get_default_vary'
+    "RESPONSE_CACHE_TIMEOUT": None,
+    "RESPONSE_CACHE_ALIAS": "default",
+    "RESPONSE_CACHE_VARY": None,
+    # Caches holding the results of DjangoFilterConnectionField(cache_timeout=...)
+    # (or any other cache of results keyed by model versions). The version
+    # tokens of a model are replaced in each of them, and in
+    # RESPONSE_CACHE_ALIAS when RESPONSE_CACHE_TIMEOUT is set, whenever one
+    # of its instances changes in any process. Empty by default, so only the
+    # processes caching results invalidate them
+    "MODEL_VERSIONS_CACHE_ALIASES": (),
+    # Max operations accepted in a single batch request (None for no limit)
+    "BATCH_MAX_SIZE": None,
+    # Threads used to execute the operations of a batch request concurrently.
+    # Batches are executed sequentially when it's None or 1
+    "BATCH_MAX_WORKERS": None,
+    # Callables used to encode responses and decode request bodies and
+    # variables instead of the json module, e.g. 'orjson.dumps' and
+    # 'orjson.loads'. Encoders may return bytes, and decoders must accept
+    # both the raw request body as bytes and text
+    "JSON_ENCODER": None,
+    "JSON_DECODER": None,
+    # Set to True to select_related / prefetch_related the relations selected
+    # in the query on the querysets of ConnectionFields and DjangoListFields
+    "OPTIMIZE_QUERIES": False,
+    # Set to False to resolve the related objects of model fields one by one
+    # instead of batching them with the request's DataLoaders
+    "RELATED_FIELD_LOADERS": True,
+    # Set to False to fetch the nodes of DjangoNode fields one by one. When
+    # enabled, DjangoObjectType.get_node_promise returns a promise during an
+    # operation (get_node always returns the instance)
+    "NODE_LOADERS": True,
+    # Fraction of the requests instrumented by DjangoDebugMiddleware
+    # (between 0 and 1). Requests carrying the DEBUG_HEADER HTTP header
+    # (e.g. "X-Graphene-Debug") are always instrumented
+    "DEBUG_SAMPLE_RATE": 1.0,
+    "DEBUG_HEADER": None,
+    # Set to True to record only the raw SQL, alias and duration of queries
+    # in DjangoDebugMiddleware, formatting the rest when it's selected
+    "DEBUG_LITE_MODE": False,
+    # Queries repeated this many times for the same field are reported as
+    # N+1 queries by DjangoDebugMiddleware. In strict mode they raise an
+    # error instead, e.g. to make tests fail
+    "DEBUG_N_PLUS_ONE_THRESHOLD": 5,
+    "DEBUG_N_PLUS_ONE_STRICT": False,
+    # Set to True to record the start time and duration of every resolver
+    # (and the queries it ran) in DjangoDebugMiddleware
+    "DEBUG_TRACE_RESOLVERS": False,
+    # Queries taking more than this many seconds are flagged as slow by
+    # DjangoDebugMiddleware, and logged to the
+    # "graphene_django.debug.slow_queries" logger
+    "DEBUG_SLOW_QUERY_THRESHOLD": 10,
+    # Set to True to capture the EXPLAIN of slow SELECTs (with ANALYZE when
+    # DEBUG_EXPLAIN_ANALYZE is True and the database supports it, which runs
+    # the query again)
+    "DEBUG_EXPLAIN_SLOW_QUERIES": False,
+    "DEBUG_EXPLAIN_ANALYZE": False,
+    # Path of a rotating file to write the slow queries to
+    "DEBUG_SLOW_QUERY_LOG_FILE": None,
 }
 
 if settings.DEBUG:
     DEFAULTS["MIDDLEWARE"] += ("graphene_django.debug.DjangoDebugMiddleware",)
 
 # List of settings that may be in string import notation.
-IMPORT_STRINGS = ("MIDDLEWARE", "SCHEMA")
+IMPORT_STRINGS = (
+    "MIDDLEWARE",
+    "SCHEMA",
+    "PERSISTED_QUERY_STORE",
+    "JSON_ENCODER",
+    "JSON_DECODER",
+    "RESPONSE_CACHE_VARY",
+)
 
 
 def perform_import(val, setting_name):
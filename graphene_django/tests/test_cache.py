@@ -0,0 +1,53 @@
+from graphql import get_default_backend
+
+from ..cache import DocumentCache, get_query_hash
+from .schema_view import schema
+
+
+def test_document_cache_reuses_documents():
+    cache = DocumentCache(max_size=10)
+    backend = get_default_backend()
+
+    document = cache.document_from_string(backend, schema, "{test}")
+    assert cache.document_from_string(backend, schema, "{test}") is document
+    assert cache.info() == {"hits": 1, "misses": 1, "size": 1, "max_size": 10}
+
+    result = document.execute()
+    assert not result.errors
+    assert result.data == {"test": "Hello World"}
+
+
+def test_document_cache_evicts_least_recently_used():
+    cache = DocumentCache(max_size=2)
+    backend = get_default_backend()
+
+    first = cache.document_from_string(backend, schema, "{test}")
+    cache.document_from_string(backend, schema, "{request}")
+    # Touch the first query so the second one becomes the oldest
+    cache.document_from_string(backend, schema, "{test}")
+    cache.document_from_string(backend, schema, '{test(who: "Dolly")}')
+
+    assert len(cache) == 2
+    assert cache.get(backend, schema, get_query_hash("{test}")) is first
+    assert cache.get(backend, schema, get_query_hash("{request}")) is None
+
+
+def test_document_cache_keeps_validation_errors():
+    cache = DocumentCache(max_size=10)
+    backend = get_default_backend()
+
+    cache.document_from_string(backend, schema, "{ unknownOne }")
+    result = cache.document_from_string(backend, schema, "{ unknownOne }").execute()
+
+    assert cache.hits == 1
+    assert result.invalid
+    assert result.errors[0].message == 'Cannot query field "unknownOne" on type "QueryRoot".'
+
+
+def test_document_cache_disabled():
+    cache = DocumentCache(max_size=0)
+    backend = get_default_backend()
+
+    document = cache.document_from_string(backend, schema, "{test}")
+    assert cache.document_from_string(backend, schema, "{test}") is not document
+    assert len(cache) == 0
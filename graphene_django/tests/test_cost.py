@@ -0,0 +1,175 @@
+import json
+
+import graphene
+import pytest
+from django.test import RequestFactory
+from graphene.relay import Node
+from graphql import get_default_backend
+from mock import patch
+
+from ..cache import DocumentCache
+from ..cost import (
+    CostAnalyzer,
+    QueryCost,
+    QueryTooComplex,
+    check_query_cost,
+    get_query_cost,
+)
+from ..fields import DjangoConnectionField
+from ..rest_framework.views import GraphQLAPIView
+from ..types import DjangoObjectType
+from ..views import GraphQLView
+from .models import Article, Reporter
+
+
+class ReporterType(DjangoObjectType):
+    class Meta:
+        model = Reporter
+        interfaces = (Node,)
+
+
+class ArticleType(DjangoObjectType):
+    class Meta:
+        model = Article
+        interfaces = (Node,)
+
+
+class Query(graphene.ObjectType):
+    reporters = DjangoConnectionField(ReporterType, max_limit=50)
+    expensive_articles = DjangoConnectionField(ArticleType, cost=10)
+    reporter = graphene.Field(ReporterType)
+
+
+schema = graphene.Schema(query=Query)
+
+NESTED_QUERY = """
+    query Reporters($first: Int = 20) {
+      reporters(first: $first) {
+        pageInfo {
+          hasNextPage
+        }
+        edges {
+          node {
+            ...ReporterArticles
+          }
+        }
+      }
+    }
+
+    fragment ReporterArticles on ReporterType {
+      firstName
+      articles(first: 5) {
+        edges {
+          node {
+            headline
+          }
+        }
+      }
+    }
+"""
+
+
+def get_document(query):
+    return DocumentCache(max_size=10).document_from_string(
+        get_default_backend(), schema, query
+    )
+
+
+def test_should_weight_connections_by_their_limit():
+    document = get_document(NESTED_QUERY)
+
+    # reporters: 1 + 20 * (node: 1 + articles: 1 + 5 * (node: 1))
+    assert get_query_cost(schema, document) == QueryCost(cost=141, depth=7)
+    assert get_query_cost(schema, document, variables={"first": 2}) == QueryCost(
+        cost=15, depth=7
+    )
+    # Bounded by the max_limit of the field
+    assert get_query_cost(schema, document, variables={"first": 1000}).cost == 351
+
+
+def test_should_use_the_cost_of_fields():
+    document = get_document(
+        "{ expensiveArticles(first: 2) { edges { node { headline } } } }"
+    )
+    assert get_query_cost(schema, document) == QueryCost(cost=12, depth=4)
+
+
+def test_should_cache_the_cost_with_the_document():
+    document = get_document(NESTED_QUERY)
+
+    with patch.object(
+        CostAnalyzer, "analyze", autospec=True, side_effect=CostAnalyzer.analyze
+    ) as analyze:
+        get_query_cost(schema, document, variables={"first": 2})
+        get_query_cost(schema, document, variables={"first": 2})
+        assert analyze.call_count == 1
+        get_query_cost(schema, document, variables={"first": 3})
+        assert analyze.call_count == 2
+
+
+def test_should_skip_invalid_documents():
+    document = get_document("{ unknown { id } }")
+    assert get_query_cost(schema, document) is None
+
+
+def test_should_reject_queries_over_the_limits():
+    document = get_document(NESTED_QUERY)
+
+    check_query_cost(schema, document, max_cost=141, max_depth=7)
+    with pytest.raises(QueryTooComplex) as exc_info:
+        check_query_cost(schema, document, max_cost=100)
+    assert str(exc_info.value) == (
+        "The query has a cost of 141, over the maximum cost of 100."
+    )
+    with pytest.raises(QueryTooComplex):
+        check_query_cost(schema, document, max_depth=6)
+
+
+@pytest.mark.django_db
+def test_view_should_reject_queries_over_the_max_cost():
+    view = GraphQLView.as_view(schema=schema, max_query_cost=100)
+    factory = RequestFactory()
+
+    request = factory.post(
+        "/graphql", json.dumps({"query": NESTED_QUERY}), "application/json"
+    )
+    response = view(request)
+    assert response.status_code == 400
+    [error] = json.loads(response.content.decode())["errors"]
+    assert error["message"] == (
+        "The query has a cost of 141, over the maximum cost of 100."
+    )
+    assert error["extensions"] == {"code": "QUERY_TOO_COMPLEX"}
+
+    request = factory.post(
+        "/graphql",
+        json.dumps({"query": "{ reporter { firstName } }"}),
+        "application/json",
+    )
+    response = view(request)
+    assert response.status_code == 200
+    assert json.loads(response.content.decode()) == {"data": {"reporter": None}}
+
+
+@pytest.mark.django_db
+def test_api_view_should_reject_queries_over_the_max_depth():
+    view = GraphQLAPIView.as_view(graphene_schema=schema, graphene_max_query_depth=2)
+    factory = RequestFactory()
+
+    request = factory.post(
+        "/graphql", json.dumps({"query": NESTED_QUERY}), "application/json"
+    )
+    response = view(request)
+    assert response.status_code == 400
+    assert response.data["errors"][0]["message"] == (
+        "The query has a depth of 7, over the maximum depth of 2."
+    )
+
+    request = factory.post(
+        "/graphql",
+        json.dumps({"query": "{ reporter { firstName } }"}),
+        "application/json",
+    )
+    response = view(request)
+    assert response.status_code == 200
+    assert response.data == {"data": {"reporter": None}}
@@ -0,0 +1,231 @@
+import datetime
+
+import graphene
+import pytest
+from graphene.relay import Node
+from graphql.execution.base import ResolveInfo
+from graphql_relay import to_global_id
+
+from ..fields import DjangoListField
+from ..rest_framework.relay import DjangoNode
+from ..settings import graphene_settings
+from ..types import DjangoObjectType
+from .models import Article, Film, Reporter
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def reporters():
+    reporters = []
+    for name in ("Jane", "John", "Jack"):
+        reporter = Reporter.objects.create(
+            first_name=name, last_name="Doe", email="doe@example.com", a_choice=1
+        )
+        Article.objects.create(
+            headline="{}'s article".format(name),
+            pub_date=datetime.date.today(),
+            pub_date_time=datetime.datetime.now(),
+            reporter=reporter,
+            editor=reporter,
+        )
+        Film.objects.create().reporters.add(reporter)
+        reporters.append(reporter)
+    return reporters
+
+
+def get_schema():
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+
+    class FilmType(DjangoObjectType):
+        class Meta:
+            model = Film
+
+    class Query(graphene.ObjectType):
+        articles = DjangoListField(ArticleType)
+        reporters = DjangoListField(ReporterType)
+
+        def resolve_articles(self, info):
+            return Article.objects.all()
+
+        def resolve_reporters(self, info):
+            return Reporter.objects.order_by("pk")
+
+    return graphene.Schema(query=Query)
+
+
+def test_should_batch_foreign_keys(reporters, django_assert_num_queries):
+    query = """
+        query {
+            articles {
+                reporter {
+                    firstName
+                }
+            }
+        }
+    """
+
+    # The articles, then their reporters
+    with django_assert_num_queries(2):
+        result = get_schema().execute(query, context_value={})
+    assert not result.errors
+    assert result.data == {
+        "articles": [
+            {"reporter": {"firstName": "Jack"}},
+            {"reporter": {"firstName": "Jane"}},
+            {"reporter": {"firstName": "John"}},
+        ]
+    }
+
+
+def test_should_batch_reverse_and_many_to_many_relations(
+    reporters, django_assert_num_queries
+):
+    query = """
+        query {
+            reporters {
+                articles {
+                    headline
+                }
+                films {
+                    id
+                }
+            }
+        }
+    """
+
+    # The reporters, their articles and their films
+    with django_assert_num_queries(3):
+        result = get_schema().execute(query, context_value={})
+    assert not result.errors
+    assert result.data == {
+        "reporters": [
+            {
+                "articles": [{"headline": "{}'s article".format(reporter.first_name)}],
+                "films": [{"id": str(reporter.films.get().pk)}],
+            }
+            for reporter in reporters
+        ]
+    }
+
+
+def test_should_not_batch_when_disabled(
+    reporters, monkeypatch, django_assert_num_queries
+):
+    monkeypatch.setattr(graphene_settings, "RELATED_FIELD_LOADERS", False)
+    query = """
+        query {
+            articles {
+                reporter {
+                    firstName
+                }
+            }
+        }
+    """
+
+    with django_assert_num_queries(4):
+        result = get_schema().execute(query, context_value={})
+    assert not result.errors
+
+
+def test_should_keep_custom_resolvers(reporters):
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+
+        def resolve_reporter(self, info):
+            return Reporter(first_name="Custom")
+
+    class Query(graphene.ObjectType):
+        articles = DjangoListField(ArticleType)
+
+        def resolve_articles(self, info):
+            return Article.objects.all()[:1]
+
+    schema = graphene.Schema(query=Query)
+    result = schema.execute(
+        "query { articles { reporter { firstName } } }", context_value={}
+    )
+    assert not result.errors
+    assert result.data == {"articles": [{"reporter": {"firstName": "Custom"}}]}
+
+
+def test_should_not_batch_unsaved_instances():
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+
+    class Query(graphene.ObjectType):
+        reporter = graphene.Field(ReporterType)
+
+        def resolve_reporter(self, info):
+            return Reporter(first_name="Jane")
+
+    schema = graphene.Schema(query=Query)
+    result = schema.execute(
+        "query { reporter { articles { headline } } }", context_value={}
+    )
+    assert not result.errors
+    assert result.data == {"reporter": {"articles": []}}
+
+
+def test_should_batch_node_lookups(reporters, django_assert_num_queries):
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (DjangoNode,)
+
+    class Query(graphene.ObjectType):
+        node = DjangoNode.Field()
+
+    schema = graphene.Schema(query=Query, types=[ReporterType])
+    query = """
+        query {
+            first: node(id: "%s") { ... on ReporterType { firstName } }
+            second: node(id: "%s") { ... on ReporterType { firstName } }
+            missing: node(id: "%s") { id }
+        }
+    """ % tuple(
+        to_global_id("ReporterType", pk)
+        for pk in (reporters[1].pk, reporters[0].pk, "not-a-pk")
+    )
+
+    with django_assert_num_queries(1):
+        result = schema.execute(query, context_value={})
+    assert not result.errors
+    assert result.data == {
+        "first": {"firstName": "John"},
+        "second": {"firstName": "Jane"},
+        "missing": None,
+    }
+
+
+def test_get_node_should_return_instances(reporters):
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+
+    class Query(graphene.ObjectType):
+        node = Node.Field()
+
+    schema = graphene.Schema(query=Query, types=[ReporterType])
+    info = ResolveInfo(None, None, None, None, schema, None, None, None, None, {})
+    assert ReporterType.get_node(info, reporters[0].pk) == reporters[0]
+    assert Node.get_node_from_global_id(
+        info, to_global_id("ReporterType", reporters[1].pk)
+    ) == reporters[1]
@@ -0,0 +1,144 @@
+import json
+
+import graphene
+import pytest
+from django.db import OperationalError, connection, transaction
+from django.test import RequestFactory
+
+from .. import deadline as deadline_module
+from ..deadline import Deadline, DeadlineExceeded, StatementTimeout
+from ..fields import DjangoListField
+from ..types import DjangoObjectType
+from ..views import GraphQLView
+from .models import Reporter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(deadline_module, "time", lambda: now[0])
+    return now
+
+
+def test_deadline_expires(clock):
+    deadline = Deadline(2)
+    assert deadline.remaining() == 2
+    deadline.check()
+
+    clock[0] += 2
+    assert deadline.expired
+    assert deadline.remaining() == 0
+    with pytest.raises(DeadlineExceeded):
+        deadline.check()
+
+
+@pytest.mark.django_db
+def test_view_should_abort_resolvers_past_the_deadline(clock):
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+
+    class Query(graphene.ObjectType):
+        slow = graphene.String()
+        reporters = DjangoListField(ReporterType)
+
+        def resolve_slow(self, info):
+            clock[0] += 5
+            return "done"
+
+        def resolve_reporters(self, info):
+            return Reporter.objects.all()
+
+    schema = graphene.Schema(query=Query)
+    view = GraphQLView.as_view(schema=schema, deadline=3)
+    request = RequestFactory().post(
+        "/graphql",
+        json.dumps({"query": "{ slow reporters { id } }"}),
+        "application/json",
+    )
+
+    response = view(request)
+    assert response.status_code == 200
+    content = json.loads(response.content.decode())
+    assert content["data"] == {"slow": "done", "reporters": None}
+    [error] = content["errors"]
+    assert error["message"] == "The deadline of the operation has passed."
+    assert error["extensions"] == {"code": "DEADLINE_EXCEEDED"}
+
+
+class SQLiteStatementTimeout(StatementTimeout):
+    # SQLite has no statement_timeout
+    set_timeout_sql = "SELECT ?"
+    reset_timeout_sql = "SELECT 1"
+
+    def __init__(self, deadline):
+        super(SQLiteStatementTimeout, self).__init__(deadline)
+        self.executed = []
+
+    def run(self, connection, sql, params=None):
+        self.executed.append((sql, params))
+        super(SQLiteStatementTimeout, self).run(connection, sql, params)
+
+
+def select(value):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT %s", [value])
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_statement_timeout_is_set_to_the_time_left(clock):
+    wrapper = SQLiteStatementTimeout(Deadline(10))
+    with connection.execute_wrapper(wrapper):
+        assert select(1) == 1
+        # Close enough to the time left, the timeout isn't set again
+        clock[0] += 0.5
+        select(2)
+        clock[0] += 4.5
+        select(3)
+        wrapper.reset(connection)
+    assert wrapper.executed == [
+        ("SELECT ?", ["10000"]),
+        ("SELECT ?", ["5000"]),
+        ("SELECT 1", None),
+    ]
+
+
+@pytest.mark.django_db
+def test_statement_timeout_is_set_again_after_rollbacks(clock):
+    wrapper = SQLiteStatementTimeout(Deadline(10))
+    with pytest.raises(ZeroDivisionError):
+        with transaction.atomic():
+            # Set in the savepoint
+            with connection.execute_wrapper(wrapper):
+                select(1)
+            1 / 0
+    with connection.execute_wrapper(wrapper):
+        select(2)
+    assert wrapper.executed == [("SELECT ?", ["10000"])] * 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_statement_timeout_is_set_in_a_transaction_in_autocommit_mode(clock):
+    wrapper = SQLiteStatementTimeout(Deadline(10))
+    with connection.execute_wrapper(wrapper):
+        select(1)
+        select(2)
+    # Each query has a transaction of its own
+    assert wrapper.executed == [("SELECT ?", ["10000"])] * 2
+    assert not wrapper.is_set(connection)
+
+
+@pytest.mark.django_db
+def test_statement_timeout_cancellations_exceed_the_deadline(clock):
+    wrapper = SQLiteStatementTimeout(Deadline(1))
+
+    def execute(sql, params, many, context):
+        clock[0] += 1
+        raise OperationalError("canceling statement due to statement timeout")
+
+    context = {"connection": connection}
+    with pytest.raises(DeadlineExceeded):
+        wrapper(execute, "SELECT 1", (), False, context)
+    with pytest.raises(DeadlineExceeded):
+        wrapper(execute, "SELECT 1", (), False, context)
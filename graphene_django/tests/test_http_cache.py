@@ -0,0 +1,133 @@
+import json
+
+import graphene
+import pytest
+from django.test import RequestFactory
+from graphql import get_default_backend
+
+from ..cache import DocumentCache
+from ..http_cache import get_cache_max_age
+from ..types import DjangoObjectType
+from ..views import GraphQLView
+from .models import Article, Reporter
+
+
+class ReporterType(DjangoObjectType):
+    class Meta:
+        model = Reporter
+        cache_max_age = 300
+        field_cache_max_age = {"email": 60}
+
+
+class ArticleType(DjangoObjectType):
+    class Meta:
+        model = Article
+
+
+class Query(graphene.ObjectType):
+    reporter = graphene.Field(ReporterType)
+    broken_reporter = graphene.Field(ReporterType)
+    hello = graphene.String()
+
+    def resolve_reporter(self, info):
+        return Reporter(first_name="Jane", email="jane@example.com")
+
+    def resolve_broken_reporter(self, info):
+        raise Exception("Broken")
+
+    def resolve_hello(self, info):
+        return "World"
+
+
+schema = graphene.Schema(query=Query)
+
+
+def max_age(query, operation_name=None):
+    document = DocumentCache(max_size=10).document_from_string(
+        get_default_backend(), schema, query
+    )
+    return get_cache_max_age(schema, document, operation_name)
+
+
+def test_should_use_the_minimum_hint_of_the_selection():
+    assert max_age("{ reporter { firstName } }") == 300
+    assert (
+        max_age("{ reporter { ...Email } } fragment Email on ReporterType { email }")
+        == 60
+    )
+    # ArticleType has no hint
+    assert max_age("{ reporter { articles { headline } } }") == 0
+    # No hints at all
+    assert max_age("{ hello }") == 0
+    assert max_age("mutation { hello }") is None
+
+
+def get(view, query, **headers):
+    request = RequestFactory().get("/graphql", {"query": query}, **headers)
+    return view(request)
+
+
+def test_view_should_set_caching_headers():
+    view = GraphQLView.as_view(schema=schema, http_cache=True)
+
+    response = get(view, "{ reporter { firstName } }")
+    assert response.status_code == 200
+    assert response["Cache-Control"] == "public, max-age=300"
+    etag = response["ETag"]
+    assert json.loads(response.content.decode()) == {
+        "data": {"reporter": {"firstName": "Jane"}}
+    }
+
+    response = get(view, "{ reporter { firstName } }", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert response["Cache-Control"] == "public, max-age=300"
+    assert not response.content
+
+    response = get(view, "{ reporter { email } }", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["Cache-Control"] == "public, max-age=60"
+
+
+def test_view_should_not_cache_errors():
+    view = GraphQLView.as_view(schema=schema, http_cache=True)
+
+    response = get(view, "{ reporter { firstName } unknown }")
+    assert response.status_code == 400
+    assert "ETag" not in response
+
+    response = get(view, "{ brokenReporter { firstName } }")
+    assert response.status_code == 200
+    assert response["Cache-Control"] == "no-cache"
+
+    response = get(view, "{ hello }")
+    assert response["Cache-Control"] == "no-cache"
+
+    # Only the errors of the execution count
+    response = get(view, "{ reporter { errors: firstName } }")
+    assert response["Cache-Control"] == "public, max-age=300"
+
+
+def test_view_should_not_set_caching_headers_by_default():
+    view = GraphQLView.as_view(schema=schema)
+
+    response = get(view, "{ reporter { firstName } }")
+    assert response.status_code == 200
+    assert "ETag" not in response
+    assert "Cache-Control" not in response
+
+
+def test_view_should_use_the_response_of_subclasses():
+    class TeapotView(GraphQLView):
+        def get_response(self, request, data, show_graphiql=False):
+            return b'{"data": null}', 418
+
+    view = TeapotView.as_view(schema=schema, http_cache=True)
+    response = get(view, "{ reporter { firstName } }")
+    assert response.status_code == 418
+    assert "ETag" not in response
+
+
+def test_view_should_not_cache_streamed_responses():
+    with pytest.raises(AssertionError):
+        GraphQLView(schema=schema, http_cache=True, streaming=True)
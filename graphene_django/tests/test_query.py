@@ -12,7 +12,8 @@ from graphene.relay import Node
 
 from ..utils import DJANGO_FILTER_INSTALLED
 from ..compat import MissingType, JSONField
-from ..fields import DjangoConnectionField
+from ..fields import DjangoConnectionField, DjangoListField
+from ..optimization import depends_on
 from ..types import DjangoObjectType
 from ..settings import graphene_settings
 from .models import Article, CNNReporter, Reporter, Film, FilmDetails
@@ -1007,3 +1008,455 @@ def test_proxy_model_fails():
 
     result = schema.execute(query)
     assert result.errors
+
+
+def test_should_paginate_connectionfields_without_total_count():
+    for name in ("John", "Jane", "Jack"):
+        Reporter.objects.create(
+            first_name=name, last_name="Doe", email="doe@example.com", a_choice=1
+        )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType)
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ReporterQuery($after: String) {
+            allReporters(first: 2, after: $after) {
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+                edges {
+                    node {
+                        firstName
+                    }
+                }
+            }
+        }
+    """
+
+    result = schema.execute(query)
+    assert not result.errors
+    page = result.data["allReporters"]
+    assert page["pageInfo"]["hasNextPage"]
+    assert [edge["node"]["firstName"] for edge in page["edges"]] == ["John", "Jane"]
+
+    result = schema.execute(
+        query, variable_values={"after": page["pageInfo"]["endCursor"]}
+    )
+    assert not result.errors
+    page = result.data["allReporters"]
+    assert not page["pageInfo"]["hasNextPage"]
+    assert [edge["node"]["firstName"] for edge in page["edges"]] == ["Jack"]
+
+
+def test_should_count_connectionfields_selected_through_fragments():
+    Reporter.objects.create(
+        first_name="John", last_name="Doe", email="johndoe@example.com", a_choice=1
+    )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType)
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ReporterQuery {
+            allReporters(first: 1) {
+                ...ReporterCount
+            }
+        }
+        fragment ReporterCount on ReporterTypeConnection {
+            ... on ReporterTypeConnection {
+                totalCount
+            }
+        }
+    """
+
+    result = schema.execute(query)
+    assert not result.errors
+    assert result.data == {"allReporters": {"totalCount": 1}}
+
+
+def test_should_paginate_connectionfields_with_keyset_cursors():
+    for name in ("Carl", "Anna", "Bob", "Anna", "Dave"):
+        Reporter.objects.create(
+            first_name=name, last_name="Doe", email="doe@example.com", a_choice=1
+        )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType, pagination="keyset")
+
+        def resolve_all_reporters(self, info, **args):
+            return Reporter.objects.order_by("first_name")
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ReporterQuery($first: Int, $after: String, $last: Int, $before: String) {
+            allReporters(first: $first, after: $after, last: $last, before: $before) {
+                totalCount
+                pageInfo {
+                    hasNextPage
+                    hasPreviousPage
+                    startCursor
+                    endCursor
+                }
+                edges {
+                    node {
+                        firstName
+                    }
+                }
+            }
+        }
+    """
+
+    def get_page(**variables):
+        result = schema.execute(query, variable_values=variables)
+        assert not result.errors
+        page = result.data["allReporters"]
+        assert page["totalCount"] == 5
+        return page, [edge["node"]["firstName"] for edge in page["edges"]]
+
+    page, names = get_page(first=2)
+    assert names == ["Anna", "Anna"]
+    assert page["pageInfo"]["hasNextPage"]
+
+    page, names = get_page(first=2, after=page["pageInfo"]["endCursor"])
+    assert names == ["Bob", "Carl"]
+    assert page["pageInfo"]["hasNextPage"]
+    bob_cursor = page["pageInfo"]["startCursor"]
+
+    page, names = get_page(first=2, after=page["pageInfo"]["endCursor"])
+    assert names == ["Dave"]
+    assert not page["pageInfo"]["hasNextPage"]
+
+    page, names = get_page(last=2)
+    assert names == ["Carl", "Dave"]
+    assert page["pageInfo"]["hasPreviousPage"]
+
+    page, names = get_page(last=2, before=bob_cursor)
+    assert names == ["Anna", "Anna"]
+    assert not page["pageInfo"]["hasPreviousPage"]
+
+
+@pytest.mark.parametrize(
+    "count_strategy,max_count,expected",
+    [
+        ("exact", None, {"totalCount": 3, "totalCountStrategy": "exact"}),
+        ("capped", 2, {"totalCount": 2, "totalCountStrategy": "capped"}),
+        ("capped", 5, {"totalCount": 3, "totalCountStrategy": "exact"}),
+        # SQLite keeps no row estimates, so the count falls back to exact
+        ("estimate", None, {"totalCount": 3, "totalCountStrategy": "exact"}),
+    ],
+)
+def test_should_count_connectionfields_with_count_strategy(
+    count_strategy, max_count, expected
+):
+    for name in ("John", "Jane", "Jack"):
+        Reporter.objects.create(
+            first_name=name, last_name="Doe", email="doe@example.com", a_choice=1
+        )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(
+            ReporterType, count_strategy=count_strategy, max_count=max_count
+        )
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ReporterQuery {
+            allReporters(first: 2) {
+                totalCount
+                totalCountStrategy
+                pageInfo {
+                    hasNextPage
+                }
+            }
+        }
+    """
+
+    result = schema.execute(query)
+    assert not result.errors
+    expected["pageInfo"] = {"hasNextPage": True}
+    assert result.data == {"allReporters": expected}
+
+
+def test_should_optimize_related_fields(monkeypatch, django_assert_num_queries):
+    monkeypatch.setattr(graphene_settings, "OPTIMIZE_QUERIES", True)
+    for name in ("John", "Jane"):
+        reporter = Reporter.objects.create(
+            first_name=name, last_name="Doe", email="doe@example.com", a_choice=1
+        )
+        film = Film.objects.create(genre="do")
+        film.reporters.add(reporter)
+        Article.objects.create(
+            headline="{}'s article".format(name),
+            pub_date=datetime.date.today(),
+            pub_date_time=datetime.datetime.now(),
+            reporter=reporter,
+            editor=reporter,
+        )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            # Read by Reporter.__init__
+            required_fields = ("reporter_type",)
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+
+    class FilmType(DjangoObjectType):
+        class Meta:
+            model = Film
+            interfaces = (Node,)
+
+    class Query(graphene.ObjectType):
+        all_articles = DjangoConnectionField(ArticleType)
+        articles = DjangoListField(ArticleType)
+
+        def resolve_articles(self, info):
+            return Article.objects.all()
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ArticlesQuery {
+            allArticles {
+                edges {
+                    node {
+                        headline
+                        reporter {
+                            firstName
+                            films {
+                                edges {
+                                    node {
+                                        genre
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """
+
+    # The articles with their reporters, then the films of the reporters
+    with django_assert_num_queries(2):
+        result = schema.execute(query)
+    assert not result.errors
+    assert result.data == {
+        "allArticles": {
+            "edges": [
+                {
+                    "node": {
+                        "headline": "{}'s article".format(name),
+                        "reporter": {
+                            "firstName": name,
+                            "films": {"edges": [{"node": {"genre": "DO"}}]},
+                        },
+                    }
+                }
+                for name in ("Jane", "John")
+            ]
+        }
+    }
+
+    query = """
+        query ArticlesQuery {
+            articles {
+                headline
+                reporter {
+                    firstName
+                }
+            }
+        }
+    """
+
+    with django_assert_num_queries(1):
+        result = schema.execute(query)
+    assert not result.errors
+    assert result.data == {
+        "articles": [
+            {"headline": "Jane's article", "reporter": {"firstName": "Jane"}},
+            {"headline": "John's article", "reporter": {"firstName": "John"}},
+        ]
+    }
+
+
+def test_should_only_fetch_selected_columns(monkeypatch, django_assert_num_queries):
+    monkeypatch.setattr(graphene_settings, "OPTIMIZE_QUERIES", True)
+    Reporter.objects.create(
+        first_name="John", last_name="Doe", email="johndoe@example.com", a_choice=1
+    )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            required_fields = ("reporter_type",)
+
+        full_name = graphene.String()
+        initials = graphene.String()
+
+        @depends_on("first_name", "last_name")
+        def resolve_full_name(self, info):
+            return "{} {}".format(self.first_name, self.last_name)
+
+        def resolve_initials(self, info):
+            return self.first_name[0] + self.last_name[0]
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType)
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ReporterQuery {
+            allReporters {
+                edges {
+                    node {
+                        id
+                        fullName
+                    }
+                }
+            }
+        }
+    """
+
+    with django_assert_num_queries(1) as context:
+        result = schema.execute(query)
+    assert not result.errors
+    assert result.data["allReporters"]["edges"][0]["node"]["fullName"] == "John Doe"
+    sql = context.captured_queries[0]["sql"]
+    assert '"first_name"' in sql and '"reporter_type"' in sql
+    assert '"email"' not in sql
+
+    # The columns read by the initials resolver aren't declared, so all the
+    # columns are fetched
+    with django_assert_num_queries(1) as context:
+        result = schema.execute(query.replace("fullName", "initials"))
+    assert not result.errors
+    assert result.data["allReporters"]["edges"][0]["node"]["initials"] == "JD"
+    assert '"email"' in context.captured_queries[0]["sql"]
+
+
+def test_should_not_prefetch_paginated_connections(
+    monkeypatch, django_assert_num_queries
+):
+    monkeypatch.setattr(graphene_settings, "OPTIMIZE_QUERIES", True)
+    for name in ("John", "Jane"):
+        reporter = Reporter.objects.create(
+            first_name=name, last_name="Doe", email="doe@example.com", a_choice=1
+        )
+        for number in range(3):
+            Article.objects.create(
+                headline="{}'s article {}".format(name, number),
+                pub_date=datetime.date.today(),
+                pub_date_time=datetime.datetime.now(),
+                reporter=reporter,
+                editor=reporter,
+            )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            required_fields = ("reporter_type",)
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType)
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ReportersQuery {
+            allReporters {
+                edges {
+                    node {
+                        articles(first: 1) {
+                            edges {
+                                node {
+                                    headline
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """
+
+    # The reporters, then a page of articles for each reporter
+    with django_assert_num_queries(3) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    assert all("LIMIT" in query["sql"] for query in captured.captured_queries[1:])
+
+
+def test_should_merge_evaluated_querysets_with_the_manager(monkeypatch):
+    monkeypatch.setattr(graphene_settings, "OPTIMIZE_QUERIES", True)
+    Reporter.objects.create(
+        first_name="John", last_name="Doe", email="johndoe@example.com", a_choice=1
+    )
+    Reporter.objects.create(
+        first_name="John", last_name="NotDoe", email="johndoe@example.com", a_choice=1
+    )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            required_fields = ("reporter_type",)
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType, on="doe_objects")
+
+        def resolve_all_reporters(self, info, **args):
+            reporters = Reporter.objects.all()
+            # Only the rows prefetched by the optimizer skip the manager
+            len(reporters)
+            return reporters
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ReportersQuery {
+            allReporters {
+                edges {
+                    node {
+                        lastName
+                    }
+                }
+            }
+        }
+    """
+
+    result = schema.execute(query)
+    assert not result.errors
+    assert result.data == {"allReporters": {"edges": [{"node": {"lastName": "Doe"}}]}}
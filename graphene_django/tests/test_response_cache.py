@@ -0,0 +1,208 @@
+import json
+
+import graphene
+import pytest
+from django.apps import apps
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.test import RequestFactory
+from mock import patch
+
+from .. import model_versions
+from ..model_versions import get_model_label, get_model_version, get_version_key
+from ..response_cache import normalize_query
+from ..rest_framework.views import GraphQLAPIView
+from ..settings import graphene_settings
+from ..types import DjangoObjectType
+from ..views import GraphQLView
+from .models import Reporter
+
+
+class ReporterType(DjangoObjectType):
+    class Meta:
+        model = Reporter
+        fields = ("id", "first_name")
+
+
+class Query(graphene.ObjectType):
+    reporters = graphene.List(ReporterType)
+    hello = graphene.String(name=graphene.String())
+
+    def resolve_reporters(self, info):
+        return Reporter.objects.order_by("pk")
+
+    def resolve_hello(self, info, name="World"):
+        if name == "Error":
+            raise Exception("Invalid name")
+        return "Hello {}".format(name)
+
+
+class Mutation(graphene.ObjectType):
+    hello = graphene.String()
+
+    def resolve_hello(self, info):
+        return "World"
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation)
+
+REPORTERS_QUERY = "{ reporters { firstName } }"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def post(view, query, user=None, **data):
+    data["query"] = query
+    request = RequestFactory().post("/graphql", json.dumps(data), "application/json")
+    request.user = user or AnonymousUser()
+    response = view(request)
+    if hasattr(response, "render"):
+        response.render()
+    return json.loads(response.content.decode())
+
+
+def count_executions(view_class):
+    return patch.object(
+        view_class,
+        "execute_graphql_request",
+        autospec=True,
+        side_effect=view_class.execute_graphql_request,
+    )
+
+
+def test_should_normalize_queries_out_of_strings():
+    assert normalize_query(
+        """
+        # Greeting
+        query Hello {
+          hello(name: "a,  b")  ,
+        }
+        """
+    ) == 'query Hello { hello(name: "a,  b") }'
+    assert normalize_query('{ hello(name: """a\n#  b""") }') == (
+        '{ hello(name: """a\n#  b""") }'
+    )
+
+
+@pytest.mark.django_db
+def test_should_return_cached_responses_without_executing_them():
+    view = GraphQLView.as_view(schema=schema, response_cache_timeout=60)
+    Reporter.objects.create(first_name="Jane", last_name="Doe", email="", a_choice=1)
+    expected = {"data": {"reporters": [{"firstName": "Jane"}]}}
+
+    with count_executions(GraphQLView) as execute:
+        assert post(view, REPORTERS_QUERY) == expected
+        assert post(view, "{\n  reporters {\n    firstName\n  }\n}") == expected
+        assert execute.call_count == 1
+        # Other variables are another response
+        assert post(view, REPORTERS_QUERY, variables={"a": 1}) == expected
+        assert execute.call_count == 2
+
+
+@pytest.mark.django_db
+def test_should_invalidate_cached_responses_on_changes():
+    view = GraphQLView.as_view(schema=schema, response_cache_timeout=60)
+    reporter = Reporter.objects.create(
+        first_name="Jane", last_name="Doe", email="", a_choice=1
+    )
+
+    assert post(view, REPORTERS_QUERY) == {
+        "data": {"reporters": [{"firstName": "Jane"}]}
+    }
+    reporter.first_name = "John"
+    reporter.save()
+    assert post(view, REPORTERS_QUERY) == {
+        "data": {"reporters": [{"firstName": "John"}]}
+    }
+    reporter.delete()
+    assert post(view, REPORTERS_QUERY) == {"data": {"reporters": []}}
+
+
+@pytest.mark.django_db
+def test_should_replace_versions_of_models_changed_by_any_process(monkeypatch):
+    # A process which never cached a response, with the cache configured
+    monkeypatch.setattr(model_versions, "_extra_cache_aliases", set())
+    monkeypatch.setattr(
+        graphene_settings, "MODEL_VERSIONS_CACHE_ALIASES", ("default",)
+    )
+    model_versions.connect_signals()
+
+    version = get_model_version(cache, Reporter)
+    Reporter.objects.create(first_name="Jane", last_name="Doe", email="", a_choice=1)
+    assert get_model_version(cache, Reporter) != version
+    # Models without cached results get no token
+    User.objects.create(username="jane")
+    assert cache.get(get_version_key(get_model_label(User))) is None
+
+
+def test_should_only_connect_the_receivers_when_caching(monkeypatch):
+    app_config = apps.get_app_config("graphene_django")
+    monkeypatch.setattr(model_versions, "_extra_cache_aliases", set())
+
+    with patch.object(model_versions, "connect_signals") as connect_signals:
+        app_config.ready()
+        assert not connect_signals.called
+        monkeypatch.setattr(graphene_settings, "RESPONSE_CACHE_TIMEOUT", 60)
+        app_config.ready()
+        assert connect_signals.called
+
+
+@pytest.mark.django_db
+def test_should_not_share_cached_responses_between_schemas():
+    class OtherQuery(graphene.ObjectType):
+        hello = graphene.String()
+
+        def resolve_hello(self, info):
+            return "Other"
+
+    view = GraphQLView.as_view(schema=schema, response_cache_timeout=60)
+    other_view = GraphQLView.as_view(
+        schema=graphene.Schema(query=OtherQuery), response_cache_timeout=60
+    )
+
+    assert post(view, "{ hello }") == {"data": {"hello": "Hello World"}}
+    assert post(other_view, "{ hello }") == {"data": {"hello": "Other"}}
+
+
+@pytest.mark.django_db
+def test_should_vary_cached_responses_by_user():
+    view = GraphQLView.as_view(schema=schema, response_cache_timeout=60)
+    user = User.objects.create(username="jane")
+
+    with count_executions(GraphQLView) as execute:
+        post(view, "{ hello }")
+        post(view, "{ hello }", user=user)
+        post(view, "{ hello }", user=user)
+        assert execute.call_count == 2
+
+
+@pytest.mark.django_db
+def test_should_not_cache_mutations_nor_errors():
+    view = GraphQLView.as_view(schema=schema, response_cache_timeout=60)
+
+    with count_executions(GraphQLView) as execute:
+        for _ in range(2):
+            assert post(view, "mutation { hello }") == {"data": {"hello": "World"}}
+        response = post(view, '{ hello(name: "Error") }')
+        assert response["errors"][0]["message"] == "Invalid name"
+        post(view, '{ hello(name: "Error") }')
+        assert execute.call_count == 4
+
+
+@pytest.mark.django_db
+def test_api_view_should_return_cached_responses():
+    view = GraphQLAPIView.as_view(
+        graphene_schema=schema, graphene_response_cache_timeout=60
+    )
+    Reporter.objects.create(first_name="Jane", last_name="Doe", email="", a_choice=1)
+    expected = {"data": {"reporters": [{"firstName": "Jane"}]}}
+
+    with count_executions(GraphQLAPIView) as execute:
+        assert post(view, REPORTERS_QUERY) == expected
+        assert post(view, REPORTERS_QUERY) == expected
+        assert execute.call_count == 1
@@ -130,6 +130,7 @@ type ArticleConnection {
   edges: [ArticleEdge]!
   test: String
   totalCount: Int!
+  totalCountStrategy: String
 }
 
 type ArticleEdge {
@@ -1,7 +1,12 @@
 import json
+from functools import partial
 
 import pytest
 
+from ..cache import get_query_hash
+from ..settings import graphene_settings
+from ..views import iter_chunks, iterencode_json
+
 try:
     from urllib import urlencode
 except ImportError:
@@ -558,3 +563,227 @@ def test_passes_request_into_context_request(client):
 
     assert response.status_code == 200
     assert response_json(response) == {"data": {"request": "testing"}}
+
+
+def persisted_url_string(**url_params):
+    return url_string("/graphql/persisted", **url_params)
+
+
+def persisted_query_extensions(query):
+    return {"persistedQuery": {"version": 1, "sha256Hash": get_query_hash(query)}}
+
+
+def test_persisted_query_round_trip(client):
+    query = '{test(who: "Persisted")}'
+    extensions = persisted_query_extensions(query)
+
+    response = client.post(
+        persisted_url_string(), j(extensions=extensions), "application/json"
+    )
+    assert response.status_code == 400
+    assert response_json(response) == {
+        "errors": [
+            {
+                "message": "PersistedQueryNotFound",
+                "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+            }
+        ]
+    }
+
+    response = client.post(
+        persisted_url_string(),
+        j(query=query, extensions=extensions),
+        "application/json",
+    )
+    assert response.status_code == 200
+    assert response_json(response) == {"data": {"test": "Hello Persisted"}}
+
+    response = client.get(persisted_url_string(extensions=json.dumps(extensions)))
+    assert response.status_code == 200
+    assert response_json(response) == {"data": {"test": "Hello Persisted"}}
+
+
+def test_persisted_query_hash_mismatch(client):
+    response = client.post(
+        persisted_url_string(),
+        j(query="{test}", extensions=persisted_query_extensions("{request}")),
+        "application/json",
+    )
+    assert response.status_code == 400
+    assert response_json(response) == {
+        "errors": [
+            {
+                "message": "provided sha does not match query",
+                "extensions": {"code": "BAD_USER_INPUT"},
+            }
+        ]
+    }
+
+
+def test_persisted_query_not_supported(client):
+    response = client.post(
+        url_string(),
+        j(query="{test}", extensions=persisted_query_extensions("{test}")),
+        "application/json",
+    )
+    assert response.status_code == 400
+    assert response_json(response) == {
+        "errors": [
+            {
+                "message": "PersistedQueryNotSupported",
+                "extensions": {"code": "PERSISTED_QUERY_NOT_SUPPORTED"},
+            }
+        ]
+    }
+
+
+def test_handles_poorly_formed_extensions(client):
+    response = client.get(persisted_url_string(extensions="persistedQuery"))
+    assert response.status_code == 400
+    assert response_json(response) == {
+        "errors": [{"message": "Extensions are invalid JSON."}]
+    }
+
+
+def test_batch_executes_concurrently_in_order(client):
+    response = client.post(
+        url_string("/graphql/batch/concurrent"),
+        json.dumps(
+            [
+                dict(id=1, query='{test(who: "One")}'),
+                dict(id=2, query='{test(who: "Two")}'),
+                dict(id=3, query='{test(who: "Three")}'),
+            ]
+        ),
+        "application/json",
+    )
+
+    assert response.status_code == 200
+    assert response_json(response) == [
+        {"id": 1, "data": {"test": "Hello One"}, "status": 200},
+        {"id": 2, "data": {"test": "Hello Two"}, "status": 200},
+        {"id": 3, "data": {"test": "Hello Three"}, "status": 200},
+    ]
+
+
+def test_batch_fails_if_exceeds_max_size(client):
+    response = client.post(
+        url_string("/graphql/batch/concurrent"),
+        json.dumps([dict(id=i, query="{test}") for i in range(4)]),
+        "application/json",
+    )
+
+    assert response.status_code == 400
+    assert response_json(response) == {"errors": [{"message": "Batch requests are limited to 3 operations."}]}
+
+
+def streaming_response_json(response):
+    return json.loads(b"".join(response.streaming_content).decode())
+
+
+def test_streaming_response(client):
+    response = client.get(
+        url_string("/graphql/streaming", query='{test, other: test(who: "Stream")}')
+    )
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert streaming_response_json(response) == {
+        "data": {"test": "Hello World", "other": "Hello Stream"}
+    }
+
+
+def test_streaming_response_with_errors(client):
+    response = client.get(url_string("/graphql/streaming", query="{thrower}"))
+
+    assert response.status_code == 200
+    assert streaming_response_json(response) == {
+        "data": None,
+        "errors": [
+            {
+                "locations": [{"column": 2, "line": 1}],
+                "path": ["thrower"],
+                "message": "Throws!",
+            }
+        ],
+    }
+
+
+def test_streaming_batch_response(client):
+    response = client.post(
+        url_string("/graphql/batch/streaming"),
+        json.dumps(
+            [dict(id=1, query="{test}"), dict(id=2, query='{test(who: "Two")}')]
+        ),
+        "application/json",
+    )
+
+    assert response.status_code == 200
+    assert streaming_response_json(response) == [
+        {"id": 1, "data": {"test": "Hello World"}, "status": 200},
+        {"id": 2, "data": {"test": "Hello Two"}, "status": 200},
+    ]
+
+
+def test_iterencode_json_matches_json_dumps():
+    value = {
+        "data": {
+            "allReporters": {
+                "edges": [
+                    {"node": {"id": "1", "tags": ["a", "b"]}},
+                    {"node": {"id": "2", "tags": []}},
+                ],
+                "totalCount": 2,
+            },
+            "empty": {},
+        }
+    }
+    dumps = partial(json.dumps, separators=(",", ":"))
+    encoded = "".join(iterencode_json(value, dumps))
+
+    assert encoded == dumps(value)
+    assert list(iter_chunks(["ab", "c", "de", "f"], 3)) == ["abc", "def"]
+
+
+@pytest.fixture
+def bytes_json_codec(monkeypatch):
+    decoded = []
+
+    def encoder(value):
+        return json.dumps(value).encode("utf-8")
+
+    def decoder(value):
+        decoded.append(value)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return json.loads(value)
+
+    monkeypatch.setattr(graphene_settings, "JSON_ENCODER", encoder)
+    monkeypatch.setattr(graphene_settings, "JSON_DECODER", decoder)
+    return decoded
+
+
+def test_uses_configured_json_codec(client, bytes_json_codec):
+    response = client.post(
+        url_string(),
+        j(
+            query="query helloWho($who: String){ test(who: $who) }",
+            variables=json.dumps({"who": "Codec"}),
+        ),
+        "application/json",
+    )
+
+    assert response.status_code == 200
+    assert response_json(response) == {"data": {"test": "Hello Codec"}}
+    assert isinstance(bytes_json_codec[0], bytes)
+
+
+def test_batch_uses_configured_json_codec(client, bytes_json_codec):
+    response = client.post(
+        batch_url_string(), jl(id=1, query="{test}"), "application/json"
+    )
+
+    assert response.status_code == 200
+    assert response_json(response) == [
+        {"id": 1, "data": {"test": "Hello World"}, "status": 200}
+    ]
@@ -1,13 +1,41 @@
 from django.conf.urls import url
 
+from ..persisted_queries import InMemoryPersistedQueryStore
 from ..rest_framework.views import GraphQLAPIView
 from ..views import GraphQLView
 
 
 urlpatterns = [
+    url(
+        r"^graphql/batch/concurrent",
+        GraphQLView.as_view(batch=True, batch_max_size=3, batch_max_workers=2),
+    ),
+    url(
+        r"^graphql/batch/streaming",
+        GraphQLView.as_view(batch=True, streaming=True),
+    ),
     url(r"^graphql/batch", GraphQLView.as_view(batch=True)),
+    url(r"^graphql/streaming", GraphQLView.as_view(streaming=True)),
+    url(
+        r"^graphql/persisted",
+        GraphQLView.as_view(persisted_query_store=InMemoryPersistedQueryStore()),
+    ),
     url(r"^graphql", GraphQLView.as_view(graphiql=True)),
 
+    url(
+        r"^rest_framework/graphql/batch/concurrent",
+        GraphQLAPIView.as_view(
+            graphene_batch=True,
+            graphene_batch_max_size=3,
+            graphene_batch_max_workers=2,
+        ),
+    ),
     url(r"^rest_framework/graphql/batch", GraphQLAPIView.as_view(graphene_batch=True)),
+    url(
+        r"^rest_framework/graphql/persisted",
+        GraphQLAPIView.as_view(
+            graphene_persisted_query_store=InMemoryPersistedQueryStore()
+        ),
+    ),
     url(r"^rest_framework/graphql", GraphQLAPIView.as_view(graphiql=True)),
 ]
@@ -8,6 +8,8 @@ from graphene.types.utils import yank_fields_from_attrs
 
 from .connection import DjangoConnection
 from .converter import convert_django_field_with_choices
+from .dataloaders import load_node
+from .optimization import depends_on
 from .registry import Registry, get_global_registry
 from .utils import DJANGO_FILTER_INSTALLED, get_model_fields, is_valid_django_model
 
@@ -39,6 +41,9 @@ class DjangoObjectTypeOptions(ObjectTypeOptions):
     connection = None  # type: Type[Connection]
 
     filter_fields = ()
+    required_fields = ()
+    cache_max_age = None
+    field_cache_max_age = None
 
 
 class DjangoObjectType(ObjectType):
@@ -51,6 +56,9 @@ class DjangoObjectType(ObjectType):
         only_fields=(),
         exclude_fields=(),
         filter_fields=None,
+        required_fields=(),
+        cache_max_age=None,
+        field_cache_max_age=None,
         connection=None,
         connection_class=None,
         use_connection=None,
@@ -102,6 +110,9 @@ class DjangoObjectType(ObjectType):
         _meta.model = model
         _meta.registry = registry
         _meta.filter_fields = filter_fields
+        _meta.required_fields = required_fields
+        _meta.cache_max_age = cache_max_age
+        _meta.field_cache_max_age = field_cache_max_age or {}
         _meta.fields = django_fields
         _meta.connection = connection
 
@@ -112,6 +123,7 @@ class DjangoObjectType(ObjectType):
         if not skip_registry:
             registry.register(cls)
 
+    @depends_on("pk")
     def resolve_id(self, info):
         return self.pk
 
@@ -134,3 +146,16 @@ class DjangoObjectType(ObjectType):
             return cls._meta.model.objects.get(pk=id)
         except cls._meta.model.DoesNotExist:
             return None
+
+    @classmethod
+    def get_node_promise(cls, info, id):
+        """
+        Return the node ``id``, or a promise of it batching the lookup with
+        the other nodes of the type requested in the operation.
+        """
+        # Types with their own get_node are looked up through it
+        if cls.get_node.__func__ is DjangoObjectType.get_node.__func__:
+            node = load_node(info, cls._meta.model.objects, id)
+            if node is not None:
+                return node
+        return cls.get_node(info, id)
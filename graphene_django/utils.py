@@ -1,7 +1,8 @@
 import inspect
 
-from django.db import models
+from django.db import connections, models
 from django.db.models.manager import Manager
+from graphql.language import ast
 
 
 # from graphene.utils import LazyList
@@ -39,6 +40,48 @@ def maybe_queryset(value):
     return value
 
 
+def collect_field_selections(fragments, selections, fields):
+    for selection in selections:
+        if isinstance(selection, ast.Field):
+            fields.append(selection)
+        elif isinstance(selection, ast.FragmentSpread):
+            fragment = fragments.get(selection.name.value)
+            if fragment is not None:
+                collect_field_selections(
+                    fragments, fragment.selection_set.selections, fields
+                )
+        elif isinstance(selection, ast.InlineFragment):
+            collect_field_selections(
+                fragments, selection.selection_set.selections, fields
+            )
+    return fields
+
+
+def get_field_selections(info, field_asts):
+    """
+    Return the field nodes selected under ``field_asts``, looking through
+    fragment spreads and inline fragments.
+    """
+    fields = []
+    for field_ast in field_asts:
+        if field_ast.selection_set:
+            collect_field_selections(
+                info.fragments or {}, field_ast.selection_set.selections, fields
+            )
+    return fields
+
+
+def get_selected_field_names(info):
+    """
+    Return the names of the fields selected on the field being resolved,
+    or None when they can't be known from ``info``.
+    """
+    field_asts = getattr(info, "field_asts", None)
+    if field_asts is None:
+        return None
+    return set(field.name.value for field in get_field_selections(info, field_asts))
+
+
 def get_model_fields(model):
     local_fields = [
         (field.name, field)
@@ -60,6 +103,26 @@ def is_valid_django_model(model):
     return inspect.isclass(model) and issubclass(model, models.Model)
 
 
+def map_in_threads(func, iterable, max_workers):
+    """
+    Call ``func`` with every item of ``iterable`` on a pool of at most
+    ``max_workers`` threads and return the results in order.
+
+    Database connections are thread local in Django, so the ones opened
+    while running ``func`` in a worker thread are closed once it finishes.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def call(item):
+        try:
+            return func(item)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(call, iterable))
+
+
 def import_single_dispatch():
     try:
         from functools import singledispatch
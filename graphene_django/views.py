@@ -1,12 +1,17 @@
 import inspect
 import json
 import re
+from functools import partial
+from hashlib import sha256
 
 import six
-from django.http import HttpResponse, HttpResponseNotAllowed
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
 from django.http.response import HttpResponseBadRequest
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import method_decorator
+from django.utils.encoding import force_text
+from django.utils.http import quote_etag
 from django.views.generic import View
 from django.views.decorators.csrf import ensure_csrf_cookie
 
@@ -16,7 +21,26 @@ from graphql.error import GraphQLError
 from graphql.execution import ExecutionResult
 from graphql.type.schema import GraphQLSchema
 
+from .cache import get_document_cache
+from .codec import json_dumps, json_join, json_loads
+from .cost import QueryTooComplex, check_query_cost
+from .deadline import Deadline, set_deadline, statement_timeout
+from .http_cache import get_cache_max_age
+from .response_cache import (
+    get_response_cache,
+    get_response_key,
+    get_response_models,
+    get_vary,
+    get_view_namespace,
+)
+from .persisted_queries import (
+    get_persisted_document,
+    get_persisted_query_hash,
+    get_persisted_query_store,
+    instantiate_persisted_query_store,
+)
 from .settings import graphene_settings
+from .utils import map_in_threads
 
 
 class HttpError(Exception):
@@ -42,6 +66,54 @@ def get_accepted_content_types(request):
     )
 
 
+def iterencode_json(value, dumps):
+    """
+    Yield the JSON encoding of ``value`` piece by piece, so the whole
+    document never has to be held in memory as a single string.
+
+    Dicts and lists are walked recursively, while dicts with no nested
+    containers and any other values are encoded at once with ``dumps``.
+    """
+    if isinstance(value, dict):
+        if not any(isinstance(item, (dict, list)) for item in value.values()):
+            yield dumps(value)
+            return
+        yield "{"
+        for index, (key, item) in enumerate(value.items()):
+            if index:
+                yield ","
+            yield dumps(six.text_type(key))
+            yield ":"
+            for chunk in iterencode_json(item, dumps):
+                yield chunk
+        yield "}"
+    elif isinstance(value, list):
+        yield "["
+        for index, item in enumerate(value):
+            if index:
+                yield ","
+            for chunk in iterencode_json(item, dumps):
+                yield chunk
+        yield "]"
+    else:
+        yield dumps(value)
+
+
+def iter_chunks(pieces, chunk_size):
+    """Join an iterable of strings into chunks of at least ``chunk_size``."""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
 def instantiate_middleware(middlewares):
     for middleware in middlewares:
         if inspect.isclass(middleware):
@@ -62,6 +134,16 @@ class GraphQLView(View):
     root_value = None
     pretty = False
     batch = False
+    streaming = False
+    streaming_chunk_size = 64 * 1024
+    batch_max_size = None
+    batch_max_workers = None
+    persisted_query_store = None
+    max_query_depth = None
+    max_query_cost = None
+    deadline = None
+    http_cache = False
+    response_cache_timeout = None
 
     def __init__(
         self,
@@ -73,10 +155,40 @@ class GraphQLView(View):
         pretty=False,
         batch=False,
         backend=None,
+        persisted_query_store=None,
+        batch_max_size=None,
+        batch_max_workers=None,
+        streaming=False,
+        max_query_depth=None,
+        max_query_cost=None,
+        deadline=None,
+        http_cache=False,
+        response_cache_timeout=None,
     ):
         if not schema:
             schema = graphene_settings.SCHEMA
 
+        if persisted_query_store is None:
+            persisted_query_store = get_persisted_query_store()
+
+        if batch_max_size is None:
+            batch_max_size = graphene_settings.BATCH_MAX_SIZE
+
+        if batch_max_workers is None:
+            batch_max_workers = graphene_settings.BATCH_MAX_WORKERS
+
+        if max_query_depth is None:
+            max_query_depth = graphene_settings.QUERY_MAX_DEPTH
+
+        if max_query_cost is None:
+            max_query_cost = graphene_settings.QUERY_MAX_COST
+
+        if deadline is None:
+            deadline = graphene_settings.QUERY_DEADLINE
+
+        if response_cache_timeout is None:
+            response_cache_timeout = graphene_settings.RESPONSE_CACHE_TIMEOUT
+
         if backend is None:
             backend = get_default_backend()
 
@@ -91,12 +203,28 @@ class GraphQLView(View):
         self.pretty = self.pretty or pretty
         self.graphiql = self.graphiql or graphiql
         self.batch = self.batch or batch
+        self.streaming = self.streaming or streaming
+        self.batch_max_size = self.batch_max_size or batch_max_size
+        self.batch_max_workers = self.batch_max_workers or batch_max_workers
+        self.max_query_depth = self.max_query_depth or max_query_depth
+        self.max_query_cost = self.max_query_cost or max_query_cost
+        self.deadline = self.deadline or deadline
+        self.http_cache = self.http_cache or http_cache
+        self.response_cache_timeout = (
+            self.response_cache_timeout or response_cache_timeout
+        )
         self.backend = backend
+        self.persisted_query_store = instantiate_persisted_query_store(
+            self.persisted_query_store or persisted_query_store
+        )
 
         assert isinstance(
             self.schema, GraphQLSchema
         ), "A Schema is required to be provided to GraphQLView."
         assert not all((graphiql, batch)), "Use either graphiql or batch processing"
+        assert not (
+            self.streaming and self.http_cache
+        ), "Streamed responses can't be cached with http_cache"
 
     # noinspection PyUnusedLocal
     def get_root_value(self, request):
@@ -111,6 +239,34 @@ class GraphQLView(View):
     def get_backend(self, request):
         return self.backend
 
+    def get_batch_max_size(self, request):
+        return self.batch_max_size
+
+    def get_batch_max_workers(self, request):
+        return self.batch_max_workers
+
+    def get_max_query_depth(self, request):
+        return self.max_query_depth
+
+    def get_max_query_cost(self, request):
+        return self.max_query_cost
+
+    def get_deadline(self, request, operation_name):
+        """Return the seconds the operation ``operation_name`` may run for."""
+        return self.deadline
+
+    def get_document(self, request, query, persisted_query_hash=None):
+        backend = self.get_backend(request)
+        if persisted_query_hash:
+            return get_persisted_document(
+                self.persisted_query_store,
+                backend,
+                self.schema,
+                query,
+                persisted_query_hash,
+            )
+        return get_document_cache().document_from_string(backend, self.schema, query)
+
     @method_decorator(ensure_csrf_cookie)
     def dispatch(self, request, *args, **kwargs):
         try:
@@ -125,10 +281,13 @@ class GraphQLView(View):
             show_graphiql = self.graphiql and self.can_display_graphiql(request, data)
 
             if self.batch:
-                responses = [self.get_response(request, entry) for entry in data]
-                result = "[{}]".format(
-                    ",".join([response[0] for response in responses])
-                )
+                responses = self.get_batch_responses(request, data)
+                if self.streaming:
+                    result = self.json_stream_batch(
+                        [response[0] for response in responses]
+                    )
+                else:
+                    result = json_join([response[0] for response in responses])
                 status_code = (
                     responses
                     and max(responses, key=lambda response: response[1])[1]
@@ -150,9 +309,19 @@ class GraphQLView(View):
                     result=result or "",
                 )
 
-            return HttpResponse(
+            if self.streaming:
+                return StreamingHttpResponse(
+                    iter_chunks(result, self.streaming_chunk_size),
+                    status=status_code,
+                    content_type="application/json",
+                )
+
+            response = HttpResponse(
                 status=status_code, content=result, content_type="application/json"
             )
+            if self.http_cache and not self.batch and request.method.lower() == "get":
+                return self.patch_http_cache(request, data, response)
+            return response
 
         except HttpError as e:
             response = e.response
@@ -162,15 +331,51 @@ class GraphQLView(View):
             )
             return response
 
-    def get_response(self, request, data, show_graphiql=False):
-        query, variables, operation_name, id = self.get_graphql_params(request, data)
+    def get_batch_responses(self, request, data):
+        max_size = self.get_batch_max_size(request)
+        if max_size and len(data) > max_size:
+            raise HttpError(
+                HttpResponseBadRequest(
+                    "Batch requests are limited to {} operations.".format(max_size)
+                )
+            )
 
-        execution_result = self.execute_graphql_request(
-            request, data, query, variables, operation_name, show_graphiql
+        max_workers = self.get_batch_max_workers(request)
+        if not max_workers or max_workers < 2 or len(data) < 2:
+            return [self.get_response(request, entry) for entry in data]
+
+        # Operations run on worker threads, each one using its own database
+        # connection, so they don't share a transaction with the request.
+        return map_in_threads(
+            partial(self.get_response, request), data, min(max_workers, len(data))
         )
 
+    def get_response(self, request, data, show_graphiql=False):
+        response, status_code = self.get_response_data(request, data, show_graphiql)
+        return self.encode_response(request, response, show_graphiql), status_code
+
+    def get_response_data(self, request, data, show_graphiql=False):
+        """Return the response to an operation, before it's encoded."""
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+
+        response_cache = self.get_response_cache(request)
+        cache_key = response_cache and self.get_response_cache_key(request, data)
+        # Cache hits skip parsing and execution
+        response = cache_key and response_cache.get(cache_key)
         status_code = 200
-        if execution_result:
+        if not response:
+            cache_versions = None
+            if cache_key:
+                cache_versions = self.get_response_cache_versions(
+                    request, data, response_cache
+                )
+
+            execution_result = self.execute_graphql_request(
+                request, data, query, variables, operation_name, show_graphiql
+            )
+            if not execution_result:
+                return None, status_code
+
             response = {}
 
             if execution_result.errors:
@@ -183,25 +388,126 @@ class GraphQLView(View):
             else:
                 response["data"] = execution_result.data
 
-            if self.batch:
-                response["id"] = id
-                response["status"] = status_code
+            if cache_versions is not None and not execution_result.errors:
+                response_cache.set(cache_key, cache_versions, response)
 
-            result = self.json_encode(request, response, pretty=show_graphiql)
-        else:
-            result = None
+        if self.batch:
+            response["id"] = id
+            response["status"] = status_code
+
+        return response, status_code
+
+    def encode_response(self, request, response, show_graphiql=False):
+        if response is None:
+            return None
+        if self.streaming and not show_graphiql:
+            return self.json_stream(request, response)
+        return self.json_encode(request, response, pretty=show_graphiql)
+
+    def get_response_cache(self, request):
+        return get_response_cache(self.response_cache_timeout)
 
-        return result, status_code
+    def get_response_cache_vary(self, request):
+        return get_vary(request)
+
+    def get_response_cache_namespace(self, request):
+        return get_view_namespace(self, self.schema)
+
+    def get_response_cache_key(self, request, data):
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+        return get_response_key(
+            self.get_response_cache_namespace(request),
+            query,
+            get_persisted_query_hash(self.get_extensions(request, data)),
+            variables,
+            operation_name,
+            self.get_response_cache_vary(request),
+        )
+
+    def get_response_cache_versions(self, request, data, response_cache):
+        """
+        Return the versions of the models of a query to store its response
+        with, or None when it can't be cached.
+        """
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+        persisted_query_hash = get_persisted_query_hash(
+            self.get_extensions(request, data)
+        )
+        try:
+            document = self.get_document(request, query, persisted_query_hash)
+        except Exception:
+            return None
+        models = get_response_models(self.schema, document, operation_name)
+        if models is None:
+            return None
+        return response_cache.get_versions(models)
+
+    def get_cache_max_age(self, request, data):
+        """Return the max-age of the response to a GET query, or None."""
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+        persisted_query_hash = get_persisted_query_hash(
+            self.get_extensions(request, data)
+        )
+        try:
+            document = self.get_document(request, query, persisted_query_hash)
+        except Exception:
+            return None
+        return get_cache_max_age(self.schema, document, operation_name)
+
+    def patch_http_cache(self, request, data, response):
+        """
+        Set the ETag and Cache-Control headers of the response to a GET
+        query, and return a 304 response when the client's copy is fresh.
+        """
+        if response.status_code != 200:
+            return response
+
+        etag = quote_etag(sha256(response.content).hexdigest())
+        response["ETag"] = etag
+        max_age = None
+        # Responses with errors aren't cached
+        content = json_loads(response.content)
+        if isinstance(content, dict) and not content.get("errors"):
+            max_age = self.get_cache_max_age(request, data)
+        if max_age:
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                patch_cache_control(response, private=True, max_age=max_age)
+            else:
+                patch_cache_control(response, public=True, max_age=max_age)
+        else:
+            patch_cache_control(response, no_cache=True)
+        return get_conditional_response(request, etag=etag, response=response)
 
     def render_graphiql(self, request, **data):
         return render(request, self.graphiql_template, data)
 
     def json_encode(self, request, d, pretty=False):
         if not (self.pretty or pretty) and not request.GET.get("pretty"):
-            return json.dumps(d, separators=(",", ":"))
+            return json_dumps(d)
 
         return json.dumps(d, sort_keys=True, indent=2, separators=(",", ": "))
 
+    def json_stream(self, request, d):
+        """
+        Return an iterator over the JSON encoding of ``d``, used instead of
+        ``json_encode`` for streaming responses.
+        """
+        if self.pretty or request.GET.get("pretty"):
+            return iter([self.json_encode(request, d)])
+
+        return iterencode_json(d, lambda value: force_text(json_dumps(value)))
+
+    @staticmethod
+    def json_stream_batch(streams):
+        yield "["
+        for index, stream in enumerate(streams):
+            if index:
+                yield ","
+            for chunk in stream:
+                yield chunk
+        yield "]"
+
     def parse_body(self, request):
         content_type = self.get_content_type(request)
 
@@ -211,12 +517,12 @@ class GraphQLView(View):
         elif content_type == "application/json":
             # noinspection PyBroadException
             try:
-                body = request.body.decode("utf-8")
+                body = request.body
             except Exception as e:
                 raise HttpError(HttpResponseBadRequest(str(e)))
 
             try:
-                request_json = json.loads(body)
+                request_json = json_loads(body)
                 if self.batch:
                     assert isinstance(request_json, list), (
                         "Batch requests should receive a list, but received {}."
@@ -245,14 +551,16 @@ class GraphQLView(View):
     def execute_graphql_request(
         self, request, data, query, variables, operation_name, show_graphiql=False
     ):
-        if not query:
+        persisted_query_hash = get_persisted_query_hash(
+            self.get_extensions(request, data)
+        )
+        if not query and not persisted_query_hash:
             if show_graphiql:
                 return None
             raise HttpError(HttpResponseBadRequest("Must provide query string."))
 
         try:
-            backend = self.get_backend(request)
-            document = backend.document_from_string(self.schema, query)
+            document = self.get_document(request, query, persisted_query_hash)
         except Exception as e:
             return ExecutionResult(errors=[e], invalid=True)
 
@@ -271,6 +579,18 @@ class GraphQLView(View):
                     )
                 )
 
+        try:
+            check_query_cost(
+                self.schema,
+                document,
+                operation_name,
+                variables,
+                max_cost=self.get_max_query_cost(request),
+                max_depth=self.get_max_query_depth(request),
+            )
+        except QueryTooComplex as e:
+            return ExecutionResult(errors=[e], invalid=True)
+
         try:
             extra_options = {}
             if self.executor:
@@ -278,14 +598,22 @@ class GraphQLView(View):
                 # executor is not a valid argument in all backends
                 extra_options["executor"] = self.executor
 
-            return document.execute(
-                root=self.get_root_value(request),
-                variables=variables,
-                operation_name=operation_name,
-                context=self.get_context(request),
-                middleware=self.get_middleware(request),
-                **extra_options
-            )
+            context = self.get_context(request)
+            deadline = None
+            timeout = self.get_deadline(request, operation_name)
+            if timeout:
+                deadline = Deadline(timeout)
+                set_deadline(context, deadline)
+
+            with statement_timeout(deadline):
+                return document.execute(
+                    root=self.get_root_value(request),
+                    variables=variables,
+                    operation_name=operation_name,
+                    context=context,
+                    middleware=self.get_middleware(request),
+                    **extra_options
+                )
         except Exception as e:
             return ExecutionResult(errors=[e], invalid=True)
 
@@ -321,7 +649,7 @@ class GraphQLView(View):
 
         if variables and isinstance(variables, six.text_type):
             try:
-                variables = json.loads(variables)
+                variables = json_loads(variables)
             except Exception:
                 raise HttpError(HttpResponseBadRequest("Variables are invalid JSON."))
 
@@ -331,6 +659,18 @@ class GraphQLView(View):
 
         return query, variables, operation_name, id
 
+    @staticmethod
+    def get_extensions(request, data):
+        extensions = request.GET.get("extensions") or data.get("extensions")
+
+        if extensions and isinstance(extensions, six.text_type):
+            try:
+                extensions = json_loads(extensions)
+            except Exception:
+                raise HttpError(HttpResponseBadRequest("Extensions are invalid JSON."))
+
+        return extensions
+
     @staticmethod
     def format_error(error):
         if isinstance(error, GraphQLError):